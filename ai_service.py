@@ -1,189 +1,525 @@
 # ai_service.py - FIXED VERSION (No SSL issues)
+import asyncio
 import os
 import json
+import logging
 import random
 import time
+from collections import deque
+import importlib.util
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from dotenv import load_dotenv
+from utils.circuit_breaker import SharedCircuitBreaker
+from utils.token_bucket import SharedTokenBucket
+from utils.metrics import metrics, format_labels
+from utils.shared_state import DEFAULT_STATE_PATH
 import warnings
 
 # Suppress SSL warnings
 warnings.filterwarnings('ignore')
 
-# Try to load AI library with error handling
-AI_LIBRARY_AVAILABLE = False
-try:
-    import google as genai
-    AI_LIBRARY_AVAILABLE = True
-    print("Google GenAI library loaded successfully")
-except ImportError as e:
-    print(f"Google GenAI not installed: {e}")
-except Exception as e:
-    print(f"Failed to load Google GenAI: {e}")
+logger = logging.getLogger('agemaster.ai')
 
-# Load environment variables
-load_dotenv()
+# The provider SDK takes about a second to import, so it is only located here
+# and imported on first AI use (see load_genai)
+GENAI_MODULE = 'google.generativeai'
+genai = None
 
-class AIService:
-    def __init__(self):
-        self.api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
-        self.model_name = os.getenv('WORKING_MODEL', 'gemini-1.5-flash')
+def ai_library_installed():
+    """True if the provider SDK can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(GENAI_MODULE) is not None
+    except (ImportError, ValueError):
+        return False
+
+def load_genai():
+    """Import the provider SDK once, on first use"""
+    global genai
+    if genai is None:
+        import google.generativeai
+        genai = google.generativeai
+        logger.info("Google GenAI library loaded")
+    return genai
+
+# Local quote keywords per age bucket: (upper age bound, bucket, keywords)
+AGE_BUCKETS = (
+    (20, 'youth', ('youth', 'growth', 'future', 'learning', 'dream')),
+    (40, 'adult', ('experience', 'opportunity', 'journey', 'discovery')),
+    (60, 'midlife', ('wisdom', 'midlife', 'reflection', 'purpose')),
+    (None, 'senior', ('wisdom', 'legacy', 'time', 'life', 'memory')),
+)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+def get_age_bucket(age_data):
+    """Map age data to one of the AGE_BUCKETS names (None without a usable age)"""
+    if not age_data or not isinstance(age_data, dict):
+        return None
+    try:
+        years = float(age_data.get('years', 0))
+    except (TypeError, ValueError):
+        return None
+    for limit, bucket, _ in AGE_BUCKETS:
+        if limit is None or years < limit:
+            return bucket
+
+class LocalDataStore:
+    """Process-wide, parse-once store for the local quote and fun fact files.
+
+    Files are re-read only when their mtime changes, checked at most every
+    ``check_interval`` seconds. Age-relevant quotes are resolved through a
+    keyword -> quote index built at load time.
+    """
+    
+    def __init__(self, data_dir=DATA_DIR, check_interval=5.0):
+        self.quotes_path = os.path.join(data_dir, 'quotes.json')
+        self.facts_path = os.path.join(data_dir, 'fun_facts.json')
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._quotes_mtime = None
+        self._facts_mtime = None
+        self.quotes = ()
+        self.facts = ()
+        self.keyword_index = {}
+        self.bucket_quotes = {}
+    
+    @staticmethod
+    def _read_list(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return tuple(item for item in data if isinstance(item, dict)) if isinstance(data, list) else ()
+    
+    @staticmethod
+    def _mtime(path):
+        try:
+            return os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def _index_quotes(self, quotes):
+        """Build keyword -> quote ids and bucket -> quote ids lookups"""
+        searchable = [(quote.get('text', '').lower(), quote.get('category', '').lower()) for quote in quotes]
+        keywords = {keyword for _, _, bucket_keywords in AGE_BUCKETS for keyword in bucket_keywords}
+        keyword_index = {
+            keyword: tuple(i for i, (text, category) in enumerate(searchable)
+                           if keyword in text or keyword in category)
+            for keyword in keywords
+        }
+        bucket_quotes = {
+            bucket: tuple(sorted({i for keyword in bucket_keywords for i in keyword_index[keyword]}))
+            for _, bucket, bucket_keywords in AGE_BUCKETS
+        }
+        return keyword_index, bucket_quotes
+    
+    def refresh(self, force=False):
+        """Reload any file whose mtime changed since the last load"""
+        now = time.monotonic()
+        if not force and now < self._next_check:
+            return
+        with self._lock:
+            if not force and now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            
+            quotes_mtime = self._mtime(self.quotes_path)
+            if force or quotes_mtime != self._quotes_mtime:
+                try:
+                    quotes = self._read_list(self.quotes_path)
+                    self.keyword_index, self.bucket_quotes = self._index_quotes(quotes)
+                    self.quotes = quotes
+                except Exception as e:
+                    logger.error("Error loading local quotes: %s", e)
+                self._quotes_mtime = quotes_mtime
+            
+            facts_mtime = self._mtime(self.facts_path)
+            if force or facts_mtime != self._facts_mtime:
+                try:
+                    self.facts = self._read_list(self.facts_path)
+                except Exception as e:
+                    logger.error("Error loading fun facts: %s", e)
+                self._facts_mtime = facts_mtime
+    
+    def random_quote(self, age_data=None):
+        """Random quote, preferring ones relevant to the age bucket; None if empty"""
+        self.refresh()
+        quotes = self.quotes
+        if not quotes:
+            return None
+        relevant = self.bucket_quotes.get(get_age_bucket(age_data))
+        if relevant:
+            return quotes[random.choice(relevant)]
+        return random.choice(quotes)
+    
+    def random_fact(self):
+        self.refresh()
+        return random.choice(self.facts) if self.facts else None
+
+local_store = LocalDataStore()
+
+class QuotePrefetcher:
+    """Background pool of pre-generated AI quotes per age bucket.
+    
+    A daemon thread keeps up to ``pool_size`` quotes per bucket, generating at
+    most one quote every ``service.ai_min_interval`` seconds, so request
+    threads only ever pop from the pool and never wait on the model.
+    """
+    
+    # Representative ages used to prompt for each bucket
+    BUCKET_AGES = {'general': None, 'youth': 15, 'adult': 30, 'midlife': 50, 'senior': 70}
+    
+    def __init__(self, service, pool_size=5, idle_interval=60.0):
+        self.service = service
+        self.pool_size = pool_size
+        self.idle_interval = idle_interval
+        self.pools = {bucket: deque(maxlen=pool_size) for bucket in self.BUCKET_AGES}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+    
+    def start(self):
+        """Start the refill thread (again, after a fork) if it isn't running"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='ai-quote-prefetch', daemon=True)
+            self._thread.start()
+    
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+    
+    def pop(self, age_data=None):
+        """Take a pooled quote for the age bucket, or None if the pool is empty"""
+        bucket = get_age_bucket(age_data) or 'general'
+        candidates = (bucket,) if bucket != 'general' else tuple(self.pools)
+        quote = None
+        for name in candidates:
+            try:
+                quote = self.pools[name].popleft()
+                break
+            except IndexError:
+                continue
+        self._wake.set()
+        return quote
+    
+    def _hungriest_bucket(self):
+        bucket = min(self.pools, key=lambda name: len(self.pools[name]))
+        return bucket if len(self.pools[bucket]) < self.pool_size else None
+    
+    def refill_once(self):
+        """Generate at most one quote; return seconds until the next attempt"""
+        service = self.service
+        if not service.ai_available or service.quota_exceeded:
+            return self.idle_interval
         
-        # AI is available if library installed AND API key exists
-        self.ai_available = AI_LIBRARY_AVAILABLE and bool(self.api_key)
+        bucket = self._hungriest_bucket()
+        if bucket is None:
+            return self.idle_interval
+        
+        wait = service.seconds_until_ai_allowed()
+        if wait > 0:
+            return wait
+        
+        years = self.BUCKET_AGES[bucket]
+        age_data = {'years': years, 'total_days': int(years * 365.25)} if years is not None else None
+        quote = service._generate_ai_quote(age_data)
+        if quote:
+            self.pools[bucket].append(quote)
+        return service.ai_min_interval
+    
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                delay = self.refill_once()
+            except Exception as e:
+                logger.exception("AI prefetch error")
+                delay = self.idle_interval
+            self._wake.wait(delay)
+            self._wake.clear()
+
+class AIService:
+    """Quote service backed by the AI provider, falling back to local data.
+
+    Construction is cheap: settings are read from the environment on first
+    use (after the app has loaded .env), and the provider SDK is imported and
+    configured by the background prefetcher on its first AI call.
+    """
+    
+    def __init__(self, model_factory=None, state_path=DEFAULT_STATE_PATH):
+        self.model_factory = model_factory
         self.client = None
-        self.last_ai_request = None
         self.ai_min_interval = 30  # Increased to 30 seconds between AI requests
+        self._configured = False
+        self._client_lock = threading.Lock()
+        self._executor = None
+        self._in_flight = 0
+        
+        # Quota tracking, shared by every worker on the host
+        self.breaker = SharedCircuitBreaker('gemini', path=state_path, failure_threshold=5)
+        self.state_path = state_path
+        self.call_budget = None
+        
+        # Quotes are generated in the background and served from this pool
+        self.prefetcher = QuotePrefetcher(self)
+    
+    def _configure(self):
+        """Read AI settings from the environment (once)"""
+        if self._configured:
+            return
+        self.api_key = os.getenv('GEMINI_API_KEY') or os.getenv('GOOGLE_API_KEY')
+        self.model_name = os.getenv('WORKING_MODEL', 'gemini-1.5-flash')
+        self.ai_timeout = float(os.getenv('AI_TIMEOUT_SECONDS', 8))
+        # Live calls one worker's event loop may have waiting on the model at once
+        self.ai_max_concurrent = int(os.getenv('AI_MAX_CONCURRENT', 256))
+        # Threads for models without an async call (the rest still fall back locally)
+        self.ai_threads = int(os.getenv('AI_THREADS', 16))
+        # Host-wide provider call budget shared by every worker and path (prefetch, sync, async)
+        self.ai_calls_per_minute = float(os.getenv('AI_CALLS_PER_MINUTE', 10))
+        self.ai_call_burst = int(os.getenv('AI_CALL_BURST', 5))
+        self.call_budget = SharedTokenBucket('gemini', self.ai_calls_per_minute / 60, self.ai_call_burst,
+                                             path=self.state_path)
         
-        # Quota tracking
-        self.quota_exceeded = False
-        self.quota_reset_time = None
-        self.error_count = 0
+        # AI is available if library installed AND API key exists, or a model factory is injected
+        self._ai_available = bool(self.model_factory) or (bool(self.api_key) and ai_library_installed())
+        self._configured = True
         
-        if self.ai_available:
+        if self.model_factory:
+            logger.info("AI Service: Using injected model factory for %s", self.model_name)
+        elif self._ai_available:
+            logger.info("AI Service: Model %s, client loads on first use", self.model_name)
+        else:
+            logger.info("AI Service: Running in local mode only")
+    
+    @property
+    def ai_available(self):
+        self._configure()
+        return self._ai_available
+    
+    def _ensure_client(self):
+        """Import and configure the provider SDK on first AI use"""
+        if self.client:
+            return self.client
+        with self._client_lock:
+            if self.client:
+                return self.client
+            if self.model_factory:
+                self.client = self.model_factory
+                return self.client
             try:
+                provider = load_genai()
                 # Configure with simple settings
-                genai.configure(api_key=self.api_key)
-                self.client = genai
-                print(f"AI Service: Configured with model {self.model_name}")
+                provider.configure(api_key=self.api_key)
+                self.model_factory = provider.GenerativeModel
+                self.client = provider
+                logger.info("AI Service: Configured with model %s", self.model_name)
             except Exception as e:
-                print(f"Failed to configure AI service: {e}")
-                self.ai_available = False
-                self.quota_exceeded = True
-        else:
-            print("AI Service: Running in local mode only")
+                logger.error("Failed to configure AI service: %s", e)
+                self._ai_available = False
+        return self.client
+    
+    def warm_up(self):
+        """Resolve settings now; the SDK itself still loads in the background on first use"""
+        self._configure()
+    
+    @property
+    def quota_exceeded(self):
+        return self.breaker.is_open()
+    
+    @property
+    def quota_reset_time(self):
+        return self.breaker.opened_until
+    
+    @property
+    def error_count(self):
+        return self.breaker.failures
+    
+    @property
+    def last_ai_request(self):
+        return self.breaker.last_request
+    
+    def seconds_until_ai_allowed(self):
+        """Seconds left before the next AI call fits within ai_min_interval"""
+        if not self.last_ai_request:
+            return 0
+        return max(0, self.ai_min_interval - (time.time() - self.last_ai_request))
     
     def generate_quote(self, age_data=None):
-        """Generate a quote - smart AI/local mix"""
-        # Only try AI 30% of the time to reduce quota usage
+        """Generate a quote - pooled AI quote when one is ready, otherwise local"""
         if self.ai_available and not self.quota_exceeded:
-            if self.last_ai_request:
-                time_since = time.time() - self.last_ai_request
-                if time_since < self.ai_min_interval:
-                    # Too soon, use local
-                    return self._get_local_quote(age_data)
-            
-            # 30% chance to try AI
-            try_ai = random.random() < 0.3
-            
-            if try_ai:
-                ai_quote = self._generate_ai_quote(age_data)
-                if ai_quote:
-                    return ai_quote
+            self.prefetcher.start()
+            ai_quote = self.prefetcher.pop(age_data)
+            if ai_quote:
+                return ai_quote
         
         # Use local quote (fallback)
         return self._get_local_quote(age_data)
     
+    async def agenerate_quote(self, age_data=None, timeout=None):
+        """Async generate_quote: pooled quote, else one awaited AI call, else local.
+
+        Waiting on the model is cheap here, so a pool miss makes a live call
+        (subject to the shared breaker, not the prefetcher's call interval)
+        bounded by ``timeout`` seconds (AI_TIMEOUT_SECONDS by default).
+        """
+        if self.ai_available and not await asyncio.to_thread(self.breaker.is_open):
+            self.prefetcher.start()
+            ai_quote = self.prefetcher.pop(age_data)
+            if ai_quote is None:
+                ai_quote = await self.agenerate_ai_quote(age_data, timeout)
+            if ai_quote:
+                return ai_quote
+        
+        return self._get_local_quote(age_data)
+    
+    def _claim_call(self, min_interval=None):
+        """Claim the shared call slot (if ``min_interval`` is given) and a token
+        from the host-wide call budget, then ask the breaker (may become the
+        half-open probe)"""
+        self._configure()
+        if min_interval is not None and not self.breaker.acquire_slot(min_interval):
+            metrics.inc('agemaster_ai_requests_total', format_labels(outcome='skipped'))
+            return False
+        if not self.call_budget.acquire():
+            metrics.inc('agemaster_ai_requests_total', format_labels(outcome='over_budget'))
+            return False
+        if not self.breaker.allow_request():
+            metrics.inc('agemaster_ai_requests_total', format_labels(outcome='skipped'))
+            return False
+        return True
+    
+    @staticmethod
+    def _build_prompt(age_data=None):
+        prompt_parts = ["Create a short, meaningful quote about time or aging."]
+        
+        if age_data:
+            years = age_data.get('years', 0)
+            days = age_data.get('total_days', 0)
+            prompt_parts.append(f"The person is {years} years old ({days:,} days).")
+        
+        prompt_parts.append("Make it personal, positive, and philosophical. 1 sentence max.")
+        prompt_parts.append("Return only the quote text, no JSON, no formatting.")
+        
+        return " ".join(prompt_parts)
+    
+    def _quote_from_response(self, response):
+        return {
+            'text': response.text.strip(),
+            'author': 'AI Wisdom',
+            'category': random.choice(['wisdom', 'time', 'life', 'reflection']),
+            'source': 'ai',
+            'ai_generated': True,
+            'model': self.model_name
+        }
+    
+    def _record_failure(self, error_msg, started, outcome='error'):
+        """Quota errors open the breaker until the quota resets (24 hours);
+        other errors open it after 5 consecutive failures"""
+        logger.warning("AI quote error: %s", error_msg)
+        
+        if "429" in error_msg or "quota" in error_msg.lower() or "exceeded" in error_msg.lower():
+            self.breaker.record_failure(reset_at=time.time() + (24 * 60 * 60))
+            self._record_call('quota_exceeded', started)
+        else:
+            self.breaker.record_failure()
+            self._record_call(outcome, started)
+        
+        if self.quota_exceeded:
+            logger.warning("AI disabled for all workers until the breaker resets")
+    
     def _generate_ai_quote(self, age_data=None):
         """Generate AI quote with robust error handling"""
-        if not self.client or self.quota_exceeded:
+        if not self.ai_available or not self._ensure_client():
             return None
         
-        # Update request time
-        self.last_ai_request = time.time()
+        if not self._claim_call(self.ai_min_interval):
+            return None
         
+        started = time.perf_counter()
         try:
-            # Prepare prompt
-            prompt_parts = ["Create a short, meaningful quote about time or aging."]
-            
-            if age_data:
-                years = age_data.get('years', 0)
-                days = age_data.get('total_days', 0)
-                prompt_parts.append(f"The person is {years} years old ({days:,} days).")
-            
-            prompt_parts.append("Make it personal, positive, and philosophical. 1 sentence max.")
-            prompt_parts.append("Return only the quote text, no JSON, no formatting.")
-            
-            prompt = " ".join(prompt_parts)
-            
-            # Generate content
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(prompt)
-            
-            # Extract quote text
-            quote_text = response.text.strip()
-            
-            # Create quote object
-            quote_data = {
-                'text': quote_text,
-                'author': 'AI Wisdom',
-                'category': random.choice(['wisdom', 'time', 'life', 'reflection']),
-                'source': 'ai',
-                'ai_generated': True,
-                'model': self.model_name
-            }
-            
-            # Reset error count on success
-            self.error_count = 0
-            
-            return quote_data
-            
+            model = self.model_factory(self.model_name)
+            response = model.generate_content(self._build_prompt(age_data))
+            quote_data = self._quote_from_response(response)
         except Exception as e:
-            error_msg = str(e)
-            print(f"AI quote error: {error_msg}")
-            
-            # Increment error count
-            self.error_count += 1
-            
-            # Check for quota errors
-            if "429" in error_msg or "quota" in error_msg.lower() or "exceeded" in error_msg.lower():
-                self.quota_exceeded = True
-                self.quota_reset_time = time.time() + (24 * 60 * 60)  # 24 hours
-            
-            # After 5 consecutive errors, disable AI temporarily
-            if self.error_count >= 5:
-                self.quota_exceeded = True
-                print("Too many AI errors, disabling AI temporarily")
-            
+            self._record_failure(str(e), started)
             return None
+        
+        # Close the breaker on success
+        self.breaker.record_success()
+        self._record_call('success', started)
+        return quote_data
     
-    def _get_local_quote(self, age_data=None):
-        """Get quote from local JSON database"""
+    def _thread_pool(self):
+        if self._executor is None:
+            with self._client_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(self.ai_threads, thread_name_prefix='ai-call')
+        return self._executor
+    
+    async def agenerate_ai_quote(self, age_data=None, timeout=None):
+        """Async _generate_ai_quote, bounded by ``timeout`` seconds.
+
+        Calls are limited by the host-wide call budget (AI_CALLS_PER_MINUTE,
+        bursts of AI_CALL_BURST), the breaker and AI_MAX_CONCURRENT per
+        worker, not by the prefetcher's one call per ``ai_min_interval``. Uses the SDK's async call when the model has one,
+        otherwise the blocking call runs on a bounded thread pool
+        (AI_THREADS). A timeout counts as a failure; if the caller is
+        cancelled (client went away) the call is cancelled too. Breaker
+        bookkeeping is SQLite, so it runs off the event loop.
+        """
+        if not self.ai_available:
+            return None
+        if not self.client and not await asyncio.to_thread(self._ensure_client):
+            return None
+        
+        if self._in_flight >= self.ai_max_concurrent:
+            metrics.inc('agemaster_ai_requests_total', format_labels(outcome='skipped'))
+            return None
+        self._in_flight += 1
         try:
-            with open('data/quotes.json', 'r', encoding='utf-8') as f:
-                all_quotes = json.load(f)
+            if not await asyncio.to_thread(self._claim_call):
+                return None
             
-            # If we have age data, try to find age-relevant quotes
-            selected_quotes = all_quotes
-            
-            if age_data:
-                years = age_data.get('years', 0)
-                
-                # Age-based categories
-                if years < 20:
-                    keywords = ['youth', 'growth', 'future', 'learning', 'dream']
-                elif years < 40:
-                    keywords = ['experience', 'opportunity', 'journey', 'discovery']
-                elif years < 60:
-                    keywords = ['wisdom', 'midlife', 'reflection', 'purpose']
+            started = time.perf_counter()
+            try:
+                model = self.model_factory(self.model_name)
+                prompt = self._build_prompt(age_data)
+                generate_async = getattr(model, 'generate_content_async', None)
+                if generate_async:
+                    call = generate_async(prompt)
                 else:
-                    keywords = ['wisdom', 'legacy', 'time', 'life', 'memory']
-                
-                # Filter quotes with relevant keywords
-                relevant = []
-                for quote in all_quotes:
-                    text_lower = quote.get('text', '').lower()
-                    category_lower = quote.get('category', '').lower()
-                    
-                    if any(keyword in text_lower or keyword in category_lower 
-                          for keyword in keywords):
-                        relevant.append(quote)
-                
-                # Use relevant quotes if found, otherwise all quotes
-                if relevant:
-                    selected_quotes = relevant
-            
-            # Select random quote
-            quote = random.choice(selected_quotes)
-            
-            # Add metadata
-            quote['source'] = 'local'
-            quote['ai_generated'] = False
-            
-            return quote
+                    call = asyncio.get_running_loop().run_in_executor(self._thread_pool(), model.generate_content, prompt)
+                response = await asyncio.wait_for(call, timeout or self.ai_timeout)
+                quote_data = self._quote_from_response(response)
+            except asyncio.TimeoutError:
+                await asyncio.to_thread(self._record_failure, 'call timed out', started, 'timeout')
+                return None
+            except asyncio.CancelledError:
+                self._record_call('cancelled', started)
+                raise
+            except Exception as e:
+                await asyncio.to_thread(self._record_failure, str(e), started)
+                return None
             
-        except Exception as e:
-            print(f"Error loading local quotes: {e}")
+            await asyncio.to_thread(self.breaker.record_success)
+            self._record_call('success', started)
+            return quote_data
+        finally:
+            self._in_flight -= 1
+    
+    def _get_local_quote(self, age_data=None):
+        """Get quote from the in-memory local quote store"""
+        quote = local_store.random_quote(age_data)
+        if quote is None:
             # Ultimate fallback
             return {
                 'text': 'The years teach much which the days never know.',
@@ -192,6 +528,13 @@ class AIService:
                 'source': 'fallback',
                 'ai_generated': False
             }
+        
+        # Add metadata (copy, the stored quote is shared)
+        quote = dict(quote)
+        quote['source'] = 'local'
+        quote['ai_generated'] = False
+        
+        return quote
     
     def generate_fun_fact(self, age_data):
         """Generate fun fact - always use local for now"""
@@ -199,54 +542,54 @@ class AIService:
     
     def _get_local_fact(self, age_data):
         """Get local fun fact"""
-        try:
-            with open('data/fun_facts.json', 'r', encoding='utf-8') as f:
-                facts = json.load(f)
-            
-            fact = random.choice(facts)
+        fact = local_store.random_fact()
+        if fact is not None:
+            fact = dict(fact)
             fact['source'] = 'local'
-            
             return fact
-            
-        except Exception as e:
-            print(f"Error loading fun facts: {e}")
-            # Generate calculated fact based on age
-            years = age_data.get('years', 0)
-            days = age_data.get('total_days', 0)
-            
-            facts = [
-                {
-                    'fact': f'In {years} years, your heart has beaten approximately {days * 100000:,} times!',
-                    'icon': '❤️',
-                    'source': 'calculated'
-                },
-                {
-                    'fact': f'You have blinked about {days * 15000:,} times in {years} years!',
-                    'icon': '👁️',
-                    'source': 'calculated'
-                },
-                {
-                    'fact': f'You have lived through {years * 365:,} sunrises and sunsets!',
-                    'icon': '🌅',
-                    'source': 'calculated'
-                }
-            ]
-            
-            return random.choice(facts)
+        
+        # Generate calculated fact based on age
+        years = age_data.get('years', 0)
+        days = age_data.get('total_days', 0)
+        
+        facts = [
+            {
+                'fact': f'In {years} years, your heart has beaten approximately {days * 100000:,} times!',
+                'icon': '❤️',
+                'source': 'calculated'
+            },
+            {
+                'fact': f'You have blinked about {days * 15000:,} times in {years} years!',
+                'icon': '👁️',
+                'source': 'calculated'
+            },
+            {
+                'fact': f'You have lived through {years * 365:,} sunrises and sunsets!',
+                'icon': '🌅',
+                'source': 'calculated'
+            }
+        ]
+        
+        return random.choice(facts)
+    
+    @staticmethod
+    def _record_call(outcome, started):
+        labels = format_labels(outcome=outcome)
+        metrics.inc('agemaster_ai_requests_total', labels)
+        metrics.observe('agemaster_ai_request_duration_seconds', time.perf_counter() - started, labels)
     
     def check_quota_status(self):
-        """Check and reset quota if time has passed"""
-        if self.quota_exceeded and self.quota_reset_time:
-            if time.time() > self.quota_reset_time:
-                self.quota_exceeded = False
-                self.error_count = 0
-                print("AI quota reset, AI available again")
+        """Return the shared breaker state (resets happen automatically via half-open probes)"""
+        return self.breaker.status()
 
 # Create global instance
 ai_service = AIService()
 
 # Test the service
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     print(f"AI Available: {ai_service.ai_available}")
     print(f"Quota Exceeded: {ai_service.quota_exceeded}")
     
@@ -1,34 +1,63 @@
-from flask import Flask, render_template, request, jsonify, send_from_directory
+from flask import Flask, render_template, request, jsonify, abort, g, Response, stream_with_context, url_for
+from werkzeug.http import is_resource_modified
+from werkzeug.wsgi import wrap_file
 from datetime import datetime, date
+from functools import lru_cache
 from dateutil.relativedelta import relativedelta
+import csv
 import json
+import logging
+import mimetypes
 import os
-import random
-import re
-import requests
+import time
 from dotenv import load_dotenv
-from ai_service import ai_service
+from ai_service import ai_service, local_store
+from utils.result_cache import DailyResultCache
+from utils.assets import AssetManifest
+from utils.rendered_page import RenderedPage
+from utils.static_index import StaticFileIndex
+from utils.batch_age import calculate_ages_batch, batch_to_records
+from utils.group_compare import rank_ages, age_percentiles, age_gap_matrix
+from utils.milestones import DEFAULT_SCHEDULE, parse_schedule, milestones_for
+from utils.birthdays import MAX_WITHIN_DAYS, BirthdayIndex, next_birthday
+from utils.planets import (MAX_EARTH_DAYS, ORBITAL_PERIODS, PLANETS, next_birthday_days, planet_matrix,
+                           planetary_summary)
+from utils.time_perception import MAX_AGE_YEARS, time_perception
+from utils.life_calendar import (DEFAULT_LIFE_EXPECTANCY, MAX_LIFE_EXPECTANCY, LifeCalendarCache,
+                                 encode_calendar)
+from utils.calendar_index import (age_components, birth_attributes, zodiac_sign,
+                                  chinese_zodiac, WEEKDAYS)
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
+from utils.shared_state import DEFAULT_STATE_PATH
+from utils.metrics import metrics, format_labels
+from utils.error_ingest import ErrorIngestor, clean_report
+from utils.structured_logging import configure_logging, dropped_records, new_request_id
+from utils.validation import DateField, Schema, TextField, sanitize_text, validate_date
+import utils.sqlite_rate_limit  # registers the sqlite:// limiter storage
 
 # Load environment variables
 load_dotenv()
-# Get Grok API key
-GROK_API_KEY = os.getenv('GROK_API_KEY')
-GROK_API_URL = "https://api.x.ai/v1/chat/completions"
 
-app = Flask(__name__)
+# JSON logs via a queue are set up by the server entry points (configure_logging)
+logger = logging.getLogger('agemaster')
+access_logger = logging.getLogger('agemaster.access')
+
+# Static files go through serve_static (registered as the 'static' endpoint)
+app = Flask(__name__, static_folder=None)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'your-secure-secret-key-change-in-production')
 
 # ============================
 # RATE LIMITING CONFIGURATION
 # ============================
+# Counters live in a SQLite file shared by all workers on the host (see
+# utils/sqlite_rate_limit.py); set RATELIMIT_STORAGE_URI to override.
 limiter = Limiter(
     app=app,
     key_func=get_remote_address,
     default_limits=["200 per day", "50 per hour"],
-    storage_uri="memory://",
-    strategy="fixed-window",
+    storage_uri=os.getenv('RATELIMIT_STORAGE_URI', f"sqlite://{DEFAULT_STATE_PATH}"),
+    strategy="sliding-window-counter",
     headers_enabled=True,
     on_breach=lambda request_limit: jsonify({
         'error': 'Rate limit exceeded',
@@ -41,57 +70,25 @@ limiter = Limiter(
 # ============================
 def sanitize_input(text, max_length=100):
     """Sanitize input to prevent XSS and injection attacks"""
-    if not text or not isinstance(text, str):
-        return ""
-    
-    # Remove HTML tags
-    text = re.sub(r'<[^>]*>', '', text)
-    
-    # Remove dangerous characters
-    text = re.sub(r'[<>\"\';()&|$`]', '', text)
-    
-    # Limit length
-    if len(text) > max_length:
-        text = text[:max_length]
-    
-    return text.strip()
+    return sanitize_text(text, max_length=max_length)
 
 def validate_date_string(date_str, allow_empty=False):
     """Validate date string format and range"""
-    if not date_str:
-        return allow_empty, None
-    
-    # Check format
-    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
-        return False, "Date must be in YYYY-MM-DD format"
-    
-    try:
-        # Parse date
-        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-        
-        # Validate range (1900-2100)
-        if date_obj.year < 1900:
-            return False, "Date cannot be before 1900"
-        if date_obj.year > 2100:
-            return False, "Date cannot be after 2100"
-        
-        # Validate actual date (e.g., not 2023-02-30)
-        if date_obj.month < 1 or date_obj.month > 12:
-            return False, "Invalid month"
-        if date_obj.day < 1 or date_obj.day > 31:
-            return False, "Invalid day"
-        
-        # Check for valid day in month
-        last_day_of_month = (date_obj.replace(month=date_obj.month % 12 + 1, day=1) - 
-                           relativedelta(days=1)).day
-        if date_obj.day > last_day_of_month:
-            return False, f"Invalid date: {date_str}"
-        
-        return True, date_obj
-    except ValueError as e:
-        return False, f"Invalid date: {str(e)}"
-    except Exception as e:
-        return False, "Invalid date format"
+    return validate_date(date_str, allow_empty=allow_empty)
+
+# Request schemas, compiled once: one pass per request instead of regex per field
+BIRTH_DATE = DateField(required=True)
+TARGET_DATE = DateField()
+CALCULATE_REQUEST = Schema({'birth_date': BIRTH_DATE, 'target_date': TARGET_DATE})
+COMPARE_PERSON = Schema({'name': TextField(max_length=50, default='Person'), 'birth_date': BIRTH_DATE})
+MILESTONES_REQUEST = Schema({'birth_date': BIRTH_DATE})
+LIFE_CALENDAR_REQUEST = Schema({'birth_date': BIRTH_DATE, 'target_date': TARGET_DATE})
+
+def parse_target_date(value):
+    """An optional target_date from a JSON body: (datetime or None, error); non-strings are rejected"""
+    if value is not None and not isinstance(value, str):
+        return None, 'target_date must be a date string (YYYY-MM-DD)'
+    return TARGET_DATE(value or '')
 
 def validate_age_calculation(birth_date, target_date):
     """Validate age calculation parameters"""
@@ -122,30 +119,8 @@ def validate_age_calculation(birth_date, target_date):
 # ============================
 # DATA LOADING FUNCTIONS
 # ============================
-def load_json_data(filename):
-    """Safely load JSON data"""
-    try:
-        filepath = os.path.join('data', filename)
-        if not os.path.exists(filepath):
-            return []
-        
-        with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            
-        # Validate loaded data structure
-        if not isinstance(data, list):
-            return []
-            
-        return data
-    except (json.JSONDecodeError, IOError, PermissionError) as e:
-        print(f"Error loading {filename}: {str(e)}")
-        return []
-    except Exception as e:
-        print(f"Unexpected error loading {filename}: {str(e)}")
-        return []
-
-quotes_data = load_json_data('quotes.json')
-fun_facts_data = load_json_data('fun_facts.json')
+# Quotes and fun facts come from ai_service.local_store, loaded by warm_up()
+# (or lazily on first use) and reloaded when the files change
 
 # ============================
 # HELPER FUNCTIONS
@@ -173,87 +148,56 @@ def calculate_age(birth_date, target_date=None):
     if not is_valid:
         raise ValueError(error_msg)
     
-    delta = relativedelta(target_date, birth_date)
+    # Integer calendar arithmetic; relativedelta only outside the indexed range
+    components = age_components(birth_date, target_date)
+    if components is None:
+        delta = relativedelta(target_date, birth_date)
+        components = (delta.years, delta.months, delta.days, delta.hours, delta.minutes, delta.seconds)
+    years, months, days, hours, minutes, seconds = components
     
-    total_days = (target_date - birth_date).days
-    total_seconds = int((target_date - birth_date).total_seconds())
+    elapsed = target_date - birth_date
+    total_days = elapsed.days
+    total_seconds = int(elapsed.total_seconds())
     
     # Add bounds checking
     if total_days < 0 or total_days > 365.25 * 200:  # 200 years max
         raise ValueError("Invalid age range")
     
     return {
-        'years': delta.years,
-        'months': delta.months,
-        'days': delta.days,
-        'hours': delta.hours,
-        'minutes': delta.minutes,
-        'seconds': delta.seconds,
+        'years': years,
+        'months': months,
+        'days': days,
+        'hours': hours,
+        'minutes': minutes,
+        'seconds': seconds,
         'total_days': total_days,
         'total_hours': int(total_seconds / 3600),
         'total_minutes': int(total_seconds / 60),
         'total_seconds': total_seconds,
         'total_weeks': int(total_days / 7),
-        'total_months': delta.years * 12 + delta.months,
+        'total_months': years * 12 + months,
         'exact_years': total_days / 365.25
     }
 
 def get_zodiac_sign(month, day):
     """Calculate zodiac sign"""
-    zodiac_signs = [
-        ("Capricorn", (1, 1), (1, 19)),
-        ("Aquarius", (1, 20), (2, 18)),
-        ("Pisces", (2, 19), (3, 20)),
-        ("Aries", (3, 21), (4, 19)),
-        ("Taurus", (4, 20), (5, 20)),
-        ("Gemini", (5, 21), (6, 20)),
-        ("Cancer", (6, 21), (7, 22)),
-        ("Leo", (7, 23), (8, 22)),
-        ("Virgo", (8, 23), (9, 22)),
-        ("Libra", (9, 23), (10, 22)),
-        ("Scorpio", (10, 23), (11, 21)),
-        ("Sagittarius", (11, 22), (12, 21)),
-        ("Capricorn", (12, 22), (12, 31))
-    ]
-    
-    for sign, start, end in zodiac_signs:
-        if (month == start[0] and day >= start[1]) or (month == end[0] and day <= end[1]):
-            return sign
-    return "Unknown"
+    return zodiac_sign(month, day) or "Unknown"
 
 def get_chinese_zodiac(year):
     """Calculate Chinese zodiac"""
-    if year < 1900 or year > 2100:
-        return "Unknown"
-    
-    zodiac_animals = ["Rat", "Ox", "Tiger", "Rabbit", "Dragon", "Snake", 
-                     "Horse", "Goat", "Monkey", "Rooster", "Dog", "Pig"]
-    return zodiac_animals[(year - 1900) % 12]
+    return chinese_zodiac(year) or "Unknown"
 
-def get_planet_age(birth_date, planet):
+def get_planet_age(birth_date, planet, now=None):
     """Calculate age on different planets"""
-    planet_orbital_periods = {
-        'mercury': 87.97,
-        'venus': 224.70,
-        'earth': 365.25,
-        'mars': 686.98,
-        'jupiter': 4332.82,
-        'saturn': 10755.70,
-        'uranus': 30687.15,
-        'neptune': 60190.03,
-        'pluto': 90520.00
-    }
-    
-    if planet.lower() not in planet_orbital_periods:
+    period = ORBITAL_PERIODS.get(planet.lower())
+    if period is None:
         return 0
     
-    earth_days = (datetime.now() - birth_date).days
-    if earth_days <= 0 or earth_days > 365.25 * 200:
+    earth_days = ((now or datetime.now()) - birth_date).days
+    if earth_days <= 0 or earth_days > MAX_EARTH_DAYS:
         return 0
     
-    planet_years = earth_days / planet_orbital_periods.get(planet.lower(), 365.25)
-    
-    return round(planet_years, 2)
+    return round(earth_days / period, 2)
 
 def get_next_birthday(birth_date):
     """Calculate days until next birthday"""
@@ -263,54 +207,198 @@ def get_next_birthday(birth_date):
     if not isinstance(birth_date, (datetime, date)):
         return 0
     
-    try:
-        next_birthday = date(today.year, birth_date.month, birth_date.day)
-        
-        if next_birthday < today:
-            next_birthday = date(today.year + 1, birth_date.month, birth_date.day)
-        
-        days_until = (next_birthday - today).days
-        return max(0, min(days_until, 365))  # Cap at 365 days
-    except ValueError:
-        return 0
+    # Feb 29 birthdays fall on Feb 28 in common years
+    return (next_birthday(birth_date, today) - today).days
 
 def get_weekday_of_birth(birth_date):
     """Get weekday when born"""
-    days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-    
     if not isinstance(birth_date, (datetime, date)):
         return "Unknown"
     
-    try:
-        return days[birth_date.weekday()]
-    except:
-        return "Unknown"
+    attributes = birth_attributes(birth_date)
+    if attributes:
+        return attributes[2]
+    return WEEKDAYS[birth_date.weekday()]
+
+# Perception factors per day of age come from utils.time_perception.time_perception,
+# interpolated from data/time_perception.json (shared with DateUtils)
 
 def get_time_perception_factor(age):
     """Calculate time perception factor"""
     if not isinstance(age, (int, float)) or age < 0 or age > 150:
         return 1.0
+    return round(time_perception.factor(time_perception.day_index(age)), 3)
+
+def build_age_result(birth_date, target_date):
+    """Build the deterministic part of a /calculate response (no quote or fact)"""
+    age_data = calculate_age(birth_date, target_date)
     
-    if age < 10:
-        return 0.3
-    elif age < 20:
-        return 0.6
-    elif age < 30:
-        return 0.8
-    elif age < 50:
-        return 1.2
-    elif age < 70:
-        return 1.5
-    else:
-        return 2.0
+    # Validate calculated age
+    age_in_years = age_data['exact_years']
+    if age_in_years < 0 or age_in_years > 150:
+        raise ValueError('Invalid age calculated')
+    
+    # Additional calculations
+    zodiac, chinese_zodiac, weekday_born, _ = birth_attributes(birth_date)
+    next_birthday = get_next_birthday(birth_date)
+    
+    # Ages on all nine bodies at the target date, and the next planetary birthdays
+    planetary_ages, next_planetary_birthdays = planetary_summary(birth_date, target_date)
+    
+    # Life calendar with validation
+    life_expectancy = DEFAULT_LIFE_EXPECTANCY
+    weeks_lived = int(age_data['exact_years'] * 52.143)
+    total_weeks = life_expectancy * 52.143
+    
+    if weeks_lived < 0 or weeks_lived > total_weeks:
+        weeks_lived = 0
+        total_weeks = 0
+    
+    weeks_remaining = max(0, int(total_weeks - weeks_lived))
+    percentage_lived = min(100, max(0, (weeks_lived / total_weeks * 100) if total_weeks > 0 else 0))
+    
+    return {
+        'success': True,
+        'age_data': age_data,
+        'zodiac_sign': zodiac,
+        'chinese_zodiac': chinese_zodiac,
+        'next_birthday': next_birthday,
+        'weekday_born': weekday_born,
+        'planetary_ages': planetary_ages,
+        'next_planetary_birthdays': next_planetary_birthdays,
+        'life_calendar': {
+            'weeks_lived': weeks_lived,
+            'weeks_remaining': weeks_remaining,
+            'percentage_lived': round(percentage_lived, 1),
+            'life_expectancy': life_expectancy
+        },
+        'time_perception': round(time_perception.factor(age_data['total_days']), 3),
+        'birth_date_formatted': birth_date.strftime('%B %d, %Y'),
+        'target_date_formatted': target_date.strftime('%B %d, %Y')
+    }
+
+def with_time_of_day(age_data, moment):
+    """Extend a midnight-based age result to ``moment`` on the same day.
+
+    Birth dates are always midnight, so only the clock fields and the
+    second-based totals change during the day.
+    """
+    seconds_today = moment.hour * 3600 + moment.minute * 60 + moment.second
+    total_seconds = age_data['total_days'] * 86400 + seconds_today
+    age_data = dict(age_data)
+    age_data.update({
+        'hours': moment.hour,
+        'minutes': moment.minute,
+        'seconds': moment.second,
+        'total_hours': int(total_seconds / 3600),
+        'total_minutes': int(total_seconds / 60),
+        'total_seconds': total_seconds
+    })
+    return age_data
+
+# Per-process cache of deterministic /calculate results, flushed at midnight
+result_cache = DailyResultCache(maxsize=int(os.getenv('RESULT_CACHE_SIZE', 4096)))
+
+# Per-process LRU of week grids for the life-calendar endpoints
+life_calendar_cache = LifeCalendarCache(maxsize=int(os.getenv('LIFE_CALENDAR_CACHE_SIZE', 4096)))
+
+# Fingerprinted bundle names from `python -m utils.assets`
+asset_manifest = AssetManifest()
+
+# ============================
+# METRICS AND REQUEST LOGGING
+# ============================
+# Recorded per process, flushed to the shared store about once a second and
+# served host-wide at /metrics (see utils/metrics.py)
+@lru_cache(maxsize=4096)
+def endpoint_labels(endpoint, method=None, status=None):
+    if method is None:
+        return format_labels(endpoint=endpoint)
+    return format_labels(endpoint=endpoint, method=method, status=status)
+
+def result_cache_counters():
+    stats = result_cache.stats()
+    return {
+        ('agemaster_result_cache_hits_total', ''): stats['hits'],
+        ('agemaster_result_cache_misses_total', ''): stats['misses'],
+        ('agemaster_result_cache_evictions_total', ''): stats['evictions'],
+        ('agemaster_life_calendar_cache_hits_total', ''): life_calendar_cache.hits,
+        ('agemaster_life_calendar_cache_misses_total', ''): life_calendar_cache.misses
+    }
+
+metrics.add_collector(result_cache_counters)
+
+def log_drop_counters():
+    """Log records sampled out, rate limited or dropped on a full queue"""
+    return {('agemaster_log_records_dropped_total', format_labels(reason=reason)): count
+            for reason, count in dropped_records().items()}
+
+metrics.add_collector(log_drop_counters)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+    g.request_id = new_request_id(request.headers.get('X-Request-ID'))
+
+@app.after_request
+def record_request_metrics(response):
+    """Count every response and time it by endpoint (404s share one label)"""
+    endpoint = request.endpoint or 'unmatched'
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.observe('agemaster_http_request_duration_seconds', time.perf_counter() - started,
+                        endpoint_labels(endpoint))
+    metrics.inc('agemaster_http_requests_total', endpoint_labels(endpoint, request.method, response.status_code))
+    if response.status_code == 429:
+        metrics.inc('agemaster_rate_limited_total', endpoint_labels(endpoint))
+    
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers['X-Request-ID'] = request_id
+    access_logger.info('%s %s %s', request.method, request.path, response.status_code, extra={
+        'event': 'request',
+        'endpoint': endpoint,
+        'status': response.status_code,
+        'duration_ms': round((time.perf_counter() - started) * 1000, 3) if started is not None else None
+    })
+    return response
+
+@app.route('/metrics')
+@limiter.exempt
+def prometheus_metrics():
+    """Prometheus scrape endpoint, aggregated over every worker on the host"""
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
 
 # ============================
 # ROUTES WITH RATE LIMITING
 # ============================
+def render_index():
+    """Render the main page outside of any real request"""
+    asset_manifest.load()
+    with app.test_request_context('/'):
+        return render_template('index.html')
+
+# The main page is static per deploy: render once, re-render on template/asset changes
+index_page = RenderedPage(
+    render_index,
+    watch_dirs=[os.path.join(app.root_path, 'templates')],
+    watch_files=[asset_manifest.path]
+)
+
 @app.route('/')
 def index():
     """Main page - no rate limiting needed"""
-    return render_template('index.html')
+    body, etag, gzipped = index_page.variant(request.accept_encodings.quality('gzip') > 0)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        response = Response(body, mimetype='text/html')
+        if gzipped:
+            response.headers['Content-Encoding'] = 'gzip'
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    response.vary.add('Accept-Encoding')
+    return response
 
 @app.route('/calculate', methods=['POST'])
 @limiter.limit("15 per minute")  # 15 requests per minute per IP
@@ -325,117 +413,328 @@ def calculate_age_endpoint():
         if not data or not isinstance(data, dict):
             return jsonify({'error': 'Invalid JSON data'}), 400
         
-        # Sanitize inputs
-        birth_date_str = sanitize_input(data.get('birth_date', ''), max_length=20)
-        target_date_str = sanitize_input(data.get('target_date', ''), max_length=20)
+        # Sanitize and validate inputs
+        values, error = CALCULATE_REQUEST(data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Validate birth date
-        if not birth_date_str:
-            return jsonify({'error': 'Birth date is required'}), 400
-        
-        is_valid_birth, birth_date_or_error = validate_date_string(birth_date_str)
-        if not is_valid_birth:
-            return jsonify({'error': birth_date_or_error}), 400
-        
-        birth_date = birth_date_or_error
-        
-        # Validate target date
-        if target_date_str:
-            is_valid_target, target_date_or_error = validate_date_string(target_date_str)
-            if not is_valid_target:
-                return jsonify({'error': target_date_or_error}), 400
-            target_date = target_date_or_error
-        else:
-            target_date = datetime.now()
+        now = datetime.now()
+        birth_date = values['birth_date']
+        target_is_now = values['target_date'] is None
+        target_date = now if target_is_now else values['target_date']
         
         # Additional validation
-        if birth_date > datetime.now():
+        if birth_date > now:
             return jsonify({'error': 'Birth date cannot be in the future'}), 400
         
         if birth_date > target_date:
             return jsonify({'error': 'Birth date cannot be after target date'}), 400
         
-        # Calculate age with error handling
-        try:
-            age_data = calculate_age(birth_date, target_date)
-        except ValueError as e:
-            return jsonify({'error': str(e)}), 400
-        
-        # Validate calculated age
-        age_in_years = age_data['exact_years']
-        if age_in_years < 0 or age_in_years > 150:
-            return jsonify({'error': 'Invalid age calculated'}), 400
-        
-        # Additional calculations
-        zodiac = get_zodiac_sign(birth_date.month, birth_date.day)
-        chinese_zodiac = get_chinese_zodiac(birth_date.year)
-        next_birthday = get_next_birthday(birth_date)
-        weekday_born = get_weekday_of_birth(birth_date)
-        
-        # Calculate planetary ages
-        planets = ['mercury', 'venus', 'mars', 'jupiter', 'saturn']
-        planetary_ages = {}
-        for planet in planets:
-            planetary_ages[planet] = get_planet_age(birth_date, planet)
-        
-        # Life calendar with validation
-        life_expectancy = 80
-        weeks_lived = int(age_data['exact_years'] * 52.143)
-        total_weeks = life_expectancy * 52.143
-        
-        if weeks_lived < 0 or weeks_lived > total_weeks:
-            weeks_lived = 0
-            total_weeks = 0
-        
-        weeks_remaining = max(0, int(total_weeks - weeks_lived))
-        percentage_lived = min(100, max(0, (weeks_lived / total_weeks * 100) if total_weeks > 0 else 0))
-        
-        # Time perception
-        time_perception = get_time_perception_factor(age_data['years'])
+        # Deterministic part of the response, cached per (birth day, target day)
+        cache_key = (birth_date.toordinal(), target_date.toordinal(), target_is_now)
+        result = result_cache.get(cache_key, today=now.date())
+        if result is None:
+            target_day = datetime.combine(target_date.date(), datetime.min.time())
+            try:
+                result = build_age_result(birth_date, target_day)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+            result_cache.put(cache_key, result, today=now.date())
+        
+        response = dict(result)
+        if target_is_now:
+            response['age_data'] = with_time_of_day(result['age_data'], now)
         
         # Get random quote safely
-        random_quote = random.choice(quotes_data) if quotes_data else {
+        response['quote'] = local_store.random_quote() or {
             'text': 'The years teach much which the days never know.',
             'author': 'Ralph Waldo Emerson'
         }
         
         # Get fun fact safely
-        random_fact = random.choice(fun_facts_data) if fun_facts_data else {
+        response['fun_fact'] = local_store.random_fact() or {
             'fact': 'Your heart beats about 100,000 times per day!',
             'icon': '❤️'
         }
         
-        # Build response with sanitized data
-        response = {
-            'success': True,
-            'age_data': age_data,
-            'zodiac_sign': zodiac,
-            'chinese_zodiac': chinese_zodiac,
-            'next_birthday': next_birthday,
-            'weekday_born': weekday_born,
-            'planetary_ages': planetary_ages,
-            'life_calendar': {
-                'weeks_lived': weeks_lived,
-                'weeks_remaining': weeks_remaining,
-                'percentage_lived': round(percentage_lived, 1),
-                'life_expectancy': life_expectancy
-            },
-            'time_perception': time_perception,
-            'quote': random_quote,
-            'fun_fact': random_fact,
-            'birth_date_formatted': birth_date.strftime('%B %d, %Y'),
-            'target_date_formatted': target_date.strftime('%B %d, %Y')
-        }
-        
         return jsonify(response)
         
     except Exception as e:
         # Log the error but don't expose details to user
-        print(f"Error in calculate endpoint: {str(e)}")
+        logger.exception("Error in calculate endpoint")
         return jsonify({'error': 'An error occurred while processing your request'}), 500
 
+@app.route('/api/cache/stats')
+def cache_stats():
+    """Hit/miss counters for the /calculate result cache"""
+    return jsonify(result_cache.stats())
+
+MAX_BATCH_SIZE = 10000
+
+@app.route('/calculate/batch', methods=['POST'])
+@limiter.limit("5 per minute")
+def calculate_age_batch_endpoint():
+    """Calculate ages for many birth dates in one request"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
+        birth_dates = data.get('birth_dates')
+        target_dates = data.get('target_dates')
+        
+        if not isinstance(birth_dates, list) or not birth_dates:
+            return jsonify({'error': 'birth_dates must be a non-empty list'}), 400
+        if len(birth_dates) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Too many rows (maximum {MAX_BATCH_SIZE})'}), 400
+        if target_dates is not None and (not isinstance(target_dates, list) or len(target_dates) != len(birth_dates)):
+            return jsonify({'error': 'target_dates must be a list matching birth_dates'}), 400
+        
+        # One reference instant for the whole batch
+        now = datetime.now()
+        shared_target, error = parse_target_date(data.get('target_date'))
+        if error:
+            return jsonify({'error': error}), 400
+        shared_target = shared_target or now
+        
+        results = [None] * len(birth_dates)
+        valid_rows, valid_births, valid_targets = [], [], []
+        for index, raw_birth in enumerate(birth_dates):
+            birth_date, error = BIRTH_DATE(raw_birth)
+            if error:
+                results[index] = {'index': index, 'error': error}
+                continue
+            
+            target_date = shared_target
+            if target_dates is not None:
+                row_target, error = parse_target_date(target_dates[index])
+                if error:
+                    results[index] = {'index': index, 'error': error}
+                    continue
+                if row_target is not None:
+                    target_date = row_target
+            
+            valid_rows.append(index)
+            valid_births.append(birth_date)
+            valid_targets.append(target_date)
+        
+        if valid_rows:
+            columns, errors = calculate_ages_batch(valid_births, valid_targets, now=now)
+            for index, age_data, error in zip(valid_rows, batch_to_records(columns, errors), errors):
+                if error:
+                    results[index] = {'index': index, 'error': error}
+                else:
+                    results[index] = {'index': index, 'age_data': age_data}
+        
+        error_count = sum(1 for result in results if 'error' in result)
+        return jsonify({
+            'success': True,
+            'count': len(results),
+            'error_count': error_count,
+            'results': results
+        })
+        
+    except Exception as e:
+        logger.exception("Error in calculate batch endpoint")
+        return jsonify({'error': 'An error occurred while processing your request'}), 500
+
+STREAM_CHUNK_SIZE = 1000
+STREAM_READ_SIZE = 64 * 1024
+MAX_LINE_BYTES = 64 * 1024
+LINE_TOO_LONG = f'Row longer than {MAX_LINE_BYTES // 1024} KiB'
+
+def iter_text_lines(stream, read_size=STREAM_READ_SIZE, max_line=MAX_LINE_BYTES):
+    """Yield decoded lines from a binary stream without buffering the whole body.
+
+    A line longer than ``max_line`` bytes is dropped up to its newline and
+    yielded as None, so one runaway row cannot grow the buffer without bound.
+    """
+    pending = bytearray()
+    overlong = False
+    while True:
+        block = stream.read(read_size)
+        if not block:
+            break
+        view = memoryview(block)
+        start = 0
+        while True:
+            end = block.find(b'\n', start)
+            if end == -1:
+                break
+            if overlong or len(pending) + end - start > max_line:
+                yield None
+            else:
+                pending += view[start:end]
+                yield pending.decode('utf-8', errors='replace') + '\n'
+            pending.clear()
+            overlong = False
+            start = end + 1
+        if not overlong:
+            if len(pending) + len(block) - start > max_line:
+                overlong = True
+                pending.clear()
+            else:
+                pending += view[start:]
+    if overlong:
+        yield None
+    elif pending:
+        yield pending.decode('utf-8', errors='replace')
+
+def iter_csv_rows(lines):
+    """csv.DictReader over ``lines``, with an error in place of each overlong line"""
+    skipped = []
+    
+    def accepted():
+        for line in lines:
+            if line is None:
+                skipped.append(LINE_TOO_LONG)
+            else:
+                yield line
+    
+    for row in csv.DictReader(accepted()):
+        while skipped:
+            yield skipped.pop()
+        yield row.get('id'), row.get('birth_date'), row.get('target_date')
+    yield from skipped
+
+def iter_upload_rows(lines, upload_format):
+    """Yield (row_id, birth_date, target_date) tuples or an error string per row"""
+    if upload_format == 'csv':
+        yield from iter_csv_rows(lines)
+        return
+    
+    for line in lines:
+        if line is None:
+            yield LINE_TOO_LONG
+            continue
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            yield 'Invalid JSON row'
+            continue
+        if not isinstance(row, dict):
+            yield 'Invalid JSON row'
+            continue
+        yield row.get('id'), row.get('birth_date'), row.get('target_date')
+
+def calculate_row_chunk(chunk, now):
+    """Validate and calculate one chunk of parsed upload rows"""
+    results = []
+    valid_positions, valid_births, valid_targets = [], [], []
+    for row_number, row in chunk:
+        if isinstance(row, str):
+            results.append({'row': row_number, 'error': row})
+            continue
+        
+        row_id, raw_birth, raw_target = row
+        result = {'row': row_number}
+        if row_id is not None:
+            result['id'] = sanitize_input(str(row_id), max_length=50)
+        results.append(result)
+        
+        birth_date, error = BIRTH_DATE(raw_birth)
+        if error:
+            result['error'] = error
+            continue
+        
+        target_date, error = parse_target_date(raw_target)
+        if error:
+            result['error'] = error
+            continue
+        if target_date is None:
+            target_date = now
+        
+        valid_positions.append(len(results) - 1)
+        valid_births.append(birth_date)
+        valid_targets.append(target_date)
+    
+    if valid_positions:
+        columns, errors = calculate_ages_batch(valid_births, valid_targets, now=now)
+        for position, age_data, error in zip(valid_positions, batch_to_records(columns, errors), errors):
+            if error:
+                results[position]['error'] = error
+            else:
+                results[position]['age_data'] = age_data
+    
+    return results
+
+@app.route('/calculate/stream', methods=['POST'])
+@limiter.limit("5 per minute")
+def calculate_age_stream_endpoint():
+    """Stream ages for a CSV or NDJSON upload back as NDJSON"""
+    mimetype = request.mimetype
+    if mimetype == 'text/csv':
+        upload_format = 'csv'
+    elif mimetype in ('application/x-ndjson', 'application/jsonl', 'application/json-lines'):
+        upload_format = 'ndjson'
+    else:
+        return jsonify({'error': 'Content-Type must be text/csv or application/x-ndjson'}), 415
+    
+    stream = request.stream
+    now = datetime.now()
+    
+    def generate():
+        row_count = 0
+        error_count = 0
+        chunk = []
+        try:
+            rows = iter_upload_rows(iter_text_lines(stream), upload_format)
+            for row_count, row in enumerate(rows, start=1):
+                chunk.append((row_count, row))
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    for result in calculate_row_chunk(chunk, now):
+                        error_count += 'error' in result
+                        yield json.dumps(result) + '\n'
+                    chunk = []
+            
+            for result in calculate_row_chunk(chunk, now):
+                error_count += 'error' in result
+                yield json.dumps(result) + '\n'
+            
+            yield json.dumps({'done': True, 'rows': row_count, 'error_count': error_count}) + '\n'
+        except Exception as e:
+            logger.exception("Error in calculate stream endpoint")
+            yield json.dumps({'done': False, 'error': 'An error occurred while processing your request'}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+# Shared with the async quote handlers in asgi.py
+RANDOM_QUOTE_LIMIT = "30 per minute"
+AI_QUOTE_LIMIT = "5 per minute"
+FALLBACK_QUOTE = {
+    'text': 'The years teach much which the days never know.',
+    'author': 'Ralph Waldo Emerson',
+    'category': 'wisdom'
+}
+
+def sanitize_quote(quote):
+    """Sanitize the text and author of a generated quote (in place)"""
+    if 'text' in quote:
+        quote['text'] = sanitize_input(quote['text'], max_length=500)
+    if 'author' in quote:
+        quote['author'] = sanitize_input(quote['author'], max_length=100)
+    return quote
+
+def sanitize_age_data(age_data):
+    """Keep scalar age_data values, sanitizing strings; None if not a usable dict"""
+    if not age_data or not isinstance(age_data, dict):
+        return None
+    sanitized_age_data = {}
+    for key, value in age_data.items():
+        if isinstance(value, (str, int, float)):
+            if isinstance(value, str):
+                sanitized_age_data[key] = sanitize_input(str(value), max_length=50)
+            else:
+                sanitized_age_data[key] = value
+    return sanitized_age_data
+
 @app.route('/api/quotes/random')
-@limiter.limit("30 per minute")
+@limiter.limit(RANDOM_QUOTE_LIMIT)
 def random_quote():
     """Get random quote - try AI first, then fallback"""
     try:
@@ -444,27 +743,17 @@ def random_quote():
             try:
                 ai_quote = ai_service.generate_quote()
                 if ai_quote and isinstance(ai_quote, dict):
-                    # Sanitize AI quote
-                    if 'text' in ai_quote:
-                        ai_quote['text'] = sanitize_input(ai_quote['text'], max_length=500)
-                    if 'author' in ai_quote:
-                        ai_quote['author'] = sanitize_input(ai_quote['author'], max_length=100)
-                    return jsonify(ai_quote)
+                    return jsonify(sanitize_quote(ai_quote))
             except Exception as e:
-                print(f"AI quote failed, using fallback: {e}")
+                logger.warning("AI quote failed, using fallback: %s", e, extra={'event': 'quote_fallback'})
         
         # Fallback to local quote
-        quote = random.choice(quotes_data) if quotes_data else {
-            'text': 'The years teach much which the days never know.',
-            'author': 'Ralph Waldo Emerson',
-            'category': 'wisdom',
-            'source': 'fallback'
-        }
+        quote = local_store.random_quote() or dict(FALLBACK_QUOTE, source='fallback')
         
         return jsonify(quote)
         
     except Exception as e:
-        print(f"Error in random_quote: {str(e)}")
+        logger.exception("Error in random_quote")
         return jsonify({
             'text': 'The years teach much which the days never know.',
             'author': 'Ralph Waldo Emerson',
@@ -473,7 +762,7 @@ def random_quote():
         })
 
 @app.route('/api/quotes/ai', methods=['POST'])
-@limiter.limit("5 per minute")  # Strict limit for AI calls
+@limiter.limit(AI_QUOTE_LIMIT)  # Strict limit for AI calls
 def generate_ai_quote():
     """Generate AI quote with age context"""
     try:
@@ -481,34 +770,20 @@ def generate_ai_quote():
             return jsonify({'error': 'Content-Type must be application/json'}), 400
         
         data = request.get_json() or {}
-        age_data = data.get('age_data')
-        
-        # Validate age_data structure if provided
-        if age_data and isinstance(age_data, dict):
-            # Sanitize age_data values
-            sanitized_age_data = {}
-            for key, value in age_data.items():
-                if isinstance(value, (str, int, float)):
-                    if isinstance(value, str):
-                        sanitized_age_data[key] = sanitize_input(str(value), max_length=50)
-                    else:
-                        sanitized_age_data[key] = value
-        
-        if hasattr(ai_service, 'available') and ai_service.available:
+        age_data = sanitize_age_data(data.get('age_data'))
+        
+        # Served from the background prefetch pool, never blocks on the model
+        if getattr(ai_service, 'ai_available', False):
             quote = ai_service.generate_quote(age_data)
             if quote and isinstance(quote, dict):
                 return jsonify({
                     'success': True,
                     'quote': quote,
-                    'source': 'ai'
+                    'source': quote.get('source', 'ai')
                 })
         
         # Fallback
-        quote = random.choice(quotes_data) if quotes_data else {
-            'text': 'The years teach much which the days never know.',
-            'author': 'Ralph Waldo Emerson',
-            'category': 'wisdom'
-        }
+        quote = local_store.random_quote() or FALLBACK_QUOTE
         return jsonify({
             'success': True,
             'quote': quote,
@@ -516,7 +791,7 @@ def generate_ai_quote():
         })
         
     except Exception as e:
-        print(f"Error in generate_ai_quote: {str(e)}")
+        logger.exception("Error in generate_ai_quote")
         return jsonify({
             'success': False,
             'error': 'Failed to generate quote'
@@ -527,78 +802,187 @@ def generate_ai_quote():
 def random_fact():
     """Get random fun fact"""
     try:
-        fact = random.choice(fun_facts_data) if fun_facts_data else {
+        fact = local_store.random_fact() or {
             'fact': 'Your heart beats about 100,000 times per day!',
             'icon': '❤️'
         }
         
         # Sanitize fact
         if isinstance(fact, dict) and 'fact' in fact:
-            fact['fact'] = sanitize_input(fact['fact'], max_length=500)
+            fact = {**fact, 'fact': sanitize_input(fact['fact'], max_length=500)}  # don't mutate the shared store
         
         return jsonify(fact)
     except Exception as e:
-        print(f"Error in random_fact: {str(e)}")
+        logger.exception("Error in random_fact")
         return jsonify({
             'fact': 'Your heart beats about 100,000 times per day!',
             'icon': '❤️'
         })
 
+MAX_PERCEPTION_AGES = 1000
+MAX_CURVE_POINTS = 20000
+
+def parse_age_param(value, name='age'):
+    """An age in years from a query parameter; returns ``(age, error)``"""
+    try:
+        age = float(value)
+    except (TypeError, ValueError):
+        return None, f'{name} must be a number of years'
+    if not 0 <= age <= MAX_AGE_YEARS:
+        return None, f'{name} must be between 0 and {MAX_AGE_YEARS}'
+    return age, None
+
+@app.route('/api/time-perception')
+@limiter.limit("30 per minute")
+def time_perception_api():
+    """Perception factor for one age (?age=34.5), a batch (?ages=1,20,65) or a lifetime curve (?curve=1)"""
+    try:
+        args = request.args
+        if 'age' in args:
+            age, error = parse_age_param(args['age'])
+            if error:
+                return jsonify({'error': error}), 400
+            age_days = time_perception.day_index(age)
+            group = time_perception.group(age)
+            return jsonify({
+                'success': True,
+                'age': age,
+                'age_days': age_days,
+                'factor': round(time_perception.factor(age_days), 4),
+                'group': {'range': group.label, 'description': group.description, 'factor': group.factor} if group else None
+            })
+        
+        if 'ages' in args:
+            items = [item for item in args['ages'].split(',') if item.strip()]
+            if not items:
+                return jsonify({'error': 'ages must be a comma-separated list of years'}), 400
+            if len(items) > MAX_PERCEPTION_AGES:
+                return jsonify({'error': f'Too many ages (maximum {MAX_PERCEPTION_AGES})'}), 400
+            ages = []
+            for item in items:
+                age, error = parse_age_param(item, 'ages')
+                if error:
+                    return jsonify({'error': error}), 400
+                ages.append(age)
+            days = [time_perception.day_index(age) for age in ages]
+            return jsonify({
+                'success': True,
+                'ages': ages,
+                'factors': time_perception.factors_at(days).round(4).tolist()
+            })
+        
+        if 'curve' in args:
+            max_age, error = parse_age_param(args.get('max_age', MAX_AGE_YEARS), 'max_age')
+            if error:
+                return jsonify({'error': error}), 400
+            step_days = args.get('step_days', '7')
+            if not step_days.isdigit() or int(step_days) < 1:
+                return jsonify({'error': 'step_days must be a positive whole number'}), 400
+            step_days = int(step_days)
+            if time_perception.day_index(max_age) // step_days + 1 > MAX_CURVE_POINTS:
+                return jsonify({'error': f'Too many points (maximum {MAX_CURVE_POINTS}); use a larger step_days'}), 400
+            return jsonify({
+                'success': True,
+                'step_days': step_days,
+                'max_age': max_age,
+                'factors': time_perception.curve(step_days, max_age).round(4).tolist(),
+                'groups': [{'range': group.label, 'description': group.description, 'factor': group.factor}
+                           for group in time_perception.groups]
+            })
+        
+        return jsonify({'error': 'Provide one of: age, ages, curve'}), 400
+        
+    except Exception as e:
+        logger.exception("Error in time_perception_api")
+        return jsonify({'error': 'Failed to calculate time perception'}), 400
+
+MAX_COMPARE_PERSONS = 5000
+MAX_MATRIX_PERSONS = 1000
+
 @app.route('/compare', methods=['POST'])
 @limiter.limit("10 per minute")
 def compare_ages():
-    """Compare multiple ages"""
+    """Compare ages across a group, with ranking and an optional age-gap matrix"""
     try:
         if not request.is_json:
             return jsonify({'error': 'Content-Type must be application/json'}), 400
         
         data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
         persons = data.get('persons', [])
+        include_matrix = data.get('include_matrix', False)
         
-        if not isinstance(persons, list) or len(persons) > 10:  # Limit to 10 persons
+        if not isinstance(include_matrix, bool):
+            return jsonify({'error': 'include_matrix must be true or false'}), 400
+        if not isinstance(persons, list) or len(persons) > MAX_COMPARE_PERSONS:
             return jsonify({'error': 'Invalid persons data or too many persons'}), 400
+        if include_matrix and len(persons) > MAX_MATRIX_PERSONS:
+            return jsonify({'error': f'Age-gap matrix supports at most {MAX_MATRIX_PERSONS} persons'}), 400
         
-        results = []
-        for person in persons:
+        # Validate every row, reporting bad ones instead of dropping them silently
+        errors = []
+        rows = []
+        for index, person in enumerate(persons):
             if not isinstance(person, dict):
+                errors.append({'index': index, 'error': 'Invalid person data'})
                 continue
             
-            # Sanitize inputs
-            name = sanitize_input(person.get('name', 'Person'), max_length=50)
-            birth_date_str = sanitize_input(person.get('birth_date', ''), max_length=20)
-            
-            if not birth_date_str:
-                continue
-            
-            # Validate date
-            is_valid, birth_date_or_error = validate_date_string(birth_date_str)
-            if not is_valid:
-                continue
-            
-            birth_date = birth_date_or_error
-            
-            # Calculate age
-            try:
-                age_data = calculate_age(birth_date)
-            except:
+            # Sanitize and validate inputs
+            values, error = COMPARE_PERSON(person)
+            if error:
+                errors.append({'index': index, 'error': error})
                 continue
             
-            zodiac = get_zodiac_sign(birth_date.month, birth_date.day)
-            
-            results.append({
-                'name': name,
-                'age_data': age_data,
-                'zodiac': zodiac,
-                'birth_year': birth_date.year
-            })
+            rows.append((index, values['name'], values['birth_date']))
+        
+        # One reference instant for everyone in the response
+        now = datetime.now()
+        results = []
+        if rows:
+            columns, row_errors = calculate_ages_batch([birth for _, _, birth in rows], now, now=now)
+            for (index, name, birth_date), age_data, error in zip(rows, batch_to_records(columns, row_errors), row_errors):
+                if error:
+                    errors.append({'index': index, 'error': error})
+                    continue
+                results.append({
+                    'index': index,
+                    'name': name,
+                    'age_data': age_data,
+                    'zodiac': birth_attributes(birth_date)[0],
+                    'birth_year': birth_date.year
+                })
         
         if not results:
-            return jsonify({'error': 'No valid persons to compare'}), 400
+            return jsonify({'error': 'No valid persons to compare', 'errors': errors}), 400
+        
+        total_days = [result['age_data']['total_days'] for result in results]
+        order, ranks, older_than = rank_ages(total_days)
+        for result, rank, percent in zip(results, ranks.tolist(), older_than.tolist()):
+            result['rank'] = rank
+            result['older_than_percent'] = percent
+        
+        oldest = results[order[0]]
+        youngest = results[order[-1]]
+        response = {
+            'success': True,
+            'reference_time': now.isoformat(),
+            'comparison': results,
+            'ranking': [results[position]['index'] for position in order.tolist()],
+            'oldest': {'index': oldest['index'], 'name': oldest['name']},
+            'youngest': {'index': youngest['index'], 'name': youngest['name']},
+            'percentiles': age_percentiles([result['age_data']['exact_years'] for result in results]),
+            'errors': sorted(errors, key=lambda error: error['index'])
+        }
         
-        return jsonify({'success': True, 'comparison': results})
+        if include_matrix:
+            response['age_gap_matrix'] = age_gap_matrix(total_days)
+        
+        return jsonify(response)
         
     except Exception as e:
-        print(f"Error in compare_ages: {str(e)}")
+        logger.exception("Error in compare_ages")
         return jsonify({'error': 'Failed to compare ages'}), 400
 
 @app.route('/milestones', methods=['POST'])
@@ -610,84 +994,390 @@ def calculate_milestones():
             return jsonify({'error': 'Content-Type must be application/json'}), 400
         
         data = request.get_json()
-        birth_date_str = sanitize_input(data.get('birth_date', ''), max_length=20)
-        
-        if not birth_date_str:
-            return jsonify({'error': 'Birth date is required'}), 400
+        values, error = MILESTONES_REQUEST(data)
+        if error:
+            return jsonify({'error': error}), 400
         
-        # Validate date
-        is_valid, birth_date_or_error = validate_date_string(birth_date_str)
-        if not is_valid:
-            return jsonify({'error': birth_date_or_error}), 400
-        
-        birth_date = birth_date_or_error
+        birth_date = values['birth_date']
         today = datetime.now()
         
         # Validate birth date is not in future
         if birth_date > today:
             return jsonify({'error': 'Birth date cannot be in the future'}), 400
         
-        milestones = [
-            {'name': 'First Birthday', 'date': birth_date.replace(year=birth_date.year + 1)},
-            {'name': '5 Years Old', 'date': birth_date.replace(year=birth_date.year + 5)},
-            {'name': '10 Years Old', 'date': birth_date.replace(year=birth_date.year + 10)},
-            {'name': '13 Years Old (Teenager)', 'date': birth_date.replace(year=birth_date.year + 13)},
-            {'name': '16 Years Old', 'date': birth_date.replace(year=birth_date.year + 16)},
-            {'name': '18 Years Old (Adult)', 'date': birth_date.replace(year=birth_date.year + 18)},
-            {'name': '21 Years Old', 'date': birth_date.replace(year=birth_date.year + 21)},
-            {'name': '25 Years Old (Quarter Life)', 'date': birth_date.replace(year=birth_date.year + 25)},
-            {'name': '30 Years Old', 'date': birth_date.replace(year=birth_date.year + 30)},
-            {'name': '40 Years Old', 'date': birth_date.replace(year=birth_date.year + 40)},
-            {'name': '50 Years Old', 'date': birth_date.replace(year=birth_date.year + 50)},
-            {'name': '65 Years Old (Retirement)', 'date': birth_date.replace(year=birth_date.year + 65)},
-            {'name': '100 Years Old (Centenarian)', 'date': birth_date.replace(year=birth_date.year + 100)},
-            {'name': '110 Years Old (Supercentenarian)', 'date': birth_date.replace(year=birth_date.year + 110)},
-            {'name': '116 Years Old (Oldest Man)', 'date': birth_date.replace(year=birth_date.year + 116)},
-            {'name': '118 Years Old (As of 2025)', 'date': birth_date.replace(year=birth_date.year + 118)},
-            {'name': '120 Years Old (Near record)', 'date': birth_date.replace(year=birth_date.year + 120)},
-            {'name': '122 Years Old (World Record)', 'date': birth_date.replace(year=birth_date.year + 122)},
-            {'name': '150 Years Old (Theoretical Max)', 'date': birth_date.replace(year=birth_date.year + 150)},
-        ]
-        
-        valid_milestones = []
-        for milestone in milestones:
-            milestone_date = milestone['date']
-            
-            # Validate milestone date
-            if milestone_date.year > 2200:  # Reasonable upper limit
-                continue
-            
-            if milestone_date < today:
-                milestone['status'] = 'passed'
-                milestone['days_ago'] = (today - milestone_date).days
-            else:
-                milestone['status'] = 'upcoming'
-                milestone['days_until'] = (milestone_date - today).days
-            
-            milestone['date_formatted'] = milestone_date.strftime('%B %d, %Y')
-            valid_milestones.append(milestone)
+        schedule = DEFAULT_SCHEDULE
+        if data.get('schedule') is not None:
+            schedule, error = parse_schedule(data.get('schedule'))
+            if error:
+                return jsonify({'error': error}), 400
+            schedule = tuple((sanitize_input(name, max_length=100), unit, amount) for name, unit, amount in schedule)
+        
+        valid_milestones = milestones_for([birth_date], schedule, now=today)[0]
+        for milestone in valid_milestones:
+            milestone['date_formatted'] = milestone['date'].strftime('%B %d, %Y')
         
         return jsonify({'success': True, 'milestones': valid_milestones})
         
     except Exception as e:
-        print(f"Error in calculate_milestones: {str(e)}")
+        logger.exception("Error in calculate_milestones")
+        return jsonify({'error': 'Failed to calculate milestones'}), 400
+
+MAX_MILESTONE_BATCH_SIZE = 100000
+
+@app.route('/milestones/batch', methods=['POST'])
+@limiter.limit("5 per minute")
+def calculate_milestones_batch():
+    """Calculate milestones for many people in one vectorized pass"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
+        birth_dates = data.get('birth_dates')
+        if not isinstance(birth_dates, list) or not birth_dates:
+            return jsonify({'error': 'birth_dates must be a non-empty list'}), 400
+        if len(birth_dates) > MAX_MILESTONE_BATCH_SIZE:
+            return jsonify({'error': f'Too many rows (maximum {MAX_MILESTONE_BATCH_SIZE})'}), 400
+        
+        schedule = DEFAULT_SCHEDULE
+        if data.get('schedule') is not None:
+            schedule, error = parse_schedule(data.get('schedule'))
+            if error:
+                return jsonify({'error': error}), 400
+            schedule = tuple((sanitize_input(name, max_length=100), unit, amount) for name, unit, amount in schedule)
+        
+        within_days = data.get('within_days')
+        if within_days is not None and (isinstance(within_days, bool) or not isinstance(within_days, int) or within_days < 0):
+            return jsonify({'error': 'within_days must be a non-negative integer'}), 400
+        
+        today = datetime.now()
+        results = [None] * len(birth_dates)
+        valid_rows, valid_births = [], []
+        for index, raw_birth in enumerate(birth_dates):
+            birth_date, error = BIRTH_DATE(raw_birth)
+            if error:
+                results[index] = {'index': index, 'error': error}
+                continue
+            if birth_date > today:
+                results[index] = {'index': index, 'error': 'Birth date cannot be in the future'}
+                continue
+            valid_rows.append(index)
+            valid_births.append(birth_date)
+        
+        if valid_rows:
+            per_person = milestones_for(valid_births, schedule, now=today, within_days=within_days)
+            for index, milestones in zip(valid_rows, per_person):
+                for milestone in milestones:
+                    milestone['date'] = milestone['date'].isoformat()
+                results[index] = {'index': index, 'milestones': milestones}
+        
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+        
+    except Exception as e:
+        logger.exception("Error in calculate_milestones_batch")
         return jsonify({'error': 'Failed to calculate milestones'}), 400
 
+@app.route('/planets/batch', methods=['POST'])
+@limiter.limit("5 per minute")
+def planets_batch():
+    """Planetary ages and next planetary birthdays on all nine bodies for many people, as matrices"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
+        birth_dates = data.get('birth_dates')
+        if not isinstance(birth_dates, list) or not birth_dates:
+            return jsonify({'error': 'birth_dates must be a non-empty list'}), 400
+        if len(birth_dates) > MAX_BATCH_SIZE:
+            return jsonify({'error': f'Too many rows (maximum {MAX_BATCH_SIZE})'}), 400
+        
+        # One reference instant for the whole batch
+        now = datetime.now()
+        target_date, error = parse_target_date(data.get('target_date'))
+        if error:
+            return jsonify({'error': error}), 400
+        reference = target_date or now
+        
+        results = [None] * len(birth_dates)
+        valid_rows, valid_births = [], []
+        for index, raw_birth in enumerate(birth_dates):
+            birth_date, error = BIRTH_DATE(raw_birth)
+            if error:
+                results[index] = {'index': index, 'error': error}
+                continue
+            if birth_date > reference:
+                results[index] = {'index': index, 'error': 'Birth date cannot be after target date'}
+                continue
+            valid_rows.append(index)
+            valid_births.append(birth_date)
+        
+        if valid_rows:
+            ages, next_ages, next_dates = planet_matrix(valid_births, reference)
+            next_days, days_until = next_birthday_days(next_dates, reference)
+            ages, next_ages = ages.tolist(), next_ages.tolist()
+            for row, index in enumerate(valid_rows):
+                results[index] = {
+                    'index': index,
+                    'ages': ages[row],
+                    'next_birthday_ages': next_ages[row],
+                    'next_birthdays': next_days[row],
+                    'days_until': days_until[row]
+                }
+        
+        return jsonify({
+            'success': True,
+            'reference_time': reference.isoformat(),
+            'planets': list(PLANETS),
+            'orbital_periods_days': list(ORBITAL_PERIODS.values()),
+            'count': len(results),
+            'results': results
+        })
+        
+    except Exception as e:
+        logger.exception("Error in planets_batch")
+        return jsonify({'error': 'Failed to calculate planetary ages'}), 400
+
+MAX_ROSTER_SIZE = 500000
+
+@app.route('/birthdays/upcoming', methods=['POST'])
+@limiter.limit("5 per minute")
+def upcoming_birthdays():
+    """Who in a roster has a birthday within the next N days, soonest first"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
+        roster = data.get('roster')
+        if not isinstance(roster, list) or not roster:
+            return jsonify({'error': 'roster must be a non-empty list'}), 400
+        if len(roster) > MAX_ROSTER_SIZE:
+            return jsonify({'error': f'Too many people (maximum {MAX_ROSTER_SIZE})'}), 400
+        
+        within_days = data.get('within_days', 30)
+        if isinstance(within_days, bool) or not isinstance(within_days, int) or not 0 <= within_days <= MAX_WITHIN_DAYS:
+            return jsonify({'error': f'within_days must be an integer between 0 and {MAX_WITHIN_DAYS}'}), 400
+        
+        target_date, error = parse_target_date(data.get('target_date'))
+        if error:
+            return jsonify({'error': error}), 400
+        today = (target_date or datetime.now()).date()
+        
+        entries, errors = [], []
+        for index, person in enumerate(roster):
+            if not isinstance(person, dict):
+                errors.append({'index': index, 'error': 'Each roster entry must be an object'})
+                continue
+            person_id = person.get('id', index)
+            if isinstance(person_id, str):
+                person_id = sanitize_input(person_id, max_length=100)
+            elif isinstance(person_id, bool) or not isinstance(person_id, int):
+                errors.append({'index': index, 'error': 'id must be a string or an integer'})
+                continue
+            birth_date, error = BIRTH_DATE(person.get('birth_date', ''))
+            if error:
+                errors.append({'index': index, 'error': error})
+                continue
+            if birth_date.date() > today:
+                errors.append({'index': index, 'error': 'Birth date cannot be after target date'})
+                continue
+            entries.append((person_id, birth_date.date()))
+        
+        birthdays = [{
+            'id': person_id,
+            'birth_date': birth.isoformat(),
+            'date': birthday.isoformat(),
+            'days_until': days_until,
+            'age': age
+        } for person_id, birth, birthday, days_until, age in BirthdayIndex(entries).upcoming(today, within_days)]
+        
+        return jsonify({
+            'success': True,
+            'today': today.isoformat(),
+            'within_days': within_days,
+            'count': len(birthdays),
+            'birthdays': birthdays,
+            'errors': errors
+        })
+        
+    except Exception as e:
+        logger.exception("Error in upcoming_birthdays")
+        return jsonify({'error': 'Failed to find upcoming birthdays'}), 400
+
+LIFE_CALENDAR_ENCODINGS = ('bitset', 'runs')
+MAX_LIFE_CALENDAR_BATCH_SIZE = 1000
+
+def parse_life_calendar_options(data):
+    """life_expectancy (whole years, default 80) and encoding; returns ``(expectancy, encoding, error)``"""
+    life_expectancy = data.get('life_expectancy', DEFAULT_LIFE_EXPECTANCY)
+    if isinstance(life_expectancy, bool) or not isinstance(life_expectancy, int) or \
+            not 1 <= life_expectancy <= MAX_LIFE_EXPECTANCY:
+        return None, None, f'life_expectancy must be a whole number from 1 to {MAX_LIFE_EXPECTANCY}'
+    encoding = data.get('encoding', 'bitset')
+    if encoding not in LIFE_CALENDAR_ENCODINGS:
+        return None, None, f"encoding must be one of: {', '.join(LIFE_CALENDAR_ENCODINGS)}"
+    return life_expectancy, encoding, None
+
+@app.route('/life-calendar', methods=['POST'])
+@limiter.limit("15 per minute")
+def life_calendar():
+    """Full week grid (lived / remaining / milestone weeks) as a packed bitset or per-year runs"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
+        values, error = LIFE_CALENDAR_REQUEST(data)
+        if error:
+            return jsonify({'error': error}), 400
+        life_expectancy, encoding, error = parse_life_calendar_options(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        now = datetime.now()
+        birth_date = values['birth_date']
+        target_date = values['target_date'] or now
+        if birth_date > now:
+            return jsonify({'error': 'Birth date cannot be in the future'}), 400
+        
+        grid = life_calendar_cache.get(birth_date, life_expectancy)
+        return jsonify({'success': True, **encode_calendar(grid, target_date, encoding)})
+        
+    except Exception as e:
+        logger.exception("Error in life_calendar")
+        return jsonify({'error': 'Failed to build life calendar'}), 400
+
+@app.route('/life-calendar/batch', methods=['POST'])
+@limiter.limit("5 per minute")
+def life_calendar_batch():
+    """Life calendars for many people; missing grids are built in one vectorized pass"""
+    try:
+        if not request.is_json:
+            return jsonify({'error': 'Content-Type must be application/json'}), 400
+        
+        data = request.get_json()
+        if not data or not isinstance(data, dict):
+            return jsonify({'error': 'Invalid JSON data'}), 400
+        
+        birth_dates = data.get('birth_dates')
+        if not isinstance(birth_dates, list) or not birth_dates:
+            return jsonify({'error': 'birth_dates must be a non-empty list'}), 400
+        if len(birth_dates) > MAX_LIFE_CALENDAR_BATCH_SIZE:
+            return jsonify({'error': f'Too many rows (maximum {MAX_LIFE_CALENDAR_BATCH_SIZE})'}), 400
+        life_expectancy, encoding, error = parse_life_calendar_options(data)
+        if error:
+            return jsonify({'error': error}), 400
+        
+        now = datetime.now()
+        target_date, error = parse_target_date(data.get('target_date'))
+        if error:
+            return jsonify({'error': error}), 400
+        target_date = target_date or now
+        
+        results = [None] * len(birth_dates)
+        valid_rows, valid_births = [], []
+        for index, raw_birth in enumerate(birth_dates):
+            birth_date, error = BIRTH_DATE(raw_birth)
+            if error:
+                results[index] = {'index': index, 'error': error}
+                continue
+            if birth_date > now:
+                results[index] = {'index': index, 'error': 'Birth date cannot be in the future'}
+                continue
+            valid_rows.append(index)
+            valid_births.append(birth_date)
+        
+        if valid_rows:
+            grids = life_calendar_cache.get_many(valid_births, life_expectancy)
+            for index, grid in zip(valid_rows, grids):
+                results[index] = {'index': index, **encode_calendar(grid, target_date, encoding)}
+        
+        return jsonify({'success': True, 'count': len(results), 'results': results})
+        
+    except Exception as e:
+        logger.exception("Error in life_calendar_batch")
+        return jsonify({'error': 'Failed to build life calendars'}), 400
+
 # ============================
 # STATIC FILE SERVING (No rate limiting needed)
 # ============================
-@app.route('/static/<path:path>')
-def serve_static(path):
+@app.context_processor
+def inject_asset_urls():
+    """Expose fingerprinted bundle URLs to templates"""
+    return {
+        'assets_built': asset_manifest.built,
+        'asset_url': lambda name: url_for('static', filename=asset_manifest.url(name))
+    }
+
+# Size/mtime/ETag of served files, kept in memory so revalidation never touches disk
+static_index = StaticFileIndex(os.path.join(app.root_path, 'static'))
+root_file_index = StaticFileIndex(app.root_path, files=['robots.txt', 'sitemap.xml'])
+
+def send_indexed_file(file_index, name, mimetype=None):
+    """Send an indexed file with ETag/Last-Modified validation and byte ranges"""
+    entry = file_index.get(name)
+    if entry is None:
+        abort(404)
+    
+    if not is_resource_modified(request.environ, etag=entry.etag, last_modified=entry.mtime):
+        response = Response(status=304)
+    else:
+        try:
+            f = open(entry.path, 'rb')
+        except OSError:
+            # Deleted (or made unreadable) since the last scan
+            file_index.discard(name)
+            abort(404)
+        # The scan can be up to a TTL old; trust the open handle over the index
+        entry = file_index.verify(name, os.fstat(f.fileno()))
+        response = Response(wrap_file(request.environ, f), mimetype=mimetype or entry.mimetype,
+                            direct_passthrough=True)
+        response.content_length = entry.size
+    
+    response.set_etag(entry.etag)
+    response.last_modified = entry.mtime
+    response.headers['Cache-Control'] = 'no-cache'
+    if response.status_code == 304:
+        return response
+    # Handles Range/If-Range (206/416) and any remaining preconditions
+    return response.make_conditional(request, accept_ranges=True, complete_length=entry.size)
+
+@app.route('/static/<path:filename>', endpoint='static')
+def serve_static(filename):
     """Serve static files with security headers"""
-    response = send_from_directory('static', path)
+    path = filename
+    
+    # Fingerprinted bundles have a prebuilt .gz next to them
+    if path in asset_manifest.precompressed and request.accept_encodings.quality('gzip') > 0:
+        response = send_indexed_file(static_index, path + '.gz', mimetype=mimetypes.guess_type(path)[0])
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = send_indexed_file(static_index, path)
     
     # Add security headers
     response.headers['X-Content-Type-Options'] = 'nosniff'
     response.headers['X-Frame-Options'] = 'SAMEORIGIN'
     response.headers['X-XSS-Protection'] = '1; mode=block'
     
-    # Cache static files (1 hour)
-    if path.endswith(('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.ico')):
+    if asset_manifest.is_fingerprinted(path):
+        # Content-hashed names never change, cache for a year
+        response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        response.vary.add('Accept-Encoding')
+    elif path.endswith(('.css', '.js', '.png', '.jpg', '.jpeg', '.gif', '.ico')):
+        # Cache static files (1 hour)
         response.headers['Cache-Control'] = 'public, max-age=3600'
     
     return response
@@ -695,12 +1385,12 @@ def serve_static(path):
 @app.route('/robots.txt')
 def robots():
     """Serve robots.txt"""
-    return send_from_directory('.', 'robots.txt')
+    return send_indexed_file(root_file_index, 'robots.txt')
 
 @app.route('/sitemap.xml')
 def sitemap():
     """Serve sitemap.xml"""
-    return send_from_directory('.', 'sitemap.xml')
+    return send_indexed_file(root_file_index, 'sitemap.xml')
 
 # ============================
 # ERROR HANDLERS
@@ -726,24 +1416,60 @@ def ratelimit_handler(e):
 @app.errorhandler(500)
 def internal_error(error):
     """Handle 500 errors"""
-    print(f"Internal server error: {str(error)}")
+    logger.error("Internal server error: %s", error)
     return jsonify({'error': 'Internal server error'}), 500
 
 
+# Client error reports: bounded queue -> background writer -> rotating JSON-lines file
+MAX_ERROR_REPORT_BYTES = 16 * 1024
+error_ingestor = ErrorIngestor(
+    os.getenv('CLIENT_ERROR_LOG', os.path.join(app.root_path, 'logs', 'client-errors.log')),
+    max_queue=int(os.getenv('CLIENT_ERROR_QUEUE_SIZE', 1000))
+)
+
 @app.route('/api/errors', methods=['POST'])
 def log_error():
+    """Queue a client error report; deduped and written in batches off the request path"""
+    # Bound the bytes actually read: chunked uploads carry no Content-Length
+    too_large = request.content_length is not None and request.content_length > MAX_ERROR_REPORT_BYTES
+    if not too_large:
+        body = request.stream.read(MAX_ERROR_REPORT_BYTES + 1)
+        too_large = len(body) > MAX_ERROR_REPORT_BYTES
+    if too_large:
+        metrics.inc('agemaster_client_errors_total', format_labels(outcome='too_large'))
+        return jsonify({'success': False, 'error': 'Report too large'}), 413
     try:
-        error_data = request.json
-        # Log to file or monitoring service
-        print(f"CLIENT ERROR: {error_data}")
-        return jsonify({'success': True})
-    except:
-        return jsonify({'success': False}), 500
+        data = json.loads(body) if request.is_json else None
+    except ValueError:
+        data = None
+    report = clean_report(data)
+    if report is None:
+        return jsonify({'success': False, 'error': 'Invalid error report'}), 400
+    
+    outcome = error_ingestor.submit(report)
+    metrics.inc('agemaster_client_errors_total', format_labels(outcome=outcome))
+    return jsonify({'success': True})
 
 # ============================
 # APPLICATION START
 # ==========================
 
+def warm_up():
+    """Load data and pre-render before serving; run once per worker process.
+    
+    Importing app stays cheap (no data loading, no AI SDK import); the gunicorn
+    post_worker_init hook in gunicorn.conf.py and ``python app.py`` call this.
+    """
+    local_store.refresh(force=True)
+    time_perception.refresh(force=True)
+    ai_service.warm_up()
+    static_index.scan()
+    root_file_index.scan()
+    try:
+        index_page.refresh()
+    except Exception as e:
+        logger.warning("Index pre-render failed, will retry on first request: %s", e)
+
 if __name__ == "__main__":
     # Apply production-only security settings
     if os.getenv("FLASK_ENV") == "production":
@@ -755,6 +1481,8 @@ if __name__ == "__main__":
             MAX_CONTENT_LENGTH=16 * 1024 * 1024,  # 16MB
         )
 
+    configure_logging()
+    warm_up()
     app.run(
         debug=os.getenv("FLASK_DEBUG", "false").lower() == "true",
         host="0.0.0.0",
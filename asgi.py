@@ -0,0 +1,277 @@
+"""ASGI entry point: ``uvicorn asgi:app --workers 2``.
+
+The AI-backed quote routes are native async handlers. /api/quotes/ai can hold
+many slow provider calls at once (up to AI_MAX_CONCURRENT per worker, within
+the host-wide AI_CALLS_PER_MINUTE budget, each bounded by AI_TIMEOUT_SECONDS
+and cancelled if the client disconnects); /api/quotes/random only serves
+pooled or local quotes. Every other route is the regular Flask app, run in
+threads through asgiref's WsgiToAsgi. ``gunicorn app:app`` keeps working
+unchanged.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import time
+
+from asgiref.sync import ThreadSensitiveContext
+from asgiref.wsgi import WsgiToAsgi
+from limits import parse
+
+import app as agemaster
+from utils.metrics import metrics
+from utils.structured_logging import configure_logging, new_request_id
+
+MAX_BODY_BYTES = 64 * 1024
+# Concurrent Flask requests per worker (each runs in its own thread)
+WSGI_THREADS = int(os.getenv('WSGI_THREADS', 32))
+
+
+class ClientDisconnected(Exception):
+    pass
+
+
+class AsyncRequest:
+    """The parts of an ASGI HTTP request the async handlers need"""
+
+    def __init__(self, scope, body=b''):
+        self.scope = scope
+        self.method = scope['method']
+        self.path = scope['path']
+        self.headers = {name.decode('latin-1').lower(): value.decode('latin-1')
+                        for name, value in scope.get('headers', ())}
+        self.remote_addr = (scope.get('client') or ('127.0.0.1', 0))[0]
+        self.body = body
+
+    @property
+    def is_json(self):
+        mimetype = self.headers.get('content-type', '').split(';', 1)[0].strip().lower()
+        return mimetype == 'application/json' or (mimetype.startswith('application/') and mimetype.endswith('+json'))
+
+    def get_json(self):
+        """Parsed JSON body; raises ValueError when it isn't valid JSON"""
+        return json.loads(self.body)
+
+
+async def read_body(receive, max_bytes=MAX_BODY_BYTES):
+    """Whole request body, or None if it exceeds ``max_bytes``"""
+    chunks, size = [], 0
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise ClientDisconnected()
+        chunk = message.get('body', b'')
+        size += len(chunk)
+        if size > max_bytes:
+            return None
+        chunks.append(chunk)
+        if not message.get('more_body'):
+            return b''.join(chunks)
+
+
+async def cancel_on_disconnect(receive, task):
+    """Cancel ``task`` (and the AI call it awaits) when the client goes away"""
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            task.cancel()
+            return
+
+
+# ============================
+# RATE LIMITING
+# ============================
+def check_rate_limit(limit, endpoint, remote_addr):
+    """Hit ``limit`` with Flask-Limiter's own strategy and key.
+
+    Counters are shared with the Flask routes (same storage, same key), so a
+    route has one budget whichever server handles it. Returns
+    ``(allowed, headers)``.
+    """
+    limiter = agemaster.limiter
+    if not limiter.enabled:
+        return True, []
+    strategy = limiter.limiter
+    allowed = strategy.hit(limit, remote_addr, endpoint)
+    stats = strategy.get_window_stats(limit, remote_addr, endpoint)
+    headers = [
+        (b'x-ratelimit-limit', str(limit.amount).encode()),
+        (b'x-ratelimit-remaining', str(stats.remaining).encode()),
+        (b'x-ratelimit-reset', str(int(stats.reset_time)).encode()),
+    ]
+    if not allowed:
+        headers.append((b'retry-after', str(max(0, int(stats.reset_time - time.time()))).encode()))
+    return allowed, headers
+
+
+# ============================
+# ASYNC ROUTES
+# ============================
+async def random_quote(request):
+    """Async /api/quotes/random: pooled AI quote, then local fallback (never a live call)"""
+    ai_service = agemaster.ai_service
+    try:
+        if ai_service.ai_available:
+            try:
+                # Same as the Flask route; the breaker check is SQLite, so off the loop
+                ai_quote = await asyncio.to_thread(ai_service.generate_quote)
+                if ai_quote and isinstance(ai_quote, dict):
+                    return 200, agemaster.sanitize_quote(ai_quote)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                agemaster.logger.warning("AI quote failed, using fallback: %s", e, extra={'event': 'quote_fallback'})
+
+        return 200, agemaster.local_store.random_quote() or dict(agemaster.FALLBACK_QUOTE, source='fallback')
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        agemaster.logger.exception("Error in random_quote")
+        return 200, dict(agemaster.FALLBACK_QUOTE, category='fallback', source='error')
+
+
+async def generate_ai_quote(request):
+    """Async /api/quotes/ai: awaits a live AI call when the pool is empty"""
+    try:
+        if not request.is_json:
+            return 400, {'error': 'Content-Type must be application/json'}
+
+        data = request.get_json() or {}
+        age_data = agemaster.sanitize_age_data(data.get('age_data'))
+
+        ai_service = agemaster.ai_service
+        if ai_service.ai_available:
+            quote = await ai_service.agenerate_quote(age_data)
+            if quote and isinstance(quote, dict):
+                return 200, {'success': True, 'quote': quote, 'source': quote.get('source', 'ai')}
+
+        quote = agemaster.local_store.random_quote() or agemaster.FALLBACK_QUOTE
+        return 200, {'success': True, 'quote': quote, 'source': 'fallback'}
+    except asyncio.CancelledError:
+        raise
+    except Exception:
+        agemaster.logger.exception("Error in generate_ai_quote")
+        return 400, {'success': False, 'error': 'Failed to generate quote'}
+
+
+# (method, path) -> (handler, endpoint name, rate limit, reads a body)
+ASYNC_ROUTES = {
+    ('GET', '/api/quotes/random'): (random_quote, 'random_quote', parse(agemaster.RANDOM_QUOTE_LIMIT), False),
+    ('POST', '/api/quotes/ai'): (generate_ai_quote, 'generate_ai_quote', parse(agemaster.AI_QUOTE_LIMIT), True),
+}
+
+
+# ============================
+# ASGI APPLICATION
+# ============================
+def json_body(payload):
+    # Same serialization as Flask's jsonify (sorted keys, compact)
+    return (agemaster.app.json.dumps(payload, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+def record_request(endpoint, method, path, status, started, request_id):
+    """Metrics and access log, as the Flask after_request hook does"""
+    duration = time.perf_counter() - started
+    metrics.observe('agemaster_http_request_duration_seconds', duration, agemaster.endpoint_labels(endpoint))
+    metrics.inc('agemaster_http_requests_total', agemaster.endpoint_labels(endpoint, method, status))
+    if status == 429:
+        metrics.inc('agemaster_rate_limited_total', agemaster.endpoint_labels(endpoint))
+    agemaster.access_logger.info('%s %s %s', method, path, status, extra={
+        'event': 'request',
+        'endpoint': endpoint,
+        'status': status,
+        'duration_ms': round(duration * 1000, 3),
+        'request_id': request_id
+    })
+
+
+async def handle_async_route(route, scope, receive, send):
+    handler, endpoint, limit, reads_body = route
+    started = time.perf_counter()
+    request = AsyncRequest(scope)
+    request_id = new_request_id(request.headers.get('x-request-id'))
+
+    try:
+        if reads_body:
+            request.body = await read_body(receive)
+    except ClientDisconnected:
+        record_request(endpoint, request.method, request.path, 499, started, request_id)
+        return
+
+    # The limiter storage may be SQLite or a network store: keep it off the loop
+    allowed, headers = await asyncio.to_thread(check_rate_limit, limit, endpoint, request.remote_addr)
+    if not allowed:
+        status, payload = 429, {'error': 'Rate limit exceeded', 'message': 'Too many requests. Please try again later.'}
+    elif request.body is None:
+        status, payload = 413, {'error': 'Request body too large'}
+    else:
+        task = asyncio.ensure_future(handler(request))
+        watcher = asyncio.ensure_future(cancel_on_disconnect(receive, task))
+        try:
+            status, payload = await task
+        except asyncio.CancelledError:
+            if not watcher.done():
+                raise  # the server is cancelling us, not a disconnect
+            record_request(endpoint, request.method, request.path, 499, started, request_id)
+            return
+        finally:
+            task.cancel()
+            watcher.cancel()
+
+    body = json_body(payload)
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [
+            (b'content-type', b'application/json'),
+            (b'content-length', str(len(body)).encode()),
+            (b'x-request-id', request_id.encode()),
+            *headers,
+        ],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+    record_request(endpoint, request.method, request.path, status, started, request_id)
+
+
+async def lifespan(receive, send):
+    """Warm the worker (data files, pre-rendered pages) before it takes requests"""
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            await asyncio.to_thread(agemaster.warm_up)
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+# This module is a server entry point, so it owns the root logging setup
+configure_logging()
+flask_app = WsgiToAsgi(agemaster.app)
+_wsgi_slots = None
+
+
+async def call_flask(scope, receive, send):
+    # Each Flask request gets its own thread (asgiref would otherwise run
+    # them all on one)
+    async with ThreadSensitiveContext():
+        await flask_app(scope, receive, send)
+
+
+async def app(scope, receive, send):
+    global _wsgi_slots
+    if scope['type'] == 'lifespan':
+        return await lifespan(receive, send)
+
+    if scope['type'] == 'http':
+        route = ASYNC_ROUTES.get((scope['method'], scope['path']))
+        if route is not None:
+            return await handle_async_route(route, scope, receive, send)
+
+    if _wsgi_slots is None:
+        _wsgi_slots = asyncio.Semaphore(WSGI_THREADS)
+    async with _wsgi_slots:
+        # Start from an empty context: asgiref's executor can leak into the
+        # connection's context, breaking the next request on a keep-alive
+        # connection ("CurrentThreadExecutor already quit")
+        await contextvars.Context().run(asyncio.ensure_future, call_flask(scope, receive, send))
@@ -0,0 +1,72 @@
+"""Upcoming-birthday queries over a large roster: day-of-year index versus a full scan.
+
+Run from the repository root:
+    python -m benchmarks.bench_birthdays
+"""
+import random
+import time
+import timeit
+from datetime import date, timedelta
+
+from utils.birthdays import BirthdayIndex, next_birthday
+
+ROSTER_SIZE = 300_000
+
+
+def make_roster(size, seed=11):
+    rng = random.Random(seed)
+    first = date(1920, 1, 1).toordinal()
+    roster = [(person, date.fromordinal(first + rng.randint(0, 36500))) for person in range(size)]
+    # Plenty of leap-day birthdays, to exercise the Feb 28 rule
+    roster += [(size + person, date(1920 + 4 * (person % 25), 2, 29)) for person in range(1000)]
+    return roster
+
+
+def scan_upcoming(roster, today, within_days):
+    """The per-person approach: next birthday for everyone, then filter and sort"""
+    upcoming = []
+    for person, birth in roster:
+        birthday = next_birthday(birth, today)
+        days_until = (birthday - today).days
+        if days_until <= within_days:
+            upcoming.append((days_until, person))
+    upcoming.sort()
+    return upcoming
+
+
+def check_equivalence(roster, index):
+    """The index must return exactly what the scan does, across year ends and leap days"""
+    sample = roster[:20000]
+    small = BirthdayIndex(sample)
+    days = [date(2027, 2, 27), date(2027, 2, 28), date(2028, 2, 28), date(2028, 2, 29),
+            date(2027, 3, 1), date(2026, 12, 31), date(2027, 12, 31), date(2027, 1, 1)]
+    rng = random.Random(5)
+    days += [date(2024, 1, 1) + timedelta(days=rng.randint(0, 2000)) for _ in range(20)]
+    for today in days:
+        for within_days in (0, 1, 7, 30, 364, 365, 366):
+            expected = scan_upcoming(sample, today, within_days)
+            got = sorted((result.days_until, result.id) for result in small.upcoming(today, within_days))
+            assert got == expected, (today, within_days)
+    assert len(index) == len(roster)
+
+
+def main():
+    roster = make_roster(ROSTER_SIZE)
+    started = time.perf_counter()
+    index = BirthdayIndex(roster)
+    build_ms = (time.perf_counter() - started) * 1000
+    check_equivalence(roster, index)
+    print('index matches the full scan around year ends and leap days')
+    print(f'built index over {len(index)} people in {build_ms:.0f} ms')
+
+    today = date(2026, 12, 20)
+    print(f"{'query':<22} {'matches':>8} {'scan ms':>9} {'index ms':>9} {'speedup':>8}")
+    for within_days in (0, 7, 30):
+        matches = index.count_upcoming(today, within_days)
+        scan = min(timeit.repeat(lambda: scan_upcoming(roster, today, within_days), number=1, repeat=3)) * 1000
+        indexed = min(timeit.repeat(lambda: index.upcoming(today, within_days), number=5, repeat=5)) / 5 * 1000
+        print(f'{f"next {within_days} days":<22} {matches:8d} {scan:9.2f} {indexed:9.3f} {scan / indexed:7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
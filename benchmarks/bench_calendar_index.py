@@ -0,0 +1,62 @@
+"""Per-call cost of the calendar index versus relativedelta.
+
+Run from the repository root:
+    python -m benchmarks.bench_calendar_index
+"""
+import random
+import timeit
+from datetime import datetime, timedelta
+from dateutil.relativedelta import relativedelta
+from utils.calendar_index import age_components
+
+
+def relativedelta_components(birth_date, target_date):
+    delta = relativedelta(target_date, birth_date)
+    return delta.years, delta.months, delta.days, delta.hours, delta.minutes, delta.seconds
+
+
+def relativedelta_age(birth_date, target_date):
+    """The pre-index calculate_age body: relativedelta plus three subtractions"""
+    delta = relativedelta(target_date, birth_date)
+    total_days = (target_date - birth_date).days
+    total_seconds = int((target_date - birth_date).total_seconds())
+    return delta, total_days, total_seconds, (target_date - birth_date).days / 365.25
+
+
+def indexed_age(birth_date, target_date):
+    components = age_components(birth_date, target_date)
+    elapsed = target_date - birth_date
+    return components, elapsed.days, int(elapsed.total_seconds()), elapsed.days / 365.25
+
+
+def sample_pairs(count, seed=42):
+    rng = random.Random(seed)
+    now = datetime.now()
+    pairs = []
+    for _ in range(count):
+        birth_date = datetime(1900, 1, 1) + timedelta(days=rng.randint(0, (now - datetime(1900, 1, 1)).days))
+        pairs.append((birth_date, now))
+    return pairs
+
+
+def bench(func, pairs, repeat=5):
+    best = min(timeit.repeat(lambda: [func(b, t) for b, t in pairs], number=1, repeat=repeat))
+    return best / len(pairs) * 1e6
+
+
+def main(count=20000):
+    pairs = sample_pairs(count)
+    rows = [
+        ('components: relativedelta', bench(relativedelta_components, pairs)),
+        ('components: calendar index', bench(age_components, pairs)),
+        ('calculate_age body: relativedelta', bench(relativedelta_age, pairs)),
+        ('calculate_age body: calendar index', bench(indexed_age, pairs)),
+    ]
+    for name, per_call in rows:
+        print(f"{name:<38} {per_call:8.3f} us/call")
+    print(f"components speedup: {rows[0][1] / rows[1][1]:.1f}x")
+    print(f"calculate_age body speedup: {rows[2][1] / rows[3][1]:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
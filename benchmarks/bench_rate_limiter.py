@@ -0,0 +1,74 @@
+"""Rate-limiter overhead per check, single process and across concurrent workers.
+
+Run from the repository root:
+    python -m benchmarks.bench_rate_limiter [workers] [checks_per_worker]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter, SlidingWindowCounterRateLimiter
+
+import utils.sqlite_rate_limit  # noqa: F401  registers sqlite://
+
+
+def per_check_us(uri, strategy_class, checks, item, key_count=64):
+    storage = storage_from_string(uri)
+    limiter = strategy_class(storage)
+    keys = [f"10.0.0.{i}" for i in range(key_count)]
+    start = time.perf_counter()
+    for i in range(checks):
+        limiter.hit(item, keys[i % key_count])
+    return (time.perf_counter() - start) / checks * 1e6
+
+
+def _worker(uri, checks, limit, results):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    item = parse(limit)
+    admitted = 0
+    start = time.perf_counter()
+    for i in range(checks):
+        # Half the checks share one key (contention), half are per-worker keys
+        key = 'shared' if i % 2 == 0 else f"worker-{os.getpid()}"
+        admitted += key == 'shared' and limiter.hit(item, key)
+    results.put(((time.perf_counter() - start) / checks * 1e6, admitted))
+
+
+def concurrent(uri, workers, checks, limit='1000 per minute'):
+    results = multiprocessing.Queue()
+    processes = [multiprocessing.Process(target=_worker, args=(uri, checks, limit, results))
+                 for _ in range(workers)]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    mean_us = sum(us for us, _ in outcomes) / workers
+    admitted = sum(count for _, count in outcomes)
+    return mean_us, admitted
+
+
+def main(workers=4, checks=5000):
+    path = os.path.join(tempfile.mkdtemp(), 'bench-limits.sqlite3')
+    uri = f"sqlite://{path}"
+    item = parse('1000000 per minute')
+
+    print('single process (us/check)')
+    print(f"  memory://  fixed-window            {per_check_us('memory://', FixedWindowRateLimiter, checks, item):8.2f}")
+    print(f"  memory://  sliding-window-counter  {per_check_us('memory://', SlidingWindowCounterRateLimiter, checks, item):8.2f}")
+    print(f"  sqlite://  fixed-window            {per_check_us(uri, FixedWindowRateLimiter, checks, item):8.2f}")
+    print(f"  sqlite://  sliding-window-counter  {per_check_us(uri, SlidingWindowCounterRateLimiter, checks, item):8.2f}")
+
+    storage_from_string(uri).reset()
+    mean_us, admitted = concurrent(uri, workers, checks)
+    print(f"{workers} concurrent workers, sqlite:// sliding-window-counter")
+    print(f"  mean {mean_us:.2f} us/check")
+    print(f"  shared key admitted {admitted} of {workers * checks // 2} hits (limit 1000/minute)")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,92 @@
+"""Cold-start budget: import time of `app` and time to first response.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup [runs] [importtime_log]
+
+Each run is a fresh interpreter. Import time comes from `python -X importtime`
+(the raw log of the last run is written to importtime_log when given);
+time to first response is measured from process spawn until the child has
+imported app, run warm_up() and answered GET / and POST /calculate.
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+FIRST_RESPONSE_SCRIPT = '''
+import app
+app.warm_up()
+client = app.app.test_client()
+assert client.get('/').status_code == 200
+assert client.post('/calculate', json={'birth_date': '1990-05-15'}).status_code == 200
+print('READY', flush=True)
+'''
+
+
+def child_env():
+    env = dict(os.environ)
+    env.setdefault('RATELIMIT_STORAGE_URI', 'memory://')
+    env.setdefault('SHARED_STATE_DB', os.path.join(tempfile.mkdtemp(), 'bench-startup.sqlite3'))
+    return env
+
+
+def parse_importtime(log):
+    """Return {module: (self_us, cumulative_us, depth)} from -X importtime output"""
+    modules = {}
+    for line in log.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        modules[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    return modules
+
+
+def import_time(env):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'],
+                            capture_output=True, text=True, env=env, check=True)
+    return parse_importtime(result.stderr), result.stderr
+
+
+def first_response_ms(env):
+    start = time.perf_counter()
+    child = subprocess.Popen([sys.executable, '-c', FIRST_RESPONSE_SCRIPT],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env)
+    for line in child.stdout:
+        if line.startswith('READY'):
+            elapsed = (time.perf_counter() - start) * 1000
+            break
+    else:
+        raise RuntimeError('child exited before answering')
+    child.wait()
+    return elapsed
+
+
+def main(runs=5, log_path=None):
+    env = child_env()
+    import_ms, ttfr_ms = [], []
+    for _ in range(runs):
+        modules, log = import_time(env)
+        import_ms.append(modules['app'][1] / 1000)
+        ttfr_ms.append(first_response_ms(env))
+
+    print(f'{runs} cold starts (median / min ms)')
+    print(f"  import app               {statistics.median(import_ms):8.1f} {min(import_ms):8.1f}")
+    print(f"  time to first response   {statistics.median(ttfr_ms):8.1f} {min(ttfr_ms):8.1f}")
+
+    # Heaviest direct imports of app in the last run
+    print('heaviest top-level imports (cumulative ms)')
+    top_level = [(name, cumulative) for name, (_, cumulative, depth) in modules.items() if depth == 1]
+    for name, cumulative in sorted(top_level, key=lambda item: -item[1])[:10]:
+        print(f"  {name:<28} {cumulative / 1000:8.1f}")
+    print(f"  AI SDK imported at startup: {'google.generativeai' in modules}")
+
+    if log_path:
+        with open(log_path, 'w', encoding='utf-8') as f:
+            f.write(log)
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5, sys.argv[2] if len(sys.argv) > 2 else None)
@@ -0,0 +1,135 @@
+"""Per-request validation cost: compiled schemas versus the per-field regex chain.
+
+Run from the repository root:
+    python -m benchmarks.bench_validation
+"""
+import itertools
+import random
+import re
+import timeit
+from datetime import datetime
+from dateutil.relativedelta import relativedelta
+
+from utils.validation import DateField, Schema, TextField
+
+
+def legacy_sanitize_input(text, max_length=100):
+    """The pre-schema sanitize_input"""
+    if not text or not isinstance(text, str):
+        return ""
+    text = re.sub(r'<[^>]*>', '', text)
+    text = re.sub(r'[<>\"\';()&|$`]', '', text)
+    if len(text) > max_length:
+        text = text[:max_length]
+    return text.strip()
+
+
+def legacy_validate_date_string(date_str, allow_empty=False):
+    """The pre-schema validate_date_string"""
+    if not date_str:
+        return allow_empty, None
+    if not re.match(r'^\d{4}-\d{2}-\d{2}$', date_str):
+        return False, "Date must be in YYYY-MM-DD format"
+    try:
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+        if date_obj.year < 1900:
+            return False, "Date cannot be before 1900"
+        if date_obj.year > 2100:
+            return False, "Date cannot be after 2100"
+        if date_obj.month < 1 or date_obj.month > 12:
+            return False, "Invalid month"
+        if date_obj.day < 1 or date_obj.day > 31:
+            return False, "Invalid day"
+        last_day_of_month = (date_obj.replace(month=date_obj.month % 12 + 1, day=1) -
+                             relativedelta(days=1)).day
+        if date_obj.day > last_day_of_month:
+            return False, f"Invalid date: {date_str}"
+        return True, date_obj
+    except ValueError as e:
+        return False, f"Invalid date: {str(e)}"
+    except Exception:
+        return False, "Invalid date format"
+
+
+def legacy_date(value, required):
+    text = legacy_sanitize_input(value, max_length=20)
+    if not text:
+        return None, ('Birth date is required' if required else None)
+    is_valid, date_or_error = legacy_validate_date_string(text)
+    return (date_or_error, None) if is_valid else (None, date_or_error)
+
+
+def legacy_calculate(data):
+    birth, error = legacy_date(data.get('birth_date', ''), True)
+    if error:
+        return error
+    target, error = legacy_date(data.get('target_date', ''), False)
+    return error or (birth, target)
+
+
+def legacy_compare(persons):
+    return [(legacy_sanitize_input(person.get('name', 'Person'), max_length=50),
+             legacy_date(person.get('birth_date', ''), True)) for person in persons]
+
+
+CALCULATE = Schema({'birth_date': DateField(required=True), 'target_date': DateField()})
+PERSON = Schema({'name': TextField(max_length=50, default='Person'), 'birth_date': DateField(required=True)})
+
+
+def compiled_calculate(data):
+    values, error = CALCULATE(data)
+    return error or (values['birth_date'], values['target_date'])
+
+
+def compiled_compare(persons):
+    return [PERSON(person) for person in persons]
+
+
+def edge_inputs():
+    """Odd and malformed date strings whose messages must not change"""
+    cases = ['', ' ', None, 19900515, '1990-05-15', ' 1990-05-15 ', '1990-05-15\n', '1990/05/15',
+             '1990-5-15', '0000-01-01', '0001-01-01', '1899-12-31', '2101-01-01', '2024-02-29',
+             '2023-02-29', '1900-02-29', '2000-02-29', '<b>1990-05-15</b>', "1990-05-15'", '١٩٩٠-٠٥-١٥',
+             '1990-05-15T00:00', 'x' * 40, '9999-12-31']
+    for month, day in itertools.product(range(0, 100, 1), (0, 1, 28, 29, 30, 31, 32, 35, 40, 99)):
+        cases.append(f'2023-{month:02d}-{day:02d}')
+    return cases
+
+
+def check_equivalence():
+    """Compiled and legacy validation must agree on every value and message"""
+    field = DateField(required=True)
+    for value in edge_inputs():
+        assert field(value) == legacy_date(value, True), value
+    rng = random.Random(7)
+    for _ in range(20000):
+        value = f'{rng.randint(0, 9999):04d}-{rng.randint(0, 99):02d}-{rng.randint(0, 99):02d}'
+        assert field(value) == legacy_date(value, True), value
+
+
+def per_call_us(function, argument, number):
+    return min(timeit.repeat(lambda: function(argument), number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    check_equivalence()
+    print('compiled validation matches the legacy chain on all edge cases')
+
+    calculate_payload = {'birth_date': '1990-05-15', 'target_date': '2024-02-29'}
+    invalid_payload = {'birth_date': '2023-02-30'}
+    persons = [{'name': f'Person {i}', 'birth_date': f'{1950 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d}'}
+               for i in range(50)]
+
+    print(f"{'request':<28} {'legacy us':>10} {'compiled us':>12} {'speedup':>8}")
+    for label, legacy, compiled, argument, number in (
+        ('/calculate', legacy_calculate, compiled_calculate, calculate_payload, 20000),
+        ('/calculate (invalid day)', legacy_calculate, compiled_calculate, invalid_payload, 20000),
+        ('/compare (50 persons)', legacy_compare, compiled_compare, persons, 500),
+    ):
+        before = per_call_us(legacy, argument, number)
+        after = per_call_us(compiled, argument, number)
+        print(f'{label:<28} {before:10.2f} {after:12.2f} {before / after:7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
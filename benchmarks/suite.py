@@ -0,0 +1,249 @@
+"""Micro and endpoint benchmark suite with stored baselines.
+
+Run from the repository root:
+    python -m benchmarks.suite run [--output benchmarks/baseline.json] [--filter TEXT]
+    python -m benchmarks.suite compare benchmarks/baseline.json [current.json] [--threshold 0.15]
+
+`run` times every case and writes a JSON results file. `compare` checks a
+results file (or a fresh run when none is given) against a baseline and
+exits non-zero when any case is slower than the baseline by more than the
+threshold. Baselines are machine-specific; record one before a change and
+compare after it on the same host.
+
+Endpoints go through the Flask test client with rate limiting off, the
+limiter and shared state in throwaway storage, and the AI provider replaced
+by a local stub model.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+DEFAULT_THRESHOLD = 0.15
+REPEAT = 5
+MIN_TIME = 0.2
+
+
+class StubResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class StubModel:
+    """Stands in for the provider's GenerativeModel; answers instantly"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def generate_content(self, prompt):
+        return StubResponse('Every day you have lived is a page only you could write.')
+
+
+def load_app():
+    """Import app against throwaway storage with the AI provider stubbed out"""
+    state_dir = tempfile.mkdtemp()
+    os.environ.setdefault('RATELIMIT_STORAGE_URI', 'memory://')
+    os.environ.setdefault('SHARED_STATE_DB', os.path.join(state_dir, 'bench-state.sqlite3'))
+    os.environ.setdefault('CLIENT_ERROR_LOG', os.path.join(state_dir, 'client-errors.log'))
+    os.environ.setdefault('LOG_LEVEL', 'WARNING')
+
+    import app
+    from ai_service import AIService
+
+    app.ai_service = AIService(model_factory=StubModel, state_path=os.environ['SHARED_STATE_DB'])
+    app.limiter.enabled = False
+    app.warm_up()
+    return app
+
+
+def micro_cases(app):
+    from utils.date_utils import DateUtils
+
+    birth = datetime(1990, 5, 15, 8, 30)
+    target = datetime(2024, 2, 29, 12, 0)
+    return {
+        'micro.calculate_age': lambda: app.calculate_age(birth, target),
+        'micro.calculate_age_now': lambda: app.calculate_age(birth),
+        'micro.validate_date_string': lambda: app.validate_date_string('1990-05-15'),
+        'micro.sanitize_input': lambda: app.sanitize_input('<b>Hello</b> "world" & (friends)', max_length=100),
+        'micro.get_zodiac_sign': lambda: app.get_zodiac_sign(5, 15),
+        'micro.get_time_perception_factor': lambda: app.get_time_perception_factor(34),
+        'micro.get_planet_age': lambda: app.get_planet_age(birth, 'jupiter'),
+        'micro.DateUtils.calculate_age': lambda: DateUtils.calculate_age(birth, target),
+        'micro.DateUtils.calculate_age_str': lambda: DateUtils.calculate_age('1990-05-15', '2024-02-29'),
+        'micro.DateUtils.get_zodiac_sign': lambda: DateUtils.get_zodiac_sign(5, 15),
+        'micro.DateUtils.get_chinese_zodiac': lambda: DateUtils.get_chinese_zodiac(1990),
+        'micro.DateUtils.get_planet_age': lambda: DateUtils.get_planet_age(birth, 'mars'),
+        'micro.DateUtils.get_next_birthday': lambda: DateUtils.get_next_birthday(birth),
+        'micro.DateUtils.get_weekday_of_birth': lambda: DateUtils.get_weekday_of_birth(birth),
+        'micro.DateUtils.get_life_calendar': lambda: DateUtils.get_life_calendar(birth),
+        'micro.DateUtils.get_time_perception_factor': lambda: DateUtils.get_time_perception_factor(34),
+        'micro.DateUtils.get_historical_events': lambda: DateUtils.get_historical_events(1990),
+    }
+
+
+def endpoint_cases(app):
+    client = app.app.test_client()
+    index_etag = client.get('/').headers['ETag']
+    script_etag = client.get('/static/js/tabs.js').headers['ETag']
+
+    batch = {'birth_dates': [f'{1950 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d}' for i in range(100)],
+             'target_date': '2024-06-01'}
+    people = [{'name': f'Person {i}', 'birth_date': f'{1950 + i % 60}-{1 + i % 12:02d}-{1 + i % 28:02d}'}
+              for i in range(50)]
+    csv_body = 'birth_date\n' + '\n'.join(batch['birth_dates'] * 10) + '\n'
+    milestone_batch = {'birth_dates': batch['birth_dates'] * 10, 'within_days': 365}
+    roster = {'roster': [{'id': i, 'birth_date': birth} for i, birth in enumerate(milestone_batch['birth_dates'])],
+              'within_days': 30}
+
+    return {
+        # (callable returning a response, expected status)
+        'route.index': (lambda: client.get('/'), 200),
+        'route.index_304': (lambda: client.get('/', headers={'If-None-Match': index_etag}), 304),
+        'route.calculate': (lambda: client.post('/calculate', json={'birth_date': '1990-05-15'}), 200),
+        'route.calculate_target': (lambda: client.post('/calculate', json={
+            'birth_date': '1990-05-15', 'target_date': '2024-02-29'}), 200),
+        'route.cache_stats': (lambda: client.get('/api/cache/stats'), 200),
+        'route.calculate_batch_100': (lambda: client.post('/calculate/batch', json=batch), 200),
+        'route.calculate_stream_1000': (lambda: client.post(
+            '/calculate/stream', data=csv_body, content_type='text/csv'), 200),
+        'route.quotes_random': (lambda: client.get('/api/quotes/random'), 200),
+        'route.quotes_ai': (lambda: client.post('/api/quotes/ai', json={'age_data': {'years': 34}}), 200),
+        'route.facts_random': (lambda: client.get('/api/facts/random'), 200),
+        'route.time_perception': (lambda: client.get('/api/time-perception?age=34.5'), 200),
+        'route.time_perception_curve': (lambda: client.get('/api/time-perception?curve=1&step_days=30&max_age=100'), 200),
+        'route.compare_50': (lambda: client.post('/compare', json={'persons': people}), 200),
+        'route.milestones': (lambda: client.post('/milestones', json={'birth_date': '1990-05-15'}), 200),
+        'route.milestones_batch_1000': (lambda: client.post('/milestones/batch', json=milestone_batch), 200),
+        'route.life_calendar': (lambda: client.post('/life-calendar', json={'birth_date': '1990-05-15'}), 200),
+        'route.life_calendar_batch_100': (lambda: client.post('/life-calendar/batch', json=batch), 200),
+        'route.planets_batch_1000': (lambda: client.post('/planets/batch', json=milestone_batch), 200),
+        'route.birthdays_upcoming_1000': (lambda: client.post('/birthdays/upcoming', json=roster), 200),
+        'route.static': (lambda: client.get('/static/js/tabs.js'), 200),
+        'route.static_304': (lambda: client.get('/static/js/tabs.js', headers={'If-None-Match': script_etag}), 304),
+        'route.robots': (lambda: client.get('/robots.txt'), 200),
+        'route.sitemap': (lambda: client.get('/sitemap.xml'), 200),
+        'route.errors': (lambda: client.post('/api/errors', json={'message': 'bench', 'url': '/'}), 200),
+    }
+
+
+def time_case(call):
+    """Best and median microseconds per call over REPEAT rounds"""
+    timer = timeit.Timer(call)
+    number, elapsed = timer.autorange()
+    if elapsed < MIN_TIME:
+        number = max(1, int(number * MIN_TIME / max(elapsed, 1e-9)))
+    rounds = [t / number * 1e6 for t in timer.repeat(repeat=REPEAT, number=number)]
+    return {'best_us': round(min(rounds), 3), 'median_us': round(statistics.median(rounds), 3), 'number': number}
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(name_filter=None):
+    app = load_app()
+    cases = {name: (call, None) for name, call in micro_cases(app).items()}
+    cases.update(endpoint_cases(app))
+
+    results = {}
+    for name, (call, expected_status) in cases.items():
+        if name_filter and name_filter not in name:
+            continue
+        if expected_status is not None:
+            # Make sure we time the real path, not an error page
+            response = call()
+            response.get_data()
+            if response.status_code != expected_status:
+                raise SystemExit(f'{name}: expected {expected_status}, got {response.status_code}')
+            results[name] = time_case(lambda: call().get_data())
+        else:
+            results[name] = time_case(call)
+        print(f"{name:<45} {results[name]['best_us']:12.2f} us")
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Print a per-case comparison; return the names that regressed"""
+    regressions = []
+    print(f"{'case':<45} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, base in baseline['results'].items():
+        now = current['results'].get(name)
+        if now is None:
+            print(f'{name:<45} {base["best_us"]:12.2f} {"missing":>12}')
+            continue
+        change = now['best_us'] / base['best_us'] - 1 if base['best_us'] else 0.0
+        flag = ''
+        if change > threshold:
+            flag = '  REGRESSION'
+            regressions.append(name)
+        elif change < -threshold:
+            flag = '  faster'
+        print(f'{name:<45} {base["best_us"]:12.2f} {now["best_us"]:12.2f} {change:+8.1%}{flag}')
+    for name in current['results'].keys() - baseline['results'].keys():
+        print(f'{name:<45} {"new":>12} {current["results"][name]["best_us"]:12.2f}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='time every case and write a results file')
+    run_parser.add_argument('--output', default=DEFAULT_BASELINE)
+    run_parser.add_argument('--filter', help='only run cases whose name contains this text')
+
+    compare_parser = commands.add_parser('compare', help='flag regressions against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current', nargs='?', help='results file (default: run the suite now)')
+    compare_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                                help='allowed slowdown as a fraction (default 0.15)')
+    compare_parser.add_argument('--filter', help='only run cases whose name contains this text')
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        results = run(args.filter)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f'wrote {args.output}')
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if args.current:
+        with open(args.current, 'r', encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        current = run(args.filter)
+        if args.filter:
+            baseline['results'] = {name: value for name, value in baseline['results'].items()
+                                   if args.filter in name}
+    print()
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f'\n{len(regressions)} regression(s) beyond {args.threshold:.0%}: {", ".join(regressions)}')
+        return 1
+    print(f'\nno regressions beyond {args.threshold:.0%}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,9 @@
+# Picked up automatically by `gunicorn app:app` / `gunicorn wsgi:app` from the project root
+
+
+def post_worker_init(worker):
+    """Set up JSON logging and warm each worker (data files, pre-rendered pages) before it takes requests"""
+    from app import warm_up
+    from utils.structured_logging import configure_logging
+    configure_logging()
+    warm_up()
@@ -0,0 +1,70 @@
+"""The vectorized batch engine must agree with calculate_age field for field.
+
+Run from the repository root:
+    python -m pytest tests
+"""
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import calculate_age
+from utils.batch_age import calculate_ages_batch, batch_to_records
+
+FIRST = datetime(1900, 1, 1)
+LAST = datetime(2100, 12, 31)
+NOW = datetime.now()
+
+
+def scalar_age(birth, target):
+    """calculate_age's record, or its error message"""
+    try:
+        return calculate_age(birth, target), None
+    except ValueError as error:
+        return None, str(error)
+
+
+def assert_parity(pairs):
+    births = [birth for birth, _ in pairs]
+    targets = [target for _, target in pairs]
+    columns, errors = calculate_ages_batch(births, targets, now=NOW)
+    for (birth, target), record, error in zip(pairs, batch_to_records(columns, errors), errors):
+        assert (record, error) == scalar_age(birth, target), (birth, target)
+
+
+def random_instant(rng):
+    span = int((LAST - FIRST).total_seconds())
+    return FIRST + timedelta(seconds=rng.randint(0, span))
+
+
+def test_random_pairs_1900_to_2100():
+    rng = random.Random(1900)
+    pairs = []
+    for _ in range(20000):
+        first, second = random_instant(rng), random_instant(rng)
+        pairs.append((min(first, second), max(first, second)))
+    assert_parity(pairs)
+
+
+def test_month_ends_and_leap_days():
+    # Every birth on a month's last days against targets on the last days of the months around it
+    edges = [datetime(year, month, 1) - timedelta(days=back)
+             for year in (1900, 1904, 1999, 2000, 2023, 2024, 2100)
+             for month in range(1, 13) for back in (0, 1, 2, 3)]
+    edges = [edge for edge in edges if FIRST <= edge <= LAST]
+    pairs = [(birth, target) for birth in edges for target in edges if birth <= target]
+    assert_parity(pairs)
+
+
+@pytest.mark.parametrize('birth, target', [
+    (datetime(2000, 2, 29), datetime(2001, 2, 28)),
+    (datetime(2000, 2, 29), datetime(2001, 3, 1)),
+    (datetime(2000, 1, 31), datetime(2000, 2, 29)),
+    (datetime(1900, 1, 1), datetime(2100, 12, 31)),
+    (datetime(1990, 5, 17, 23, 59, 59), datetime(1990, 5, 18)),
+    (datetime(2010, 6, 1), datetime(2010, 6, 1)),
+    (datetime(2010, 6, 2), datetime(2010, 6, 1)),
+    (LAST, LAST),
+])
+def test_edge_cases_and_errors(birth, target):
+    assert_parity([(birth, target)])
@@ -0,0 +1,168 @@
+"""Static asset pipeline: bundle, minify, fingerprint and precompress.
+
+Build once per deploy, from the repository root:
+    python -m utils.assets
+
+Bundles are written to static/dist/ as <name>.<hash>.<ext> plus a .gz
+variant, with static/dist/assets.json mapping logical bundle names to the
+hashed files. Minification uses rcssmin/rjsmin (see requirements.txt); the
+build stops with an error if either is missing rather than shipping
+unminified bundles. The app itself only reads the manifest and never needs
+them.
+"""
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+
+try:
+    import rcssmin
+except ImportError:
+    rcssmin = None
+
+try:
+    import rjsmin
+except ImportError:
+    rjsmin = None
+
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'static')
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'assets.json'
+
+# Logical bundle name -> source files (relative to static/), in load order
+BUNDLES = {
+    'app.css': [
+        'css/style.css/main.css',
+        'css/animations.css',
+        'css/style.css/components/help-modal.css',
+    ],
+    'head.js': [
+        'js/error-handler.js',
+        'js/data-manager.js',
+        'js/export.js',
+    ],
+    'app.js': [
+        'js/tabs.js',
+        'js/calculator.js',
+        'js/script.js',
+        'js/init.js',
+        'js/share.js',
+        'js/tabs-enhanced.js',
+        'js/charts.js',
+        'js/footer-navigation.js',
+        'js/help-modal.js',
+    ],
+}
+
+CSS_IMPORT = re.compile(r"""@import\s+url\(\s*['"]?([^'")]+)['"]?\s*\)\s*;""")
+
+
+def _read(path, static_dir=STATIC_DIR):
+    with open(os.path.join(static_dir, path), 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def inline_css_imports(path, seen=None, static_dir=STATIC_DIR):
+    """Return a CSS file with its relative @import url(...) rules inlined"""
+    seen = seen if seen is not None else set()
+    if path in seen:
+        return ''
+    seen.add(path)
+    base = os.path.dirname(path)
+
+    def replace(match):
+        target = match.group(1)
+        if '://' in target or target.startswith('//'):
+            return match.group(0)
+        target = os.path.normpath(os.path.join(base, target)).replace(os.sep, '/')
+        return inline_css_imports(target, seen, static_dir)
+
+    return CSS_IMPORT.sub(replace, _read(path, static_dir))
+
+
+def require_minifiers():
+    missing = [name for name, module in (('rcssmin', rcssmin), ('rjsmin', rjsmin)) if module is None]
+    if missing:
+        raise RuntimeError(f"Asset build needs {' and '.join(missing)}: pip install -r requirements.txt")
+
+
+def minify_css(text):
+    return rcssmin.cssmin(text)
+
+
+def minify_js(text):
+    return rjsmin.jsmin(text)
+
+
+def build_bundle(name, sources, static_dir=STATIC_DIR):
+    if name.endswith('.css'):
+        seen = set()
+        return minify_css('\n'.join(inline_css_imports(source, seen, static_dir) for source in sources))
+    # Separate scripts with ';' so a file without a trailing semicolon can't merge into the next
+    return ';\n'.join(minify_js(_read(source, static_dir)) for source in sources)
+
+
+def build(static_dir=STATIC_DIR):
+    """Build every bundle and write the manifest; returns the manifest dict"""
+    require_minifiers()
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    os.makedirs(dist_dir, exist_ok=True)
+
+    manifest = {'bundles': {}, 'precompressed': []}
+    for name, sources in BUNDLES.items():
+        data = build_bundle(name, sources, static_dir).encode('utf-8')
+        stem, ext = os.path.splitext(name)
+        filename = f"{stem}.{hashlib.sha256(data).hexdigest()[:12]}{ext}"
+        path = os.path.join(dist_dir, filename)
+        with open(path, 'wb') as f:
+            f.write(data)
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+
+        relative = f"{DIST_DIR}/{filename}"
+        manifest['bundles'][name] = relative
+        manifest['precompressed'].append(relative)
+        print(f"{name:<10} -> {relative} ({len(data):,} bytes)")
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class AssetManifest:
+    """Resolves logical bundle names to fingerprinted files built by ``build``"""
+
+    def __init__(self, static_dir=STATIC_DIR):
+        self.path = os.path.join(static_dir, DIST_DIR, MANIFEST_NAME)
+        self.bundles = {}
+        self.precompressed = frozenset()
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            self.bundles = dict(manifest.get('bundles', {}))
+            self.precompressed = frozenset(manifest.get('precompressed', []))
+        except (OSError, ValueError):
+            self.bundles = {}
+            self.precompressed = frozenset()
+        self._fingerprinted = frozenset(self.bundles.values()) | self.precompressed
+
+    @property
+    def built(self):
+        return all(name in self.bundles for name in BUNDLES)
+
+    def url(self, name):
+        """Hashed static path for a bundle, or None when it hasn't been built"""
+        return self.bundles.get(name)
+
+    def is_fingerprinted(self, path):
+        """True only for hashed bundle files listed in the manifest (not assets.json itself)"""
+        return path in self._fingerprinted
+
+
+if __name__ == '__main__':
+    build(sys.argv[1] if len(sys.argv) > 1 else STATIC_DIR)
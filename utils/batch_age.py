@@ -0,0 +1,115 @@
+from datetime import datetime
+import numpy as np
+
+US_PER_SECOND = 1_000_000
+US_PER_DAY = 86_400 * US_PER_SECOND
+MAX_AGE_YEARS = 150
+
+AGE_FIELDS = ('years', 'months', 'days', 'hours', 'minutes', 'seconds',
+              'total_days', 'total_hours', 'total_minutes', 'total_seconds',
+              'total_weeks', 'total_months', 'exact_years')
+
+
+def _to_datetime64(values):
+    """Convert a sequence of datetimes (or a datetime64 array) to microsecond precision"""
+    return np.asarray(values, dtype='datetime64[us]')
+
+
+def add_months(birth_month, birth_day_index, birth_time, months):
+    """Add whole months to birth dates, clipping the day to the target month length"""
+    anchor_month = birth_month + months.astype('timedelta64[M]')
+    month_start = anchor_month.astype('datetime64[D]')
+    month_length = ((anchor_month + np.timedelta64(1, 'M')).astype('datetime64[D]') - month_start).astype(np.int64)
+    day_index = np.minimum(birth_day_index, month_length - 1)
+    return month_start.astype('datetime64[us]') + day_index.astype('timedelta64[D]') + birth_time
+
+
+def calculate_ages_batch(birth_dates, target_dates=None, now=None):
+    """Calculate ages for many birth/target pairs in one vectorized pass.
+
+    Mirrors ``calculate_age`` field for field. Returns ``(columns, errors)``:
+    ``columns`` maps each age field to a NumPy array and ``errors`` holds a
+    message (or ``None``) per row. Rows with an error have undefined values.
+    """
+    if now is None:
+        now = datetime.now()
+
+    birth = _to_datetime64(birth_dates)
+    if target_dates is None:
+        target = np.full(birth.shape, np.datetime64(now, 'us'))
+    elif isinstance(target_dates, datetime):
+        target = np.full(birth.shape, np.datetime64(target_dates, 'us'))
+    else:
+        target = _to_datetime64(target_dates)
+
+    if birth.shape != target.shape:
+        raise ValueError("Birth and target dates must have the same length")
+
+    # Same checks, in the same order, as validate_age_calculation
+    elapsed_us = (target - birth).astype(np.int64)
+    total_days = elapsed_us // US_PER_DAY
+    future = birth > np.datetime64(now, 'us')
+    after_target = birth > target
+    too_old = total_days / 365.25 > MAX_AGE_YEARS
+
+    errors = [None] * len(birth)
+    for index in np.flatnonzero(future | after_target | too_old):
+        if future[index]:
+            errors[index] = "Birth date cannot be in the future"
+        elif after_target[index]:
+            errors[index] = "Birth date cannot be after target date"
+        else:
+            errors[index] = "Age exceeds 150 years"
+
+    # Neutralise invalid rows so the calendar arithmetic below stays in range
+    invalid = future | after_target | too_old
+    if invalid.any():
+        target = np.where(invalid, birth, target)
+        elapsed_us = np.where(invalid, 0, elapsed_us)
+        total_days = np.where(invalid, 0, total_days)
+
+    # relativedelta semantics: whole months first, then the remainder
+    birth_day = birth.astype('datetime64[D]')
+    birth_time = birth - birth_day.astype('datetime64[us]')
+    birth_month = birth.astype('datetime64[M]')
+    birth_day_index = (birth_day - birth_month.astype('datetime64[D]')).astype(np.int64)
+
+    months = (target.astype('datetime64[M]') - birth_month).astype(np.int64)
+    anchor = add_months(birth_month, birth_day_index, birth_time, months)
+    overshoot = anchor > target
+    if overshoot.any():
+        months = np.where(overshoot, months - 1, months)
+        anchor = add_months(birth_month, birth_day_index, birth_time, months)
+
+    remainder_us = (target - anchor).astype(np.int64)
+    remainder_seconds = (remainder_us % US_PER_DAY) // US_PER_SECOND
+    total_seconds = elapsed_us // US_PER_SECOND
+
+    columns = {
+        'years': months // 12,
+        'months': months % 12,
+        'days': remainder_us // US_PER_DAY,
+        'hours': remainder_seconds // 3600,
+        'minutes': remainder_seconds % 3600 // 60,
+        'seconds': remainder_seconds % 60,
+        'total_days': total_days,
+        'total_hours': (total_seconds / 3600).astype(np.int64),
+        'total_minutes': (total_seconds / 60).astype(np.int64),
+        'total_seconds': total_seconds,
+        'total_weeks': (total_days / 7).astype(np.int64),
+        'total_months': months,
+        'exact_years': total_days / 365.25
+    }
+    return columns, errors
+
+
+def batch_to_records(columns, errors):
+    """Turn batch columns into a list of per-row dicts (``None`` for failed rows)"""
+    lists = {field: columns[field].tolist() for field in AGE_FIELDS}
+    records = []
+    for index, error in enumerate(errors):
+        if error:
+            records.append(None)
+        else:
+            records.append({field: lists[field][index] for field in AGE_FIELDS})
+    return records
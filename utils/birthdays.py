@@ -0,0 +1,103 @@
+from bisect import bisect_left
+from calendar import isleap
+from collections import namedtuple
+from datetime import date, timedelta
+
+# Day of a leap year (0..365) for each (month, day): Feb 29 is 59, Mar 1 is 60
+MONTH_OFFSETS = (0, 31, 60, 91, 121, 152, 182, 213, 244, 274, 305, 335)
+MAX_WITHIN_DAYS = 366
+
+Upcoming = namedtuple('Upcoming', 'id birth_date birthday days_until age')
+
+
+def day_key(value):
+    """Position of ``value``'s (month, day) in a leap year, so Feb 29 sorts between Feb 28 and Mar 1"""
+    return MONTH_OFFSETS[value.month - 1] + value.day - 1
+
+
+def birthday_in(birth_date, year):
+    """The birthday in ``year``; Feb 29 birthdays fall on Feb 28 in common years"""
+    if birth_date.month == 2 and birth_date.day == 29 and not isleap(year):
+        return date(year, 2, 28)
+    return date(year, birth_date.month, birth_date.day)
+
+
+def next_birthday(birth_date, today):
+    """The first birthday on or after ``today`` (today itself counts)"""
+    birthday = birthday_in(birth_date, today.year)
+    if birthday < today:
+        birthday = birthday_in(birth_date, today.year + 1)
+    return birthday
+
+
+def key_range(start, end):
+    """Keys ``[low, high)`` of the birthdays that fall in ``start..end`` (one calendar year)"""
+    low, high = day_key(start), day_key(end) + 1
+    if end.month == 2 and end.day == 28 and not isleap(end.year):
+        high += 1  # Feb 29 birthdays are celebrated on Feb 28
+    return low, high
+
+
+class BirthdayIndex:
+    """A roster sorted by birthday (month, day) for "who has a birthday soon" queries.
+
+    Build once from ``(id, birth_date)`` pairs; each query is a bisect per
+    calendar year the window touches, plus the size of the answer. The
+    window wraps across New Year, and Feb 29 birthdays count on Feb 28 in
+    common years. People born after the query date are not yet anyone's
+    upcoming birthday and are left out.
+    """
+
+    def __init__(self, entries=()):
+        rows = sorted(((day_key(birth), position, person_id, birth)
+                       for position, (person_id, birth) in enumerate(entries)), key=lambda row: row[:2])
+        self._keys = [row[0] for row in rows]
+        self._ids = [row[2] for row in rows]
+        self._births = [row[3] for row in rows]
+        self._latest_birth = max(self._births, default=None)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _slices(self, today, within_days):
+        """``(year, low, high)`` index slices for the window, in date order, each person at most once"""
+        end = today + timedelta(days=within_days)
+        slices = []
+        first_key = covered = None
+        for year in range(today.year, end.year + 1):
+            start = today if year == today.year else date(year, 1, 1)
+            low, high = key_range(start, end if year == end.year else date(year, 12, 31))
+            if first_key is None:
+                first_key, covered = low, 0
+            else:
+                # A window over a year long comes back round to birthdays it already has
+                low, high = max(low, covered), min(high, first_key)
+                covered = max(covered, high)
+            if low < high:
+                slices.append((year, bisect_left(self._keys, low), bisect_left(self._keys, high)))
+        return slices
+
+    def upcoming(self, today, within_days=30):
+        """Everyone whose next birthday is within ``within_days`` of ``today``, soonest first"""
+        if not 0 <= within_days <= MAX_WITHIN_DAYS:
+            raise ValueError(f'within_days must be between 0 and {MAX_WITHIN_DAYS}')
+        results = []
+        for year, low, high in self._slices(today, within_days):
+            for position in range(low, high):
+                birth = self._births[position]
+                if birth > today:
+                    continue
+                birthday = birthday_in(birth, year)
+                results.append(Upcoming(self._ids[position], birth, birthday,
+                                        (birthday - today).days, year - birth.year))
+        return results
+
+    def count_upcoming(self, today, within_days=30):
+        """How many people :meth:`upcoming` would return, without building the rows"""
+        if not 0 <= within_days <= MAX_WITHIN_DAYS:
+            raise ValueError(f'within_days must be between 0 and {MAX_WITHIN_DAYS}')
+        slices = self._slices(today, within_days)
+        if self._latest_birth is None or self._latest_birth <= today:
+            return sum(high - low for _, low, high in slices)
+        births = self._births
+        return sum(births[position] <= today for _, low, high in slices for position in range(low, high))
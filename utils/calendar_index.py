@@ -0,0 +1,153 @@
+from array import array
+from datetime import datetime
+
+# Covers every date accepted by validate_date_string (1900-01-01 .. 2100-12-31)
+FIRST_YEAR = 1900
+LAST_YEAR = 2100
+EPOCH_ORDINAL = datetime(FIRST_YEAR, 1, 1).toordinal()
+
+US_PER_SECOND = 1_000_000
+US_PER_DAY = 86_400 * US_PER_SECOND
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _build_tables():
+    """Build per-year leap flags and per-month length/start-ordinal tables"""
+    leap_flags = []
+    month_lengths = []
+    month_starts = [0]
+    for year in range(FIRST_YEAR, LAST_YEAR + 1):
+        leap = _is_leap(year)
+        leap_flags.append(leap)
+        for length in (31, 29 if leap else 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31):
+            month_lengths.append(length)
+            month_starts.append(month_starts[-1] + length)
+    return tuple(leap_flags), tuple(month_lengths), tuple(month_starts)
+
+
+# LEAP_YEARS[year - FIRST_YEAR]; MONTH_LENGTHS/MONTH_STARTS[(year - FIRST_YEAR) * 12 + month - 1].
+# MONTH_STARTS has one trailing entry so MONTH_STARTS[-1] is the total day count.
+LEAP_YEARS, MONTH_LENGTHS, MONTH_STARTS = _build_tables()
+MONTH_COUNT = len(MONTH_LENGTHS)
+DAY_COUNT = MONTH_STARTS[-1]
+
+
+# Derived per-birth-date attributes, one entry per day ordinal
+ZODIAC_SIGNS = ("Capricorn", "Aquarius", "Pisces", "Aries", "Taurus", "Gemini",
+                "Cancer", "Leo", "Virgo", "Libra", "Scorpio", "Sagittarius")
+ZODIAC_STARTS = ((1, 20), (2, 19), (3, 21), (4, 20), (5, 21), (6, 21),
+                 (7, 23), (8, 23), (9, 23), (10, 23), (11, 22), (12, 22))
+CHINESE_ZODIAC = ("Rat", "Ox", "Tiger", "Rabbit", "Dragon", "Snake",
+                  "Horse", "Goat", "Monkey", "Rooster", "Dog", "Pig")
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def _build_day_tables():
+    """Build sign, Chinese animal, weekday and day-of-year tables keyed by day ordinal"""
+    # Western sign for each day of a leap year; non-leap years skip Feb 29
+    leap_signs = bytearray()
+    for month in range(1, 13):
+        for day in range(1, MONTH_LENGTHS[(2000 - FIRST_YEAR) * 12 + month - 1] + 1):
+            sign = sum(1 for start in ZODIAC_STARTS if (month, day) >= start) % 12
+            leap_signs.append(sign)
+    common_signs = leap_signs[:59] + leap_signs[60:]
+
+    signs = bytearray()
+    animals = bytearray()
+    days_of_year = array('H')
+    for offset, leap in enumerate(LEAP_YEARS):
+        year_signs = leap_signs if leap else common_signs
+        signs += year_signs
+        animals += bytes([offset % 12]) * len(year_signs)
+        days_of_year.extend(range(1, len(year_signs) + 1))
+
+    # 1900-01-01 was a Monday
+    weekdays = (bytes(range(7)) * (DAY_COUNT // 7 + 1))[:DAY_COUNT]
+    return bytes(signs), bytes(animals), weekdays, days_of_year
+
+
+SIGN_BY_DAY, CHINESE_BY_DAY, WEEKDAY_BY_DAY, DAY_OF_YEAR = _build_day_tables()
+
+
+def month_index(year, month):
+    """Index into the month tables, or -1 when outside the covered range"""
+    if not 1 <= month <= 12:
+        return -1
+    index = (year - FIRST_YEAR) * 12 + month - 1
+    return index if 0 <= index < MONTH_COUNT else -1
+
+
+def day_ordinal(year, month, day):
+    """Days since 1900-01-01, or -1 when outside the covered range"""
+    index = month_index(year, month)
+    if index < 0 or not 1 <= day <= MONTH_LENGTHS[index]:
+        return -1
+    return MONTH_STARTS[index] + day - 1
+
+
+def birth_attributes(value):
+    """Return (zodiac_sign, chinese_zodiac, weekday, day_of_year) for a date, or None out of range"""
+    ordinal = value.toordinal() - EPOCH_ORDINAL
+    if not 0 <= ordinal < DAY_COUNT:
+        return None
+    return (ZODIAC_SIGNS[SIGN_BY_DAY[ordinal]], CHINESE_ZODIAC[CHINESE_BY_DAY[ordinal]],
+            WEEKDAYS[WEEKDAY_BY_DAY[ordinal]], DAY_OF_YEAR[ordinal])
+
+
+def zodiac_sign(month, day):
+    """Western sign for a month/day pair (looked up in a leap year), or None if invalid"""
+    ordinal = day_ordinal(2000, month, day)
+    return ZODIAC_SIGNS[SIGN_BY_DAY[ordinal]] if ordinal >= 0 else None
+
+
+def chinese_zodiac(year):
+    """Chinese zodiac animal for a year, or None outside the covered range"""
+    if not FIRST_YEAR <= year <= LAST_YEAR:
+        return None
+    return CHINESE_ZODIAC[(year - FIRST_YEAR) % 12]
+
+
+def _time_of_day_us(value):
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * US_PER_SECOND + value.microsecond
+
+
+def _anchor_us(month_idx, day, time_us):
+    """Birth date shifted to another month, clipped to that month's length"""
+    return (MONTH_STARTS[month_idx] + min(day, MONTH_LENGTHS[month_idx]) - 1) * US_PER_DAY + time_us
+
+
+def age_components(birth_date, target_date):
+    """Return relativedelta-equivalent (years, months, days, hours, minutes, seconds).
+
+    Pure integer arithmetic over the precomputed tables. Returns ``None`` when
+    the inputs fall outside the index (non-datetime, timezone-aware, out of
+    range or target before birth) so callers can fall back to relativedelta.
+    """
+    if not isinstance(birth_date, datetime) or not isinstance(target_date, datetime):
+        return None
+    if birth_date.tzinfo is not None or target_date.tzinfo is not None:
+        return None
+
+    birth_idx = month_index(birth_date.year, birth_date.month)
+    target_idx = month_index(target_date.year, target_date.month)
+    if birth_idx < 0 or target_idx < birth_idx:
+        return None
+
+    birth_time = _time_of_day_us(birth_date)
+    target_us = (MONTH_STARTS[target_idx] + target_date.day - 1) * US_PER_DAY + _time_of_day_us(target_date)
+
+    months = target_idx - birth_idx
+    anchor = _anchor_us(target_idx, birth_date.day, birth_time)
+    if anchor > target_us:
+        months -= 1
+        if months < 0:
+            return None
+        anchor = _anchor_us(target_idx - 1, birth_date.day, birth_time)
+
+    remainder = target_us - anchor
+    days, remainder = divmod(remainder, US_PER_DAY)
+    seconds = remainder // US_PER_SECOND
+    return months // 12, months % 12, days, seconds // 3600, seconds % 3600 // 60, seconds % 60
@@ -0,0 +1,152 @@
+import time
+from utils.shared_state import DEFAULT_STATE_PATH, get_connection
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class SharedCircuitBreaker:
+    """Circuit breaker whose state lives in the shared SQLite store.
+
+    Every worker on the host sees the same state: once a provider trips the
+    breaker all workers stop calling it, a single worker probes it when the
+    open period ends (half-open), and all workers recover together. It also
+    tracks the last call time so a minimum interval between calls is enforced
+    across workers.
+    """
+
+    def __init__(self, name, path=DEFAULT_STATE_PATH, failure_threshold=5,
+                 cooldown=300, probe_timeout=60):
+        self.name = name
+        self.path = path
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.probe_timeout = probe_timeout
+        self._ready = False
+
+    def _db(self):
+        connection = get_connection(self.path)
+        if not self._ready:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS circuit_breakers ('
+                ' name TEXT PRIMARY KEY, state TEXT NOT NULL, failures INTEGER NOT NULL,'
+                ' opened_until REAL, probe_started REAL, last_request REAL)'
+            )
+            connection.execute(
+                'INSERT OR IGNORE INTO circuit_breakers (name, state, failures) VALUES (?, ?, 0)',
+                (self.name, CLOSED)
+            )
+            self._ready = True
+        return connection
+
+    def _row(self):
+        return self._db().execute(
+            'SELECT state, failures, opened_until, probe_started, last_request'
+            ' FROM circuit_breakers WHERE name = ?', (self.name,)
+        ).fetchone()
+
+    def is_open(self, now=None):
+        """True while calls must be skipped (open and not yet due, or a probe in flight)"""
+        now = now or time.time()
+        state, _, opened_until, probe_started, _ = self._row()
+        if state == OPEN:
+            return opened_until is None or now < opened_until
+        if state == HALF_OPEN:
+            return probe_started is not None and now - probe_started < self.probe_timeout
+        return False
+
+    def allow_request(self, now=None):
+        """Return True if the caller may call the provider now.
+
+        When the open period has elapsed exactly one caller (across all
+        workers) wins the transition to half-open and gets to probe.
+        """
+        now = now or time.time()
+        state, _, opened_until, probe_started, _ = self._row()
+        if state == CLOSED:
+            return True
+        if state == OPEN and opened_until is not None and now < opened_until:
+            return False
+        if state == HALF_OPEN and probe_started is not None and now - probe_started < self.probe_timeout:
+            return False
+
+        cursor = self._db().execute(
+            'UPDATE circuit_breakers SET state = ?, probe_started = ?'
+            ' WHERE name = ? AND state = ? AND COALESCE(probe_started, 0) IS ?',
+            (HALF_OPEN, now, self.name, state, probe_started or 0)
+        )
+        return cursor.rowcount == 1
+
+    def record_success(self):
+        self._db().execute(
+            'UPDATE circuit_breakers SET state = ?, failures = 0, opened_until = NULL,'
+            ' probe_started = NULL WHERE name = ?', (CLOSED, self.name)
+        )
+
+    def record_failure(self, reset_at=None, now=None):
+        """Count a failure; open the breaker until ``reset_at`` (e.g. a quota reset) if given"""
+        now = now or time.time()
+        connection = self._db()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            state, failures, _, _, _ = self._row()
+            failures += 1
+            if reset_at is not None:
+                opened_until = reset_at
+            elif state == HALF_OPEN or failures >= self.failure_threshold:
+                opened_until = now + self.cooldown
+            else:
+                opened_until = None
+
+            if opened_until is None:
+                connection.execute(
+                    'UPDATE circuit_breakers SET failures = ? WHERE name = ?', (failures, self.name)
+                )
+            else:
+                connection.execute(
+                    'UPDATE circuit_breakers SET state = ?, failures = ?, opened_until = ?,'
+                    ' probe_started = NULL WHERE name = ?', (OPEN, failures, opened_until, self.name)
+                )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+
+    def acquire_slot(self, min_interval, now=None):
+        """Atomically claim the next call slot if ``min_interval`` has passed since the last one"""
+        now = now or time.time()
+        cursor = self._db().execute(
+            'UPDATE circuit_breakers SET last_request = ?'
+            ' WHERE name = ? AND (last_request IS NULL OR last_request <= ?)',
+            (now, self.name, now - min_interval)
+        )
+        return cursor.rowcount == 1
+
+    @property
+    def failures(self):
+        return self._row()[1]
+
+    @property
+    def opened_until(self):
+        return self._row()[2]
+
+    @property
+    def last_request(self):
+        return self._row()[4]
+
+    def reset(self):
+        self._db().execute(
+            'UPDATE circuit_breakers SET state = ?, failures = 0, opened_until = NULL,'
+            ' probe_started = NULL, last_request = NULL WHERE name = ?', (CLOSED, self.name)
+        )
+
+    def status(self):
+        state, failures, opened_until, probe_started, last_request = self._row()
+        return {
+            'state': state,
+            'failures': failures,
+            'opened_until': opened_until,
+            'probe_started': probe_started,
+            'last_request': last_request
+        }
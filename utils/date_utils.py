@@ -2,6 +2,11 @@ from datetime import datetime, date, timedelta
 import pytz
 from dateutil.relativedelta import relativedelta
 import math
+from utils.calendar_index import (age_components, birth_attributes, zodiac_sign,
+                                  chinese_zodiac, CHINESE_ZODIAC, WEEKDAYS)
+from utils.birthdays import next_birthday
+from utils.planets import ORBITAL_PERIODS
+from utils.time_perception import time_perception
 
 class DateUtils:
     @staticmethod
@@ -15,71 +20,46 @@ class DateUtils:
         if isinstance(target_date, str):
             target_date = datetime.strptime(target_date, '%Y-%m-%d')
         
-        delta = relativedelta(target_date, birth_date)
+        components = age_components(birth_date, target_date)
+        if components is None:
+            delta = relativedelta(target_date, birth_date)
+            components = (delta.years, delta.months, delta.days, delta.hours, delta.minutes, delta.seconds)
+        years, months, days, hours, minutes, seconds = components
+        
+        elapsed = target_date - birth_date
+        total_seconds = int(elapsed.total_seconds())
         
         return {
-            'years': delta.years,
-            'months': delta.months,
-            'days': delta.days,
-            'hours': delta.hours,
-            'minutes': delta.minutes,
-            'seconds': delta.seconds,
-            'total_days': (target_date - birth_date).days,
-            'total_hours': int((target_date - birth_date).total_seconds() / 3600),
-            'total_minutes': int((target_date - birth_date).total_seconds() / 60),
-            'total_seconds': int((target_date - birth_date).total_seconds()),
-            'total_weeks': int((target_date - birth_date).days / 7),
-            'total_months': delta.years * 12 + delta.months,
-            'exact_years': (target_date - birth_date).days / 365.25
+            'years': years,
+            'months': months,
+            'days': days,
+            'hours': hours,
+            'minutes': minutes,
+            'seconds': seconds,
+            'total_days': elapsed.days,
+            'total_hours': int(total_seconds / 3600),
+            'total_minutes': int(total_seconds / 60),
+            'total_seconds': total_seconds,
+            'total_weeks': int(elapsed.days / 7),
+            'total_months': years * 12 + months,
+            'exact_years': elapsed.days / 365.25
         }
     
     @staticmethod
     def get_zodiac_sign(month, day):
         """Calculate zodiac sign based on birth date"""
-        zodiac_signs = [
-            ("Capricorn", (1, 1), (1, 19)),
-            ("Aquarius", (1, 20), (2, 18)),
-            ("Pisces", (2, 19), (3, 20)),
-            ("Aries", (3, 21), (4, 19)),
-            ("Taurus", (4, 20), (5, 20)),
-            ("Gemini", (5, 21), (6, 20)),
-            ("Cancer", (6, 21), (7, 22)),
-            ("Leo", (7, 23), (8, 22)),
-            ("Virgo", (8, 23), (9, 22)),
-            ("Libra", (9, 23), (10, 22)),
-            ("Scorpio", (10, 23), (11, 21)),
-            ("Sagittarius", (11, 22), (12, 21)),
-            ("Capricorn", (12, 22), (12, 31))
-        ]
-        
-        for sign, start, end in zodiac_signs:
-            if (month == start[0] and day >= start[1]) or (month == end[0] and day <= end[1]):
-                return sign
+        return zodiac_sign(month, day)
     
     @staticmethod
     def get_chinese_zodiac(year):
         """Calculate Chinese zodiac sign based on birth year"""
-        zodiac_animals = ["Rat", "Ox", "Tiger", "Rabbit", "Dragon", "Snake", 
-                         "Horse", "Goat", "Monkey", "Rooster", "Dog", "Pig"]
-        return zodiac_animals[(year - 1900) % 12]
+        return chinese_zodiac(year) or CHINESE_ZODIAC[(year - 1900) % 12]
     
     @staticmethod
-    def get_planet_age(birth_date, planet):
+    def get_planet_age(birth_date, planet, now=None):
         """Calculate age on different planets"""
-        planet_orbital_periods = {
-            'mercury': 87.97,      # Earth days
-            'venus': 224.70,
-            'earth': 365.25,
-            'mars': 686.98,
-            'jupiter': 4332.82,
-            'saturn': 10755.70,
-            'uranus': 30687.15,
-            'neptune': 60190.03,
-            'pluto': 90520.00
-        }
-        
-        earth_days = (datetime.now() - birth_date).days
-        planet_years = earth_days / planet_orbital_periods.get(planet.lower(), 365.25)
+        earth_days = ((now or datetime.now()) - birth_date).days
+        planet_years = earth_days / ORBITAL_PERIODS.get(planet.lower(), ORBITAL_PERIODS['earth'])
         
         return round(planet_years, 2)
     
@@ -87,19 +67,13 @@ class DateUtils:
     def get_next_birthday(birth_date):
         """Calculate days until next birthday"""
         today = date.today()
-        next_birthday = date(today.year, birth_date.month, birth_date.day)
-        
-        if next_birthday < today:
-            next_birthday = date(today.year + 1, birth_date.month, birth_date.day)
-        
-        days_until = (next_birthday - today).days
-        return days_until
+        return (next_birthday(birth_date, today) - today).days
     
     @staticmethod
     def get_weekday_of_birth(birth_date):
         """Get the day of week when born"""
-        days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        return days[birth_date.weekday()]
+        attributes = birth_attributes(birth_date)
+        return attributes[2] if attributes else WEEKDAYS[birth_date.weekday()]
     
     @staticmethod
     def get_life_calendar(birth_date, life_expectancy=80):
@@ -117,19 +91,8 @@ class DateUtils:
     
     @staticmethod
     def get_time_perception_factor(age):
-        """Calculate how fast time seems to pass at different ages"""
-        if age < 10:
-            return 0.3
-        elif age < 20:
-            return 0.6
-        elif age < 30:
-            return 0.8
-        elif age < 50:
-            return 1.2
-        elif age < 70:
-            return 1.5
-        else:
-            return 2.0
+        """Calculate how fast time seems to pass at different ages (data/time_perception.json)"""
+        return round(time_perception.factor(time_perception.day_index(age)), 3)
     
     @staticmethod
     def get_historical_events(birth_year):
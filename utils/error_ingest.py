@@ -0,0 +1,220 @@
+import hashlib
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:  # Windows: appends still work, rotation is unlocked
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# Client-supplied fields we keep, with their maximum lengths
+REPORT_FIELDS = {
+    'type': 100,
+    'message': 500,
+    'source': 500,
+    'url': 500,
+    'line': 20,
+    'column': 20,
+    'stack': 4000,
+    'user_agent': 300,
+}
+
+# Digits and hex ids vary between otherwise identical errors
+VOLATILE = re.compile(r'0x[0-9a-f]+|\d+', re.I)
+
+
+def clean_report(data):
+    """Keep the known fields as bounded strings; None if nothing usable remains"""
+    if not isinstance(data, dict):
+        return None
+    report = {}
+    for field, max_length in REPORT_FIELDS.items():
+        value = data.get(field)
+        if value is None and field == 'user_agent':
+            value = data.get('userAgent')
+        if value is not None and not isinstance(value, (dict, list)):
+            report[field] = str(value)[:max_length]
+    return report if report.get('message') or report.get('stack') else None
+
+
+def fingerprint(report):
+    """Stable id for 'the same error': type, normalised message, source and top stack frame"""
+    stack = report.get('stack', '')
+    top_frame = next((line.strip() for line in stack.splitlines()[1:] if line.strip()), '')
+    parts = (
+        report.get('type', ''),
+        VOLATILE.sub('#', report.get('message', '')),
+        report.get('source', ''),
+        report.get('line', ''),
+        top_frame,
+    )
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+class ErrorIngestor:
+    """Bounded, non-blocking intake of client error reports.
+
+    ``submit`` only does a ``put_nowait`` on a bounded queue. Once the queue
+    is more than ``sample_above`` full, reports are kept with a probability
+    that falls to zero as it fills, and each kept report carries a weight of
+    1/probability so counts stay estimable. A daemon thread groups reports by
+    fingerprint and, every ``flush_interval`` seconds, appends one JSON line
+    per fingerprint to ``path``, which rotates at ``max_bytes``.
+    """
+
+    def __init__(self, path, max_queue=1000, flush_interval=2.0, sample_above=0.5,
+                 max_bytes=5 * 1024 * 1024, backup_count=5):
+        self.path = path
+        self.max_queue = max_queue
+        self.flush_interval = flush_interval
+        self.sample_above = sample_above
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.counters = {'accepted': 0, 'sampled_out': 0, 'dropped': 0, 'written': 0}
+        self._counters_lock = threading.Lock()
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._start_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def start(self):
+        """Start the writer thread (again, after a fork) if it isn't running"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid != os.getpid():
+                # Reports queued before a fork belong to the parent
+                self._queue = queue.Queue(maxsize=self.max_queue)
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='client-error-writer', daemon=True)
+            self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def submit(self, report):
+        """Queue a cleaned report; returns 'accepted', 'sampled_out' or 'dropped'"""
+        self.start()
+        weight = 1.0
+        fill = self._queue.qsize() / self.max_queue
+        if fill > self.sample_above:
+            keep = max(0.0, (1.0 - fill) / (1.0 - self.sample_above))
+            if random.random() >= keep:
+                self._count('sampled_out')
+                return 'sampled_out'
+            weight = 1.0 / keep
+        try:
+            self._queue.put_nowait((time.time(), weight, report))
+        except queue.Full:
+            self._count('dropped')
+            return 'dropped'
+        self._count('accepted')
+        return 'accepted'
+
+    def _count(self, outcome, amount=1):
+        # Request threads submit concurrently; += on a shared dict loses updates
+        with self._counters_lock:
+            self.counters[outcome] += amount
+
+    def _drain(self, deadline):
+        """Group everything queued until ``deadline`` by fingerprint"""
+        groups = {}
+        while True:
+            timeout = deadline - time.monotonic()
+            try:
+                if timeout > 0:
+                    received, weight, report = self._queue.get(timeout=timeout)
+                else:
+                    received, weight, report = self._queue.get_nowait()
+            except queue.Empty:
+                return groups
+            key = fingerprint(report)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = {'fingerprint': key, 'count': 1, 'estimated_count': weight,
+                               'first_seen': received, 'last_seen': received, 'sample': report}
+            else:
+                group['count'] += 1
+                group['estimated_count'] += weight
+                group['last_seen'] = received
+
+    def _run(self):
+        while not self._stop.is_set():
+            groups = self._drain(time.monotonic() + self.flush_interval)
+            if groups:
+                try:
+                    self.write(groups.values())
+                except Exception as e:
+                    logger.warning("Client error log write failed: %s", e)
+
+    def write(self, groups):
+        """Append one JSON line per fingerprint group, rotating the file first if needed"""
+        lines = []
+        for group in groups:
+            group = dict(group, estimated_count=round(group['estimated_count'], 1),
+                         first_seen=datetime.fromtimestamp(group['first_seen']).isoformat(timespec='seconds'),
+                         last_seen=datetime.fromtimestamp(group['last_seen']).isoformat(timespec='seconds'))
+            lines.append(json.dumps(group, ensure_ascii=False, separators=(',', ':')))
+        data = ('\n'.join(lines) + '\n').encode('utf-8')
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        f = self._open_locked()
+        try:
+            size = os.fstat(f.fileno()).st_size
+            if size and size + len(data) > self.max_bytes:
+                self._rotate()
+                f.close()
+                f = self._open_locked()
+            f.write(data)
+        finally:
+            f.close()  # closing releases the lock
+        self._count('written', len(lines))
+
+    def _open_locked(self):
+        """Open the live log for append, locked against other workers.
+
+        Reopened per batch and re-checked after locking, so a worker that
+        waited while another rotated never writes to (or rotates) the old file.
+        """
+        while True:
+            f = open(self.path, 'ab')
+            if not fcntl:
+                return f
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                if os.stat(self.path).st_ino == os.fstat(f.fileno()).st_ino:
+                    return f
+            except FileNotFoundError:
+                pass
+            f.close()
+
+    def _rotate(self):
+        """client-errors.log -> .1 -> .2 ... keeping ``backup_count`` old files"""
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f'{self.path}.{index}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{index + 1}')
+        if self.backup_count > 0:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.remove(self.path)
+
+    def stats(self):
+        with self._counters_lock:
+            counters = dict(self.counters)
+        return dict(counters, queued=self._queue.qsize(), capacity=self.max_queue)
@@ -0,0 +1,50 @@
+import base64
+import numpy as np
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+
+def rank_ages(total_days):
+    """Rank a group by age (rank 1 = oldest, ties share a rank).
+
+    Returns ``(order, ranks, older_than_percent)`` where ``order`` lists the
+    indices oldest first and ``older_than_percent`` is the share of the rest
+    of the group each person is strictly older than.
+    """
+    days = np.asarray(total_days, dtype=np.int64)
+    count = len(days)
+    order = np.argsort(-days, kind='stable')
+    ascending = np.sort(days)
+    younger = np.searchsorted(ascending, days, side='left')
+    ranks = count - np.searchsorted(ascending, days, side='right') + 1
+    older_than = younger / (count - 1) * 100 if count > 1 else np.zeros(count)
+    return order, ranks, np.round(older_than, 1)
+
+
+def age_percentiles(exact_years):
+    """Group age distribution in years"""
+    years = np.asarray(exact_years, dtype=np.float64)
+    values = np.percentile(years, PERCENTILES)
+    summary = {f'p{p}': round(float(v), 2) for p, v in zip(PERCENTILES, values)}
+    summary['mean'] = round(float(years.mean()), 2)
+    return summary
+
+
+def age_gap_matrix(total_days):
+    """Pairwise age differences in days, computed by broadcasting.
+
+    Encoded compactly as the condensed upper triangle (row-major pairs
+    i < j) of ``days[i] - days[j]`` in little-endian int32, base64-encoded;
+    a positive value means person i is older than person j.
+    """
+    days = np.asarray(total_days, dtype=np.int32)
+    rows, columns = np.triu_indices(len(days), k=1)
+    gaps = (days[:, None] - days[None, :])[rows, columns].astype('<i4')
+    return {
+        'size': len(days),
+        'unit': 'days',
+        'layout': 'condensed-upper',
+        'dtype': 'int32-le',
+        'encoding': 'base64',
+        'data': base64.b64encode(gaps.tobytes()).decode('ascii')
+    }
@@ -0,0 +1,158 @@
+import base64
+import threading
+from collections import OrderedDict, namedtuple
+import numpy as np
+
+from utils.batch_age import add_months
+from utils.milestones import DEFAULT_SCHEDULE, milestone_dates
+
+WEEKS_PER_ROW = 52
+DEFAULT_LIFE_EXPECTANCY = 80
+MAX_LIFE_EXPECTANCY = 150
+UNIX_EPOCH_ORDINAL = 719163  # date(1970, 1, 1).toordinal()
+
+# Cell states in the run-length form: bit 0 = lived, bit 1 = milestone
+CELL_STATES = ('remaining', 'lived', 'milestone', 'lived_milestone')
+
+# One row per year of life, starting on that birthday (Feb 29 -> Feb 28), split
+# into 52 weeks; the last week of a row runs up to the next birthday.
+# starts: first day of every cell, row-major, as days since 1970-01-01
+# milestones: ((cell, name), ...) for milestones inside the grid
+Grid = namedtuple('Grid', 'life_expectancy starts milestones milestone_bits')
+
+
+def build_grids(birth_dates, life_expectancy=DEFAULT_LIFE_EXPECTANCY, schedule=DEFAULT_SCHEDULE):
+    """Week grids for many birth dates in one vectorized pass"""
+    birth = np.asarray(birth_dates, dtype='datetime64[us]').astype('datetime64[D]')
+    birth_month = birth.astype('datetime64[M]').reshape(-1, 1)
+    birth_day_index = (birth - birth_month.ravel().astype('datetime64[D]')).astype(np.int64).reshape(-1, 1)
+
+    months = np.arange(life_expectancy + 1, dtype=np.int64).reshape(1, -1) * 12
+    birthdays = add_months(birth_month, birth_day_index, np.timedelta64(0, 'us'), months)
+    birthdays = birthdays.astype('datetime64[D]').astype(np.int64)
+
+    weeks = np.arange(WEEKS_PER_ROW, dtype=np.int64) * 7
+    starts = (birthdays[:, :-1, np.newaxis] + weeks).reshape(len(birth), -1)
+    ends = birthdays[:, -1]
+
+    milestone_days = milestone_dates(birth.astype('datetime64[us]'), schedule).astype('datetime64[D]').astype(np.int64)
+    total = starts.shape[1]
+    grids = []
+    for row in range(len(birth)):
+        cells = np.searchsorted(starts[row], milestone_days[row], side='right') - 1
+        inside = (cells >= 0) & (milestone_days[row] < ends[row])
+        flags = np.zeros(total, dtype=bool)
+        flags[cells[inside]] = True
+        milestones = tuple(sorted((int(cell), schedule[column][0])
+                                  for column, cell in zip(np.flatnonzero(inside).tolist(), cells[inside].tolist())))
+        grids.append(Grid(life_expectancy, starts[row], milestones, np.packbits(flags).tobytes()))
+    return grids
+
+
+def day_number(value):
+    """Days since 1970-01-01 for a date or datetime"""
+    return value.toordinal() - UNIX_EPOCH_ORDINAL
+
+
+def weeks_lived(grid, target_date):
+    """Cells that have started on or before ``target_date`` (the current week counts)"""
+    return int(np.searchsorted(grid.starts, day_number(target_date), side='right'))
+
+
+def prefix_bitset(count, total):
+    """Packed MSB-first bitset of ``total`` bits with the first ``count`` set"""
+    full, partial = divmod(count, 8)
+    head = b'\xff' * full + (bytes([(0xff00 >> partial) & 0xff]) if partial else b'')
+    return head + bytes((total + 7) // 8 - len(head))
+
+
+def year_runs(grid, lived):
+    """Per-year run-length form: one ``[[state, length], ...]`` list per row"""
+    codes = np.zeros(len(grid.starts), dtype=np.int8)
+    codes[:lived] = 1
+    for cell, _ in grid.milestones:
+        codes[cell] |= 2
+    rows = codes.reshape(-1, WEEKS_PER_ROW)
+    runs = []
+    for row in rows:
+        change = np.flatnonzero(row[1:] != row[:-1]) + 1
+        bounds = np.concatenate(([0], change, [WEEKS_PER_ROW]))
+        runs.append([[int(row[start]), int(end - start)] for start, end in zip(bounds[:-1], bounds[1:])])
+    return runs
+
+
+def encode_calendar(grid, target_date, encoding='bitset'):
+    """The life-calendar response body for one person.
+
+    ``bitset`` sends base64 packed bitsets (MSB first, row-major, 52 cells per
+    row) for lived weeks and milestone weeks; ``runs`` sends per-year runs of
+    CELL_STATES codes instead.
+    """
+    total = len(grid.starts)
+    lived = weeks_lived(grid, target_date)
+    result = {
+        'life_expectancy': grid.life_expectancy,
+        'weeks_per_row': WEEKS_PER_ROW,
+        'total_weeks': total,
+        'weeks_lived': min(lived, total),
+        'weeks_remaining': max(0, total - lived),
+        'percentage_lived': round(min(100, lived / total * 100), 1),
+        'milestones': [{'week': cell, 'name': name} for cell, name in grid.milestones],
+        'encoding': encoding
+    }
+    if encoding == 'runs':
+        result['states'] = list(CELL_STATES)
+        result['runs'] = year_runs(grid, lived)
+    else:
+        result['lived'] = base64.b64encode(prefix_bitset(min(lived, total), total)).decode('ascii')
+        result['milestone_weeks'] = base64.b64encode(grid.milestone_bits).decode('ascii')
+    return result
+
+
+class LifeCalendarCache:
+    """Bounded LRU of week grids per (birth date, life expectancy).
+
+    A grid doesn't depend on the current date (only the lived count does),
+    so entries stay valid indefinitely. Grids are shared and read-only.
+    """
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._grids = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, birth_dates, life_expectancy=DEFAULT_LIFE_EXPECTANCY):
+        """Grids for every birth date, building all the missing ones in one pass"""
+        keys = [(birth.toordinal(), life_expectancy) for birth in birth_dates]
+        grids = [None] * len(keys)
+        missing = {}
+        with self._lock:
+            for index, key in enumerate(keys):
+                grid = self._grids.get(key)
+                if grid is None:
+                    missing.setdefault(key, []).append(index)
+                else:
+                    self._grids.move_to_end(key)
+                    grids[index] = grid
+            self.hits += len(keys) - sum(len(indexes) for indexes in missing.values())
+            self.misses += len(missing)
+
+        if missing:
+            built = build_grids([birth_dates[indexes[0]] for indexes in missing.values()], life_expectancy)
+            with self._lock:
+                for (key, indexes), grid in zip(missing.items(), built):
+                    for index in indexes:
+                        grids[index] = grid
+                    self._grids[key] = grid
+                    self._grids.move_to_end(key)
+                while len(self._grids) > self.maxsize:
+                    self._grids.popitem(last=False)
+        return grids
+
+    def get(self, birth_date, life_expectancy=DEFAULT_LIFE_EXPECTANCY):
+        return self.get_many([birth_date], life_expectancy)[0]
+
+    def stats(self):
+        return {'size': len(self._grids), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,219 @@
+import atexit
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+
+from utils.shared_state import DEFAULT_STATE_PATH, get_connection
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds (upper bounds; +Inf is implicit)
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help); only these families are rendered
+FAMILIES = {
+    'agemaster_http_requests_total': ('counter', 'HTTP responses by endpoint, method and status'),
+    'agemaster_http_request_duration_seconds': ('histogram', 'Time to build the response, by endpoint'),
+    'agemaster_rate_limited_total': ('counter', 'Requests rejected by the rate limiter, by endpoint'),
+    'agemaster_result_cache_hits_total': ('counter', '/calculate result cache hits'),
+    'agemaster_result_cache_misses_total': ('counter', '/calculate result cache misses'),
+    'agemaster_result_cache_evictions_total': ('counter', '/calculate result cache LRU evictions'),
+    'agemaster_life_calendar_cache_hits_total': ('counter', 'Life-calendar week grid cache hits'),
+    'agemaster_life_calendar_cache_misses_total': ('counter', 'Life-calendar week grids built'),
+    'agemaster_ai_requests_total': ('counter', 'AI quote generation attempts by outcome'),
+    'agemaster_ai_request_duration_seconds': ('histogram', 'AI provider call latency by outcome'),
+    'agemaster_log_records_dropped_total': ('counter', 'Log records not written, by reason (sampled_out, rate_limited, queue_full)'),
+    'agemaster_client_errors_total': ('counter', 'Client error reports by outcome (accepted, sampled_out, dropped, too_large)'),
+}
+
+
+def format_labels(**labels):
+    """Render labels in Prometheus syntax, e.g. ``endpoint="calculate",status="200"``"""
+    return ','.join(
+        '{}="{}"'.format(key, str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+        for key, value in labels.items()
+    )
+
+
+class Metrics:
+    """Low-overhead counters and histograms aggregated across worker processes.
+
+    Recording only bumps in-process dicts under a lock. A daemon thread adds
+    the accumulated deltas to the shared SQLite store in one transaction
+    every ``flush_interval`` seconds, so requests never wait on the store's
+    write lock and ``render`` sees the sum over every worker on the host. Collectors are callables returning cumulative
+    per-process counters ``{(name, labels): value}``; their growth since the
+    previous flush is added the same way.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_PATH, flush_interval=1.0, buckets=DEFAULT_BUCKETS):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.buckets = tuple(buckets)
+        self._bounds = tuple(repr(bound) for bound in self.buckets) + ('+Inf',)
+        self._lock = threading.Lock()
+        self._collectors = []
+        self._ready = False
+        self._start_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        self._reset()
+        atexit.register(self.flush)
+        if hasattr(os, 'register_at_fork'):
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _reset(self):
+        self._pending = defaultdict(float)  # (name, labels, le) -> delta
+        self._collected = {}
+
+    def _after_fork(self):
+        # Deltas recorded before a fork belong to the parent, and its flush
+        # thread (which may have held a lock) doesn't exist here
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._reset()
+
+    def start(self):
+        """Start the flush thread (again, after a fork) if it isn't running"""
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._start_lock:
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Metrics flush thread error")
+
+    def inc(self, name, labels='', amount=1):
+        self.start()
+        with self._lock:
+            self._pending[(name, labels, '')] += amount
+
+    def observe(self, name, seconds, labels=''):
+        """Record one histogram sample"""
+        self.start()
+        le = self._bounds[bisect_left(self.buckets, seconds)]
+        with self._lock:
+            pending = self._pending
+            pending[(name + '_bucket', labels, le)] += 1
+            pending[(name + '_sum', labels, '')] += seconds
+            pending[(name + '_count', labels, '')] += 1
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def _db(self):
+        connection = get_connection(self.path)
+        if not self._ready:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS metrics ('
+                ' name TEXT NOT NULL, labels TEXT NOT NULL, le TEXT NOT NULL, value REAL NOT NULL,'
+                ' PRIMARY KEY (name, labels, le))'
+            )
+            self._ready = True
+        return connection
+
+    def flush(self):
+        """Add this process's deltas to the shared store"""
+        # The flush thread and /metrics (snapshot) may flush at the same time
+        with self._flush_lock:
+            self._flush()
+
+    def _flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(float)
+
+        for collector in self._collectors:
+            try:
+                for (name, labels), value in collector().items():
+                    previous = self._collected.get((name, labels), 0)
+                    # A counter that went down was reset (e.g. cache cleared)
+                    delta = value - previous if value >= previous else value
+                    self._collected[(name, labels)] = value
+                    if delta:
+                        pending[(name, labels, '')] += delta
+            except Exception as e:
+                logger.warning("Metrics collector failed: %s", e)
+
+        if not pending:
+            return
+        try:
+            connection = self._db()
+            connection.execute('BEGIN IMMEDIATE')
+            try:
+                connection.executemany(
+                    'INSERT INTO metrics (name, labels, le, value) VALUES (?, ?, ?, ?)'
+                    ' ON CONFLICT (name, labels, le) DO UPDATE SET value = value + excluded.value',
+                    [(name, labels, le, value) for (name, labels, le), value in pending.items()]
+                )
+                connection.execute('COMMIT')
+            except Exception:
+                connection.execute('ROLLBACK')
+                raise
+        except Exception as e:
+            logger.warning("Metrics flush failed, keeping deltas: %s", e)
+            with self._lock:
+                for key, value in pending.items():
+                    self._pending[key] += value
+
+    def snapshot(self):
+        """Host-wide totals as ``{(name, labels, le): value}``"""
+        self.flush()
+        rows = self._db().execute('SELECT name, labels, le, value FROM metrics').fetchall()
+        return {(name, labels, le): value for name, labels, le, value in rows}
+
+    def render(self):
+        """Host-wide metrics in the Prometheus text exposition format"""
+        values = self.snapshot()
+        lines = []
+        for family, (kind, help_text) in FAMILIES.items():
+            lines.append(f'# HELP {family} {help_text}')
+            lines.append(f'# TYPE {family} {kind}')
+            if kind == 'histogram':
+                lines.extend(self._render_histogram(family, values))
+                continue
+            for (name, labels, _), value in sorted(values.items()):
+                if name == family:
+                    lines.append(f'{_series(name, labels)} {_number(value)}')
+        return '\n'.join(lines) + '\n'
+
+    def _render_histogram(self, family, values):
+        series = sorted({labels for (name, labels, _) in values if name == family + '_count'})
+        for labels in series:
+            prefix = labels + ',' if labels else ''
+            cumulative = 0
+            for le in self._bounds:
+                cumulative += values.get((family + '_bucket', labels, le), 0)
+                yield f'{family}_bucket{{{prefix}le="{le}"}} {_number(cumulative)}'
+            yield f'{_series(family + "_sum", labels)} {_number(values.get((family + "_sum", labels, ""), 0))}'
+            yield f'{_series(family + "_count", labels)} {_number(values.get((family + "_count", labels, ""), 0))}'
+
+    def reset(self):
+        """Drop every stored series (tests and benchmarks)"""
+        with self._lock:
+            self._reset()
+        self._db().execute('DELETE FROM metrics')
+
+
+def _series(name, labels):
+    return f'{name}{{{labels}}}' if labels else name
+
+
+def _number(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+# Process-wide registry, shared by app.py and ai_service.py
+metrics = Metrics()
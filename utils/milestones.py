@@ -0,0 +1,137 @@
+from datetime import datetime
+import numpy as np
+
+from utils.batch_age import add_months
+
+US_PER_DAY = 86_400 * 1_000_000
+MAX_SCHEDULE_SIZE = 50
+MILESTONE_UNITS = ('years', 'days', 'seconds')
+
+# (name, unit, amount); year milestones falling on Feb 29 move to Feb 28,
+# the same clipping relativedelta applies
+DEFAULT_SCHEDULE = (
+    ('First Birthday', 'years', 1),
+    ('5 Years Old', 'years', 5),
+    ('10 Years Old', 'years', 10),
+    ('13 Years Old (Teenager)', 'years', 13),
+    ('16 Years Old', 'years', 16),
+    ('18 Years Old (Adult)', 'years', 18),
+    ('21 Years Old', 'years', 21),
+    ('25 Years Old (Quarter Life)', 'years', 25),
+    ('30 Years Old', 'years', 30),
+    ('40 Years Old', 'years', 40),
+    ('50 Years Old', 'years', 50),
+    ('65 Years Old (Retirement)', 'years', 65),
+    ('100 Years Old (Centenarian)', 'years', 100),
+    ('110 Years Old (Supercentenarian)', 'years', 110),
+    ('116 Years Old (Oldest Man)', 'years', 116),
+    ('118 Years Old (As of 2025)', 'years', 118),
+    ('120 Years Old (Near record)', 'years', 120),
+    ('122 Years Old (World Record)', 'years', 122),
+    ('150 Years Old (Theoretical Max)', 'years', 150),
+    ('10,000 Days Old', 'days', 10_000),
+    ('1 Billion Seconds Old', 'seconds', 1_000_000_000),
+)
+
+# Milestones past this year are dropped
+MAX_MILESTONE_YEAR = 2200
+MIN_BIRTH_YEAR = 1900
+
+# Largest amount per unit that can still land inside the window from the
+# earliest birth date; anything bigger is rejected before the int64 math
+_WINDOW_DAYS = (datetime(MAX_MILESTONE_YEAR + 1, 1, 1) - datetime(MIN_BIRTH_YEAR, 1, 1)).days
+MAX_MILESTONE_AMOUNTS = {
+    'years': MAX_MILESTONE_YEAR + 1 - MIN_BIRTH_YEAR,
+    'days': _WINDOW_DAYS,
+    'seconds': _WINDOW_DAYS * 86_400,
+}
+
+
+def parse_schedule(items):
+    """Validate a schedule like ``[{'name': ..., 'days': 10000}, ...]``.
+
+    Each item needs a name and exactly one of ``years``, ``days`` or
+    ``seconds`` as a positive integer no larger than MAX_MILESTONE_AMOUNTS
+    allows. Returns ``(schedule, error)``.
+    """
+    if not isinstance(items, list) or not items:
+        return None, 'Schedule must be a non-empty list'
+    if len(items) > MAX_SCHEDULE_SIZE:
+        return None, f'Schedule cannot have more than {MAX_SCHEDULE_SIZE} milestones'
+
+    schedule = []
+    for item in items:
+        if not isinstance(item, dict) or not isinstance(item.get('name'), str) or not item['name']:
+            return None, 'Each milestone needs a name'
+        units = [unit for unit in MILESTONE_UNITS if unit in item]
+        if len(units) != 1:
+            return None, f"Milestone '{item['name']}' needs exactly one of: years, days, seconds"
+        amount = item[units[0]]
+        if isinstance(amount, bool) or not isinstance(amount, int) or amount <= 0:
+            return None, f"Milestone '{item['name']}' must use a positive whole number"
+        if amount > MAX_MILESTONE_AMOUNTS[units[0]]:
+            return None, (f"Milestone '{item['name']}' is too far away "
+                          f"(at most {MAX_MILESTONE_AMOUNTS[units[0]]:,} {units[0]}, up to year {MAX_MILESTONE_YEAR})")
+        schedule.append((item['name'], units[0], amount))
+    return tuple(schedule), None
+
+
+def milestone_dates(birth_dates, schedule=DEFAULT_SCHEDULE):
+    """Compute every milestone date for every birth date in one vectorized pass.
+
+    Returns a ``datetime64[us]`` array of shape ``(len(birth_dates), len(schedule))``.
+    """
+    birth = np.asarray(birth_dates, dtype='datetime64[us]').reshape(-1, 1)
+    units = np.array([unit for _, unit, _ in schedule])
+    amounts = np.array([amount for _, _, amount in schedule], dtype=np.int64)
+
+    birth_day = birth.astype('datetime64[D]')
+    birth_time = birth - birth_day.astype('datetime64[us]')
+    birth_month = birth.astype('datetime64[M]')
+    birth_day_index = (birth_day - birth_month.astype('datetime64[D]')).astype(np.int64)
+
+    months = np.where(units == 'years', amounts * 12, 0)
+    by_years = add_months(birth_month, birth_day_index, birth_time, np.broadcast_to(months, (len(birth), len(units))))
+    by_days = birth + (np.where(units == 'days', amounts, 0) * US_PER_DAY).astype('timedelta64[us]')
+    by_seconds = birth + (np.where(units == 'seconds', amounts, 0) * 1_000_000).astype('timedelta64[us]')
+
+    return np.where(units == 'years', by_years, np.where(units == 'days', by_days, by_seconds))
+
+
+def milestones_for(birth_dates, schedule=DEFAULT_SCHEDULE, now=None, within_days=None):
+    """Milestone dicts per birth date, sorted by date.
+
+    Each dict has name, date (datetime), status and days_ago/days_until,
+    matching the /milestones response. With ``within_days`` only upcoming
+    milestones inside that window are kept.
+    """
+    now = now or datetime.now()
+    dates = milestone_dates(birth_dates, schedule)
+    now64 = np.datetime64(now, 'us')
+    offsets = (dates - now64).astype(np.int64)
+    days_until = offsets // US_PER_DAY
+    days_ago = (-offsets) // US_PER_DAY
+    passed = dates < now64
+    keep = dates < np.datetime64(f'{MAX_MILESTONE_YEAR + 1}-01-01', 'us')
+    if within_days is not None:
+        keep &= ~passed & (days_until < within_days)
+
+    # Visit only the kept cells, row by row in date order
+    order = np.argsort(dates, axis=1, kind='stable')
+    rows, positions = np.nonzero(np.take_along_axis(keep, order, axis=1))
+    columns = order[rows, positions]
+    date_values = dates[rows, columns].astype(object)
+    passed_values = passed[rows, columns]
+    days_values = np.where(passed_values, days_ago[rows, columns], days_until[rows, columns]).tolist()
+
+    results = [[] for _ in range(len(dates))]
+    for i, (row, column) in enumerate(zip(rows.tolist(), columns.tolist())):
+        milestone = {'name': schedule[column][0], 'date': date_values[i]}
+        if passed_values[i]:
+            milestone['status'] = 'passed'
+            milestone['days_ago'] = days_values[i]
+        else:
+            milestone['status'] = 'upcoming'
+            milestone['days_until'] = days_values[i]
+        results[row].append(milestone)
+    return results
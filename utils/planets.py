@@ -0,0 +1,76 @@
+from collections import OrderedDict
+import numpy as np
+
+US_PER_DAY = 86_400 * 1_000_000
+MAX_EARTH_DAYS = 365.25 * 200
+
+# Sidereal orbital periods in Earth days, innermost first
+ORBITAL_PERIODS = OrderedDict((
+    ('mercury', 87.97),
+    ('venus', 224.70),
+    ('earth', 365.25),
+    ('mars', 686.98),
+    ('jupiter', 4332.82),
+    ('saturn', 10755.70),
+    ('uranus', 30687.15),
+    ('neptune', 60190.03),
+    ('pluto', 90520.00),
+))
+PLANETS = tuple(ORBITAL_PERIODS)
+PERIODS = np.array(list(ORBITAL_PERIODS.values()))
+PERIODS_US = (PERIODS * US_PER_DAY).astype(np.int64)
+
+
+def round_2(values):
+    """np.round(values, 2), but exact halves round like Python's round()"""
+    rounded = np.round(values, 2)
+    ties = np.flatnonzero((values * 100) % 1 == 0.5)
+    if len(ties):
+        flat = rounded.reshape(-1)
+        flat[ties] = [round(value, 2) for value in values.reshape(-1)[ties].tolist()]
+    return rounded
+
+
+def planet_matrix(birth_dates, reference):
+    """Ages on every body, and the next planetary birthday, for many people.
+
+    ``reference`` is one datetime or one per person. Returns
+    ``(ages, next_ages, next_dates)``, each of shape ``(len(birth_dates), 9)``
+    in PLANETS order:
+
+    - ages: whole Earth days lived / orbital period, rounded to 2 places
+      (0 before birth or past 200 years, as get_planet_age always did)
+    - next_ages, next_dates: the next whole planetary age and the
+      ``datetime64[us]`` instant it is reached, after ``reference``
+    """
+    birth = np.asarray(birth_dates, dtype='datetime64[us]').reshape(-1, 1)
+    reference = np.asarray(reference, dtype='datetime64[us]').reshape(-1, 1)
+
+    elapsed_us = (reference - birth).astype(np.int64)
+    earth_days = elapsed_us // US_PER_DAY
+    valid = (earth_days > 0) & (earth_days <= MAX_EARTH_DAYS)
+    ages = np.where(valid, round_2(earth_days / PERIODS), 0.0)
+
+    next_ages = np.maximum(elapsed_us, 0) // PERIODS_US + 1
+    next_dates = birth + (next_ages * PERIODS_US).astype('timedelta64[us]')
+    return ages, next_ages, next_dates
+
+
+def next_birthday_days(next_dates, reference):
+    """``(dates as 'YYYY-MM-DD' strings, whole days from the reference day)`` for next_dates"""
+    next_days = next_dates.astype('datetime64[D]')
+    reference_day = np.asarray(reference, dtype='datetime64[us]').astype('datetime64[D]').reshape(-1, 1)
+    days_until = (next_days - reference_day).astype(np.int64)
+    return np.datetime_as_string(next_days).tolist(), days_until.tolist()
+
+
+def planetary_summary(birth_date, reference):
+    """``(planetary_ages, next_planetary_birthdays)`` dicts for one person, as /calculate returns them"""
+    ages, next_ages, next_dates = planet_matrix([birth_date], reference)
+    dates, days_until = next_birthday_days(next_dates, reference)
+    planetary_ages = dict(zip(PLANETS, ages[0].tolist()))
+    birthdays = {
+        planet: {'age': age, 'date': day, 'days_until': days}
+        for planet, age, day, days in zip(PLANETS, next_ages[0].tolist(), dates[0], days_until[0])
+    }
+    return planetary_ages, birthdays
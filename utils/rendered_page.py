@@ -0,0 +1,73 @@
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+
+class RenderedPage:
+    """A page rendered once and kept as bytes, with a strong ETag and a gzip variant.
+
+    ``render`` returns the page as a string. It is called again only when a
+    watched file changes (files under ``watch_dirs`` plus ``watch_files``),
+    checked at most every ``check_interval`` seconds.
+    """
+
+    def __init__(self, render, watch_dirs=(), watch_files=(), check_interval=5.0):
+        self.render = render
+        self.watch_dirs = tuple(watch_dirs)
+        self.watch_files = tuple(watch_files)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._signature = None
+        self._current = None  # (body, gzip_body, etag)
+        self.renders = 0
+
+    def _watched_signature(self):
+        """(path, mtime) for every watched file; a change triggers a re-render"""
+        signature = []
+        for directory in self.watch_dirs:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        signature.append((path, os.stat(path).st_mtime_ns))
+                    except OSError:
+                        pass
+        for path in self.watch_files:
+            try:
+                signature.append((path, os.stat(path).st_mtime_ns))
+            except OSError:
+                signature.append((path, None))
+        return tuple(sorted(signature, key=lambda item: item[0]))
+
+    def refresh(self, force=False):
+        """Re-render if any watched file changed since the last render"""
+        now = time.monotonic()
+        if not force and self._current is not None and now < self._next_check:
+            return
+        with self._lock:
+            if not force and self._current is not None and now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+
+            signature = self._watched_signature()
+            if not force and self._current is not None and signature == self._signature:
+                return
+
+            body = self.render().encode('utf-8')
+            # Published as one tuple so readers never mix versions
+            self._current = (body, gzip.compress(body, compresslevel=9, mtime=0),
+                             hashlib.sha256(body).hexdigest()[:32])
+            self._signature = signature
+            self.renders += 1
+
+    def variant(self, accept_gzip):
+        """Return ``(body, etag, gzipped)`` for the preferred representation"""
+        self.refresh()
+        body, gzip_body, etag = self._current
+        if accept_gzip:
+            # Each encoding is a distinct representation and gets its own strong ETag
+            return gzip_body, f'{etag}-gz', True
+        return body, etag, False
@@ -0,0 +1,75 @@
+from collections import OrderedDict
+from datetime import date
+import threading
+import time
+
+
+class DailyResultCache:
+    """Bounded LRU cache for results that are only valid for the current day.
+
+    Every entry is dropped as soon as the local date changes, and optionally
+    after ``ttl`` seconds. Values are shared between callers and must be
+    treated as read-only.
+    """
+
+    def __init__(self, maxsize=4096, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._day = None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.rollovers = 0
+
+    def _check_day(self, today):
+        if today != self._day:
+            if self._entries:
+                self.rollovers += 1
+            self._entries.clear()
+            self._day = today
+
+    def get(self, key, today=None):
+        """Return the cached value for ``key`` or ``None`` on a miss"""
+        today = today or date.today()
+        with self._lock:
+            self._check_day(today)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl is not None and time.monotonic() - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, today=None):
+        today = today or date.today()
+        with self._lock:
+            self._check_day(today)
+            self._entries[key] = (value, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'rollovers': self.rollovers,
+                'day': self._day.isoformat() if self._day else None
+            }
@@ -0,0 +1,34 @@
+import os
+import sqlite3
+import threading
+
+# One SQLite file shared by every worker process on the host, kept in the
+# app's instance folder rather than a world-writable temp directory
+INSTANCE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'instance')
+DEFAULT_STATE_PATH = os.getenv(
+    'SHARED_STATE_DB',
+    os.path.join(INSTANCE_DIR, 'agemaster-shared-state.sqlite3')
+)
+
+_local = threading.local()
+
+
+def get_connection(path=DEFAULT_STATE_PATH):
+    """Return this thread's connection to the shared state database.
+
+    Connections are per thread and per process (never reused across a fork),
+    in autocommit mode with WAL journaling so readers don't block writers.
+    """
+    connections = getattr(_local, 'connections', None)
+    if connections is None or getattr(_local, 'pid', None) != os.getpid():
+        connections = _local.connections = {}
+        _local.pid = os.getpid()
+
+    connection = connections.get(path)
+    if connection is None:
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        connection = sqlite3.connect(path, timeout=5.0, isolation_level=None, check_same_thread=False)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        connections[path] = connection
+    return connection
@@ -0,0 +1,139 @@
+from math import floor
+import sqlite3
+import time
+
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+from utils.shared_state import DEFAULT_STATE_PATH, get_connection
+
+# Expired counters are swept at most this often
+PURGE_INTERVAL = 60.0
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """Rate-limit storage shared by every worker on the host through one SQLite file.
+
+    Registered with ``limits`` under the ``sqlite://`` scheme, e.g.
+    ``sqlite:///tmp/agemaster.sqlite3`` (``sqlite://`` alone uses the shared
+    state database). Supports the fixed-window and sliding-window-counter
+    strategies; each sliding-window check is a single short write
+    transaction, so concurrent workers never over-admit.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri=None, wrap_exceptions=False, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = uri.split('://', 1)[1] if uri and '://' in uri else ''
+        self.path = path or DEFAULT_STATE_PATH
+        self._ready = False
+        self._next_purge = 0.0
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _db(self):
+        connection = get_connection(self.path)
+        if not self._ready:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS rate_limits ('
+                ' key TEXT PRIMARY KEY, count INTEGER NOT NULL, expires_at REAL NOT NULL)'
+            )
+            self._ready = True
+        return connection
+
+    def _purge(self, connection, now):
+        if now >= self._next_purge:
+            self._next_purge = now + PURGE_INTERVAL
+            connection.execute('DELETE FROM rate_limits WHERE expires_at <= ?', (now,))
+
+    @staticmethod
+    def _incr(connection, key, expiry, amount, now):
+        """Increment a counter, restarting it (with a new expiry) if it has expired"""
+        return connection.execute(
+            'INSERT INTO rate_limits (key, count, expires_at) VALUES (?, ?, ?)'
+            ' ON CONFLICT(key) DO UPDATE SET'
+            '  count = CASE WHEN expires_at <= ? THEN excluded.count ELSE count + excluded.count END,'
+            '  expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END'
+            ' RETURNING count',
+            (key, amount, now + expiry, now, now)
+        ).fetchone()[0]
+
+    @staticmethod
+    def _get(connection, key, now):
+        row = connection.execute(
+            'SELECT count FROM rate_limits WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        connection = self._db()
+        self._purge(connection, now)
+        return self._incr(connection, key, expiry, amount, now)
+
+    def get(self, key):
+        return self._get(self._db(), key, time.time())
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._db().execute(
+            'SELECT expires_at FROM rate_limits WHERE key = ? AND expires_at > ?', (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key):
+        self._db().execute('DELETE FROM rate_limits WHERE key = ?', (key,))
+
+    def check(self):
+        try:
+            self._db().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._db().execute('DELETE FROM rate_limits').rowcount
+
+    def _sliding_window_info(self, connection, key, expiry, now):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        previous_count = self._get(connection, previous_key, now)
+        current_count = self._get(connection, current_key, now)
+        if previous_count == 0:
+            previous_ttl = 0.0
+        else:
+            previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        connection = self._db()
+        self._purge(connection, now)
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window_info(
+                connection, key, expiry, now
+            )
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            allowed = floor(weighted_count) + amount <= limit
+            if allowed:
+                # Twice the window, so the counter survives as the next "previous" window
+                _, current_key = self.sliding_window_keys(key, expiry, now)
+                self._incr(connection, current_key, 2 * expiry, amount, now)
+            connection.execute('COMMIT')
+        except BaseException:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed
+
+    def get_sliding_window(self, key, expiry):
+        return self._sliding_window_info(self._db(), key, expiry, time.time())
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        self._db().execute('DELETE FROM rate_limits WHERE key IN (?, ?)', (previous_key, current_key))
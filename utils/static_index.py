@@ -0,0 +1,128 @@
+import hashlib
+import logging
+import mimetypes
+import os
+import threading
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+StaticFile = namedtuple('StaticFile', 'path size mtime mtime_ns etag mimetype')
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b''):
+            digest.update(block)
+    return digest.hexdigest()[:32]
+
+
+class StaticFileIndex:
+    """In-memory size/mtime/ETag metadata for files served from ``root``.
+
+    Lookups never touch disk. Once ``ttl`` seconds have passed, the next
+    lookup starts a rescan in a background thread and keeps answering from
+    the current entries until it finishes; only files whose size or mtime
+    changed are re-hashed. With ``files`` only those names (relative to
+    ``root``) are indexed.
+    """
+
+    def __init__(self, root, files=None, ttl=5.0):
+        self.root = os.path.abspath(root)
+        self.files = tuple(files) if files is not None else None
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._next_scan = 0.0
+        self.entries = {}
+        self.scans = 0
+        if hasattr(os, 'register_at_fork'):
+            # A rescan thread running at fork time doesn't exist in the child
+            os.register_at_fork(after_in_child=self._after_fork)
+
+    def _after_fork(self):
+        self._lock = threading.Lock()
+
+    def _candidates(self):
+        """Yield (relative posix path, absolute path) for every indexed file"""
+        if self.files is not None:
+            for name in self.files:
+                yield name, os.path.join(self.root, name)
+            return
+        for directory, _, names in os.walk(self.root):
+            for name in names:
+                path = os.path.join(directory, name)
+                yield os.path.relpath(path, self.root).replace(os.sep, '/'), path
+
+    def _entry(self, path, stat, previous=None):
+        if previous and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+            return previous
+        mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+        mtime = datetime.fromtimestamp(int(stat.st_mtime), timezone.utc)
+        return StaticFile(path, stat.st_size, mtime, stat.st_mtime_ns,
+                          _hash_file(path), mimetype)
+
+    def _rescan(self):
+        # Callers hold self._lock
+        entries = {}
+        for name, path in self._candidates():
+            try:
+                entries[name] = self._entry(path, os.stat(path), self.entries.get(name))
+            except OSError:
+                continue
+        self.entries = entries
+        self._next_scan = time.monotonic() + self.ttl
+        self.scans += 1
+
+    def scan(self, force=False):
+        """Re-index the tree now if the TTL expired (blocking; warm_up uses this)"""
+        now = time.monotonic()
+        if not force and now < self._next_scan:
+            return
+        with self._lock:
+            if not force and now < self._next_scan:
+                return
+            self._rescan()
+
+    def refresh_in_background(self):
+        """Start a rescan thread unless one is already running"""
+        if not self._lock.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self._rescan()
+            except Exception:
+                logger.exception("Static file rescan failed for %s", self.root)
+                self._next_scan = time.monotonic() + self.ttl
+            finally:
+                self._lock.release()
+
+        try:
+            threading.Thread(target=run, name='static-index-scan', daemon=True).start()
+        except Exception:
+            self._lock.release()
+            raise
+
+    def get(self, name):
+        """Metadata for a relative path, or None if it isn't a served file"""
+        if not self.scans:
+            self.scan()
+        elif time.monotonic() >= self._next_scan:
+            self.refresh_in_background()
+        return self.entries.get(name)
+
+    def verify(self, name, stat):
+        """Re-index one file when an opened handle shows it changed since the scan"""
+        entry = self.entries.get(name)
+        if entry is None or entry.size != stat.st_size or entry.mtime_ns != stat.st_mtime_ns:
+            entry = self._entry(entry.path if entry else os.path.join(self.root, name), stat, entry)
+            self.entries = {**self.entries, name: entry}
+        return entry
+
+    def discard(self, name):
+        """Forget a file that turned out to be gone before the next scan"""
+        if name in self.entries:
+            self.entries = {key: entry for key, entry in self.entries.items() if key != name}
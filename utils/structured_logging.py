@@ -0,0 +1,204 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# LogRecord attributes that aren't user-supplied ``extra`` fields
+STANDARD_ATTRIBUTES = frozenset(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {
+    'message', 'asctime', 'taskName'
+}
+
+REQUEST_ID_PATTERN = re.compile(r'^[A-Za-z0-9._-]{1,64}$')
+
+
+def new_request_id(incoming=None):
+    """Reuse a well-formed incoming X-Request-ID, otherwise mint one"""
+    if incoming and REQUEST_ID_PATTERN.match(incoming):
+        return incoming
+    return uuid.uuid4().hex[:16]
+
+
+def parse_sample_rates(value):
+    """``"request=0.1,quote_fallback=0.5"`` -> ``{'request': 0.1, 'quote_fallback': 0.5}``"""
+    rates = {}
+    for item in (value or '').split(','):
+        event, _, rate = item.partition('=')
+        try:
+            rates[event.strip()] = min(1.0, max(0.0, float(rate)))
+        except ValueError:
+            continue
+    return rates
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, message, then any extra fields"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in STANDARD_ATTRIBUTES and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """Thin out high-volume events below WARNING.
+
+    Records are grouped by their ``event`` extra (or their unformatted
+    message). ``rates`` keeps that fraction of an event; ``max_per_second``
+    (off unless set) caps how many records of one event pass per second in
+    this process. Warnings and errors always pass; what is thinned out is
+    counted in ``sampled_out`` and ``suppressed``.
+    """
+
+    def __init__(self, rates=None, max_per_second=None):
+        super().__init__()
+        self.rates = dict(rates or {})
+        self.max_per_second = max_per_second
+        self.sampled_out = 0
+        self.suppressed = 0
+        self._second = None
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        key = getattr(record, 'event', None) or str(record.msg)
+        rate = self.rates.get(key, 1.0)
+        if rate < 1.0:
+            if random.random() >= rate:
+                with self._lock:
+                    self.sampled_out += 1
+                return False
+            record.sample_rate = rate
+        if self.max_per_second:
+            # Filters run in the logging threads, outside the handler lock
+            with self._lock:
+                second = int(time.monotonic())
+                if second != self._second:
+                    self._second, self._counts = second, {}
+                count = self._counts.get(key, 0)
+                if count >= self.max_per_second:
+                    self.suppressed += 1
+                    return False
+                self._counts[key] = count + 1
+        return True
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach the current request's id and elapsed time, when inside a request"""
+
+    def filter(self, record):
+        from flask import g, has_request_context
+        if has_request_context():
+            request_id = g.get('request_id')
+            if request_id:
+                record.request_id = request_id
+            started = g.get('request_started')
+            if started is not None and not hasattr(record, 'elapsed_ms'):
+                record.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        return True
+
+
+class BoundedQueueHandler(QueueHandler):
+    """QueueHandler that drops (and counts) records when the queue is full,
+    and keeps the exception text separate from the message"""
+
+    dropped = 0
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record):
+        # Runs in the calling (request) thread, before the record is queued:
+        # only resolve args and the traceback so the record is safe to hand
+        # over. JSON formatting and I/O happen in the listener thread.
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+_listener = None
+_handler = None
+_sampling = None
+_lock = threading.Lock()
+
+
+def dropped_records():
+    """Records this process has thrown away, by reason (all zero until configured)"""
+    return {
+        'sampled_out': _sampling.sampled_out if _sampling else 0,
+        'rate_limited': _sampling.suppressed if _sampling else 0,
+        'queue_full': _handler.dropped if _handler else 0,
+    }
+
+
+def configure_logging(level=None, stream=None, queue_size=10000, rates=None, max_per_second=None):
+    """Route all logging through a bounded queue to a JSON-lines stream.
+
+    Replaces the root logger's handlers, so only server entry points call
+    it (gunicorn.conf.py, asgi.py, ``python app.py``), never library
+    imports. Request threads only resolve and enqueue records; a
+    QueueListener thread formats and writes them. Restarted in forked
+    children. Reads LOG_LEVEL, LOG_SAMPLE_RATES and LOG_MAX_PER_SECOND
+    (unset or 0: no cap) when arguments aren't given.
+    """
+    global _listener, _handler, _sampling
+    level = level or os.getenv('LOG_LEVEL', 'INFO').upper()
+    rates = rates if rates is not None else parse_sample_rates(os.getenv('LOG_SAMPLE_RATES'))
+    if max_per_second is None:
+        max_per_second = int(os.getenv('LOG_MAX_PER_SECOND') or 0) or None
+
+    with _lock:
+        if _listener is not None:
+            return logging.getLogger()
+
+        output = logging.StreamHandler(stream or sys.stdout)
+        output.setFormatter(JsonFormatter())
+        handler = _handler = BoundedQueueHandler(queue.Queue(maxsize=queue_size))
+        _sampling = SamplingFilter(rates, max_per_second)
+        handler.addFilter(_sampling)
+        handler.addFilter(RequestContextFilter())
+
+        root = logging.getLogger()
+        root.handlers[:] = [handler]
+        root.setLevel(level)
+
+        _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+        _listener.start()
+        atexit.register(_listener.stop)
+
+        if hasattr(os, 'register_at_fork'):
+            def restart_in_child():
+                global _listener
+                # The parent's listener thread doesn't survive the fork
+                handler.queue = queue.Queue(maxsize=queue_size)
+                _listener = QueueListener(handler.queue, output, respect_handler_level=True)
+                _listener.start()
+                atexit.register(_listener.stop)
+            os.register_at_fork(after_in_child=restart_in_child)
+        return root
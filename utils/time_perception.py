@@ -0,0 +1,141 @@
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DAYS_PER_YEAR = 365.2425
+MAX_AGE_YEARS = 150
+
+# start/end in whole years (end inclusive, None for an open "100+" group)
+AgeGroup = namedtuple('AgeGroup', 'start end label description factor')
+
+# The old hardcoded ladder, used if the data file is missing or unusable
+FALLBACK_GROUPS = (
+    AgeGroup(0, 9, '0-9', '', 0.3),
+    AgeGroup(10, 19, '10-19', '', 0.6),
+    AgeGroup(20, 29, '20-29', '', 0.8),
+    AgeGroup(30, 49, '30-49', '', 1.2),
+    AgeGroup(50, 69, '50-69', '', 1.5),
+    AgeGroup(70, None, '70+', '', 2.0),
+)
+
+
+def parse_age_groups(items):
+    """``[{'range': '0-5' | '100+', 'perception_factor': 0.2, ...}]`` -> sorted AgeGroups (bad entries skipped)"""
+    groups = []
+    for item in items if isinstance(items, list) else ():
+        try:
+            label = str(item['range']).strip()
+            if label.endswith('+'):
+                start, end = int(label[:-1]), None
+            else:
+                start, end = (int(part) for part in label.split('-'))
+            factor = float(item['perception_factor'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if start < 0 or (end is not None and end < start) or factor <= 0:
+            continue
+        groups.append(AgeGroup(start, end, label, str(item.get('description', '')), factor))
+    return tuple(sorted(groups))
+
+
+def interpolate_factors(groups, max_age=MAX_AGE_YEARS):
+    """One factor per day of age, 0..max_age years, linear between group midpoints"""
+    anchors = [group.start if group.end is None else (group.start + group.end + 1) / 2 for group in groups]
+    ages = np.arange(int(max_age * DAYS_PER_YEAR) + 1) / DAYS_PER_YEAR
+    return np.interp(ages, anchors, [group.factor for group in groups])
+
+
+class TimePerception:
+    """Perception-factor curve from ``data/time_perception.json``, precomputed per day of age.
+
+    The ``age_groups`` table is interpolated once into a flat array indexed
+    by age in days, so single lookups, batches and whole-lifetime curves are
+    an index, a fancy index and a slice. The file is re-read when its mtime
+    changes, checked at most every ``check_interval`` seconds.
+    """
+
+    def __init__(self, path, max_age=MAX_AGE_YEARS, check_interval=5.0):
+        self.path = path
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._next_check = 0.0
+        self._mtime = None
+        self._table = None  # (groups, group starts, factors by day)
+
+    def refresh(self, force=False):
+        """Reload and re-interpolate if the file changed since the last load"""
+        now = time.monotonic()
+        if not force and self._table is not None and now < self._next_check:
+            return
+        with self._lock:
+            if not force and self._table is not None and now < self._next_check:
+                return
+            self._next_check = now + self.check_interval
+            try:
+                mtime = os.stat(self.path).st_mtime_ns
+            except OSError:
+                mtime = None
+            if not force and self._table is not None and mtime == self._mtime:
+                return
+
+            groups = ()
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    groups = parse_age_groups(json.load(f).get('age_groups'))
+            except Exception as e:
+                logger.error("Error loading time perception data: %s", e)
+            if not groups:
+                groups = FALLBACK_GROUPS
+            factors = interpolate_factors(groups, self.max_age)
+            factors.flags.writeable = False
+            self._table = (groups, [group.start for group in groups], factors)
+            self._mtime = mtime
+
+    @property
+    def groups(self):
+        self.refresh()
+        return self._table[0]
+
+    @property
+    def factors(self):
+        """Factor for each day of age from 0 to ``max_age`` years (read-only)"""
+        self.refresh()
+        return self._table[2]
+
+    def day_index(self, age_years):
+        return int(round(age_years * DAYS_PER_YEAR))
+
+    def factor(self, age_days):
+        """Factor at an age in days (clamped to the table)"""
+        factors = self.factors
+        return float(factors[min(max(int(age_days), 0), len(factors) - 1)])
+
+    def factors_at(self, ages_days):
+        """Factors for many ages in days, as one fancy index"""
+        factors = self.factors
+        return factors[np.clip(np.asarray(ages_days, dtype=np.int64), 0, len(factors) - 1)]
+
+    def curve(self, step_days=7, max_age=None):
+        """Every ``step_days``-th factor from birth to ``max_age`` years: one slice"""
+        end = self.day_index(self.max_age if max_age is None else max_age)
+        return self.factors[:end + 1:step_days]
+
+    def group(self, age_years):
+        """The age group containing ``age_years`` (None below the first group)"""
+        self.refresh()
+        groups, starts, _ = self._table
+        index = bisect_right(starts, age_years) - 1
+        return groups[index] if index >= 0 else None
+
+
+# Process-wide table, shared by app.py and DateUtils
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'time_perception.json')
+time_perception = TimePerception(DATA_PATH)
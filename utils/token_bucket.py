@@ -0,0 +1,55 @@
+import time
+from utils.shared_state import DEFAULT_STATE_PATH, get_connection
+
+
+class SharedTokenBucket:
+    """Token bucket whose state lives in the shared SQLite store.
+
+    Every worker on the host draws from the same bucket, which refills at
+    ``rate`` tokens per second up to ``burst``, so a provider call budget
+    holds however many workers and concurrent requests are running.
+    """
+
+    def __init__(self, name, rate, burst, path=DEFAULT_STATE_PATH):
+        self.name = name
+        self.rate = rate
+        self.burst = burst
+        self.path = path
+        self._ready = False
+
+    def _db(self):
+        connection = get_connection(self.path)
+        if not self._ready:
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS token_buckets ('
+                ' name TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+            )
+            self._ready = True
+        return connection
+
+    def acquire(self, now=None):
+        """Atomically take one token; False when the budget is spent"""
+        now = now or time.time()
+        connection = self._db()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+            row = connection.execute(
+                'SELECT tokens, updated FROM token_buckets WHERE name = ?', (self.name,)
+            ).fetchone()
+            tokens = self.burst if row is None else min(self.burst, row[0] + max(0.0, now - row[1]) * self.rate)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            connection.execute(
+                'INSERT INTO token_buckets (name, tokens, updated) VALUES (?, ?, ?)'
+                ' ON CONFLICT (name) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (self.name, tokens, now)
+            )
+            connection.execute('COMMIT')
+        except Exception:
+            connection.execute('ROLLBACK')
+            raise
+        return allowed
+
+    def reset(self):
+        self._db().execute('DELETE FROM token_buckets WHERE name = ?', (self.name,))
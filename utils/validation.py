@@ -0,0 +1,130 @@
+import re
+from datetime import datetime
+
+TAG_PATTERN = re.compile(r'<[^>]*>')
+UNSAFE_CHARS = re.compile(r'[<>\"\';()&|$`]')
+DATE_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+ISO_DATE_CHARS = frozenset('0123456789')
+
+DAYS_IN_MONTH = (0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+
+
+def sanitize_text(text, max_length=100):
+    """Strip tags and dangerous characters, truncate, trim ('' for non-strings)"""
+    if not text or not isinstance(text, str):
+        return ""
+    text = UNSAFE_CHARS.sub('', TAG_PATTERN.sub('', text))
+    if len(text) > max_length:
+        text = text[:max_length]
+    return text.strip()
+
+
+def parse_iso_date(value):
+    """Fixed-width YYYY-MM-DD parse for the common case.
+
+    Returns ``(datetime, None)``, ``(None, error)``, or ``None`` when the
+    string isn't a plain ASCII date with month 01-12 and day 01-31. Those are
+    left to ``validate_date`` so strptime's own messages are preserved.
+    """
+    if len(value) != 10 or value[4] != '-' or value[7] != '-':
+        return None
+    digits = value[:4] + value[5:7] + value[8:]
+    if not ISO_DATE_CHARS.issuperset(digits):
+        return None
+    year, month, day = int(digits[:4]), int(digits[4:6]), int(digits[6:])
+    if year < 1 or not 1 <= month <= 12 or not 1 <= day <= 31:
+        return None
+
+    leap = year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+    if day > DAYS_IN_MONTH[month] + (month == 2 and leap):
+        return None, "Invalid date: day is out of range for month"
+    if year < MIN_YEAR:
+        return None, "Date cannot be before 1900"
+    if year > MAX_YEAR:
+        return None, "Date cannot be after 2100"
+    return datetime(year, month, day), None
+
+
+def validate_date(date_str, allow_empty=False):
+    """Validate a YYYY-MM-DD string in 1900-2100; returns ``(ok, datetime_or_error)``"""
+    if not date_str:
+        return allow_empty, None
+
+    parsed = parse_iso_date(date_str)
+    if parsed is not None:
+        date_obj, error = parsed
+        return (False, error) if error else (True, date_obj)
+
+    # Anything unusual takes the original strptime path for identical messages
+    if not DATE_PATTERN.match(date_str):
+        return False, "Date must be in YYYY-MM-DD format"
+    try:
+        date_obj = datetime.strptime(date_str, '%Y-%m-%d')
+        if date_obj.year < MIN_YEAR:
+            return False, "Date cannot be before 1900"
+        if date_obj.year > MAX_YEAR:
+            return False, "Date cannot be after 2100"
+        return True, date_obj
+    except ValueError as e:
+        return False, f"Invalid date: {str(e)}"
+    except Exception:
+        return False, "Invalid date format"
+
+
+class DateField:
+    """A sanitized YYYY-MM-DD field; absent (or empty after sanitizing) is None unless required"""
+
+    def __init__(self, required=False, required_error='Birth date is required', max_length=20):
+        self.required = required
+        self.required_error = required_error
+        self.max_length = max_length
+        self.default = ''
+
+    def __call__(self, value):
+        # Plain ISO strings need no sanitizing: parse them in one step
+        if value.__class__ is str and len(value) == 10:
+            parsed = parse_iso_date(value)
+            if parsed is not None:
+                return parsed
+
+        text = sanitize_text(value, max_length=self.max_length)
+        if not text:
+            return None, (self.required_error if self.required else None)
+        is_valid, date_or_error = validate_date(text)
+        return (date_or_error, None) if is_valid else (None, date_or_error)
+
+
+class TextField:
+    """A sanitized free-text field"""
+
+    def __init__(self, max_length=100, default=''):
+        self.max_length = max_length
+        self.default = default
+
+    def __call__(self, value):
+        return sanitize_text(value, max_length=self.max_length), None
+
+
+class Schema:
+    """Declarative request schema, compiled once into a single-pass validator.
+
+    ``Schema({'birth_date': DateField(required=True), ...})(data)`` returns
+    ``(values, error)``: the cleaned values, or the first error message in
+    field order.
+    """
+
+    def __init__(self, fields):
+        self.fields = dict(fields)
+        self._steps = tuple((name, field, field.default) for name, field in self.fields.items())
+
+    def __call__(self, data):
+        values = {}
+        get = data.get
+        for name, field, default in self._steps:
+            value, error = field(get(name, default))
+            if error:
+                return values, error
+            values[name] = value
+        return values, None